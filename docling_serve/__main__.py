@@ -7,11 +7,9 @@ from pathlib import Path
 from typing import Annotated, Any, Union
 
 import typer
-import uvicorn
 from rich.console import Console
 
 from docling_serve.settings import docling_serve_settings, uvicorn_settings
-from docling_serve.storage import get_scratch
 
 warnings.filterwarnings(action="ignore", category=UserWarning, module="pydantic|torch")
 warnings.filterwarnings(action="ignore", category=FutureWarning, module="easyocr")
@@ -108,6 +106,12 @@ def _run(
             "using the environment variable [bold]DOCLING_SERVE_ENABLE_UI[/bold].[/yellow]"
         )
 
+    # The metrics of the workers are aggregated in a shared directory
+    if run_subprocess and docling_serve_settings.enable_metrics:
+        from docling_serve.metrics import setup_multiprocess_dir
+
+        setup_multiprocess_dir()
+
     # Propagate the settings to the app settings
     docling_serve_settings.artifacts_path = artifacts_path
     docling_serve_settings.enable_ui = enable_ui
@@ -137,6 +141,8 @@ def _run(
     console.print("Logs:")
 
     # Launch the server
+    import uvicorn
+
     uvicorn.run(
         app="docling_serve.app:create_app",
         factory=True,
@@ -369,7 +375,9 @@ def rq_worker() -> Any:
     """
     from docling_jobkit.convert.manager import DoclingConverterManagerConfig
     from docling_jobkit.orchestrators.rq.orchestrator import RQOrchestratorConfig
-    from docling_jobkit.orchestrators.rq.worker import run_worker
+
+    from docling_serve.rq_worker import run_worker
+    from docling_serve.storage import get_scratch
 
     rq_config = RQOrchestratorConfig(
         redis_url=docling_serve_settings.eng_rq_redis_url,
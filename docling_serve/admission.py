@@ -0,0 +1,267 @@
+import base64
+import collections
+import itertools
+import logging
+import math
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import pypdfium2 as pdfium
+from pydantic import BaseModel
+
+from docling.datamodel.base_models import DocumentStream
+from docling.utils.locks import pypdfium2_lock
+from docling_jobkit.datamodel.http_inputs import FileSource
+from docling_jobkit.datamodel.task import TaskSource
+from docling_jobkit.datamodel.task_meta import TaskStatus
+from docling_jobkit.orchestrators.base_orchestrator import BaseOrchestrator
+
+from docling_serve.settings import docling_serve_settings
+from docling_serve.storage import ScratchFileSource
+
+_log = logging.getLogger(__name__)
+
+# Period over which the throughput is measured
+THROUGHPUT_WINDOW = 300.0  # seconds
+# Retry-After when no throughput was observed yet, and its upper bound
+DEFAULT_RETRY_AFTER = 10  # seconds
+MAX_RETRY_AFTER = 600  # seconds
+# Typical size of a PDF page, to estimate the pages of the files not opened
+ESTIMATED_PAGE_SIZE = 100 * 1024  # bytes
+
+
+class TaskCost(BaseModel):
+    num_bytes: int = 0
+    num_pages: int = 0
+
+
+class AdmissionRejectedError(Exception):
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def _count_pages(content: bytes | Path, page_range: tuple[int, int]) -> int:
+    # Documents which are not PDF count as one page
+    if isinstance(content, Path):
+        with content.open("rb") as f:
+            header = f.read(4)
+    else:
+        header = content[:4]
+    if header != b"%PDF":
+        return 1
+
+    with pypdfium2_lock:
+        try:
+            pdf = pdfium.PdfDocument(content)
+        except pdfium.PdfiumError:
+            return 1
+        try:
+            num_pages = len(pdf)
+        finally:
+            pdf.close()
+
+    first_page = max(page_range[0], 1)
+    last_page = min(page_range[1], num_pages)
+    return max(last_page - first_page + 1, 1)
+
+
+def measure_task_cost(
+    sources: list[TaskSource], page_range: tuple[int, int], count_pages: bool
+) -> TaskCost:
+    """
+    Size and number of pages of the sources of a task. The remote sources are
+    counted as one page, their size is not known before they are fetched.
+
+    Without `count_pages`, the files are not decoded nor opened, their number
+    of pages is estimated from their size.
+    """
+    cost = TaskCost()
+    for source in sources:
+        size: Optional[int] = None
+        content: Optional[bytes | Path] = None
+        if isinstance(source, ScratchFileSource):
+            size = source.path.stat().st_size
+            content = source.path
+        elif isinstance(source, FileSource):
+            size = len(source.base64_string) // 4 * 3
+            if count_pages:
+                content = base64.b64decode(source.base64_string)
+        elif isinstance(source, DocumentStream):
+            size = source.stream.getbuffer().nbytes
+            if count_pages:
+                content = source.stream.getvalue()
+
+        if size is None:
+            cost.num_pages += 1
+            continue
+        cost.num_bytes += size
+        if count_pages and content is not None:
+            cost.num_pages += _count_pages(content, page_range)
+        else:
+            cost.num_pages += max(size // ESTIMATED_PAGE_SIZE, 1)
+    return cost
+
+
+class AdmissionController:
+    """
+    Bound the work accepted by this instance: the number and size of the queued
+    tasks, and the number of pages of the queued or running tasks.
+
+    A task takes its share of the limits when it is admitted, before it is
+    enqueued, and releases it when it completes. The completed tasks give the
+    throughput of the workers, used to tell the rejected clients when to retry.
+    """
+
+    def __init__(
+        self,
+        max_queued_tasks: Optional[int] = None,
+        max_queued_bytes: Optional[int] = None,
+        max_inflight_pages: Optional[int] = None,
+    ):
+        self.max_queued_tasks = max_queued_tasks
+        self.max_queued_bytes = max_queued_bytes
+        self.max_inflight_pages = max_inflight_pages
+        self.rejected = 0
+        self._tickets = itertools.count()
+        # Admitted tasks, without task id until they are enqueued
+        self._admitted: dict[int, tuple[Optional[str], TaskCost]] = {}
+        self._completions: collections.deque[tuple[float, TaskCost]] = (
+            collections.deque()
+        )
+        self._start_time = time.time()
+
+    @property
+    def count_pages(self) -> bool:
+        return self.max_inflight_pages is not None
+
+    def _sweep(self, orchestrator: BaseOrchestrator) -> tuple[int, int, int]:
+        """Release the completed tasks, returning the current usage."""
+        now = time.time()
+        queued_tasks = queued_bytes = inflight_pages = 0
+        for ticket, (task_id, cost) in list(self._admitted.items()):
+            task = orchestrator.tasks.get(task_id) if task_id is not None else None
+            if task_id is not None and (task is None or task.is_completed()):
+                del self._admitted[ticket]
+                finished_at = (
+                    task.finished_at.timestamp()
+                    if task is not None and task.finished_at is not None
+                    else now
+                )
+                self._completions.append((finished_at, cost))
+                continue
+
+            inflight_pages += cost.num_pages
+            if task is None or task.task_status == TaskStatus.PENDING:
+                queued_tasks += 1
+                queued_bytes += cost.num_bytes
+
+        while self._completions and self._completions[0][0] < now - THROUGHPUT_WINDOW:
+            self._completions.popleft()
+        return queued_tasks, queued_bytes, inflight_pages
+
+    def _retry_after(self, excess: int, completed: int) -> int:
+        """Seconds until the workers complete `excess` more of the same unit."""
+        elapsed = min(time.time() - self._start_time, THROUGHPUT_WINDOW)
+        if completed <= 0:
+            return DEFAULT_RETRY_AFTER
+        rate = completed / max(elapsed, 1.0)
+        return min(max(math.ceil(excess / rate), 1), MAX_RETRY_AFTER)
+
+    def check(self, orchestrator: BaseOrchestrator, cost: TaskCost):
+        """Raise AdmissionRejectedError when the task would exceed a limit."""
+        queued_tasks, queued_bytes, inflight_pages = self._sweep(orchestrator)
+
+        # A task larger than a limit is admitted alone, it would never fit
+        message = None
+        if (
+            self.max_queued_tasks is not None
+            and queued_tasks + 1 > self.max_queued_tasks
+        ):
+            message = f"The queue is full, with {queued_tasks} tasks."
+            retry_after = self._retry_after(
+                queued_tasks + 1 - self.max_queued_tasks, len(self._completions)
+            )
+        elif (
+            self.max_queued_bytes is not None
+            and queued_bytes > 0
+            and queued_bytes + cost.num_bytes > self.max_queued_bytes
+        ):
+            message = f"The queue is full, with {queued_bytes} bytes of documents."
+            retry_after = self._retry_after(
+                queued_bytes + cost.num_bytes - self.max_queued_bytes,
+                sum(c.num_bytes for _, c in self._completions),
+            )
+        elif (
+            self.max_inflight_pages is not None
+            and inflight_pages > 0
+            and inflight_pages + cost.num_pages > self.max_inflight_pages
+        ):
+            message = f"Too many pages in progress, {inflight_pages} pages."
+            retry_after = self._retry_after(
+                inflight_pages + cost.num_pages - self.max_inflight_pages,
+                sum(c.num_pages for _, c in self._completions),
+            )
+
+        if message is not None:
+            self.rejected += 1
+            _log.info(f"Rejected a task: {message}")
+            raise AdmissionRejectedError(
+                f"{message} Retry after {retry_after} seconds.",
+                retry_after=retry_after,
+            )
+
+    def saturated(self, orchestrator: BaseOrchestrator) -> bool:
+        """True when a limit is reached, the next task would be rejected."""
+        queued_tasks, queued_bytes, inflight_pages = self._sweep(orchestrator)
+        return (
+            (
+                self.max_queued_tasks is not None
+                and queued_tasks >= self.max_queued_tasks
+            )
+            or (
+                self.max_queued_bytes is not None
+                and queued_bytes >= self.max_queued_bytes
+            )
+            or (
+                self.max_inflight_pages is not None
+                and inflight_pages >= self.max_inflight_pages
+            )
+        )
+
+    def admit(
+        self, orchestrator: BaseOrchestrator, cost: TaskCost, check: bool = True
+    ) -> int:
+        """
+        Reserve the share of a task before it is enqueued, returning a ticket
+        to bind to the task id, or to cancel when the task is not enqueued.
+        """
+        if check:
+            self.check(orchestrator, cost)
+        ticket = next(self._tickets)
+        self._admitted[ticket] = (None, cost)
+        return ticket
+
+    def bind(self, ticket: int, task_id: str):
+        if ticket in self._admitted:
+            self._admitted[ticket] = (task_id, self._admitted[ticket][1])
+
+    def cancel(self, ticket: int):
+        self._admitted.pop(ticket, None)
+
+
+@lru_cache
+def get_admission_controller() -> Optional[AdmissionController]:
+    if (
+        docling_serve_settings.max_queued_tasks is None
+        and docling_serve_settings.max_queued_bytes is None
+        and docling_serve_settings.max_inflight_pages is None
+    ):
+        return None
+    return AdmissionController(
+        max_queued_tasks=docling_serve_settings.max_queued_tasks,
+        max_queued_bytes=docling_serve_settings.max_queued_bytes,
+        max_inflight_pages=docling_serve_settings.max_inflight_pages,
+    )
@@ -1,36 +1,46 @@
 import asyncio
+import contextvars
 import copy
+import hashlib
 import importlib.metadata
 import logging
 import shutil
 import time
 from contextlib import asynccontextmanager
 from io import BytesIO
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import (
     BackgroundTasks,
     Depends,
     FastAPI,
     Form,
+    Header,
     HTTPException,
     Query,
+    Request,
     UploadFile,
     WebSocket,
     WebSocketDisconnect,
     status,
 )
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import (
     get_redoc_html,
     get_swagger_ui_html,
     get_swagger_ui_oauth2_redirect_html,
 )
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import (
+    JSONResponse,
+    RedirectResponse,
+    Response,
+    StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
-from scalar_fastapi import get_scalar_api_reference
+from pydantic import ValidationError
 
-from docling.datamodel.base_models import DocumentStream
+from docling.datamodel.base_models import DocumentStream, OutputFormat
 from docling_jobkit.datamodel.callback import (
     ProgressCallbackRequest,
     ProgressCallbackResponse,
@@ -41,7 +51,9 @@ from docling_jobkit.datamodel.chunking import (
     HierarchicalChunkerOptions,
     HybridChunkerOptions,
 )
+from docling_jobkit.datamodel.convert import DEFAULT_PAGE_RANGE
 from docling_jobkit.datamodel.http_inputs import FileSource, HttpSource
+from docling_jobkit.datamodel.result import DoclingTaskResult
 from docling_jobkit.datamodel.s3_coords import S3Coordinates
 from docling_jobkit.datamodel.task import Task, TaskSource, TaskType
 from docling_jobkit.datamodel.task_targets import (
@@ -54,6 +66,12 @@ from docling_jobkit.orchestrators.base_orchestrator import (
     TaskNotFoundError,
 )
 
+from docling_serve.admission import (
+    AdmissionRejectedError,
+    TaskCost,
+    get_admission_controller,
+    measure_task_cost,
+)
 from docling_serve.auth import APIKeyAuth, AuthenticationResult
 from docling_serve.datamodel.convert import ConvertDocumentsRequestOptions
 from docling_serve.datamodel.requests import (
@@ -72,15 +90,44 @@ from docling_serve.datamodel.responses import (
     ConvertDocumentResponse,
     HealthCheckResponse,
     MessageKind,
+    ModelPoolStatsResponse,
     PresignedUrlConvertDocumentResponse,
+    ReadinessResponse,
+    ResultCacheStatsResponse,
+    ResultExpiryStatsResponse,
+    TaskStatusCacheStatsResponse,
     TaskStatusResponse,
     WebsocketMessage,
 )
-from docling_serve.helper_functions import DOCLING_VERSIONS, FormDepends
-from docling_serve.orchestrator_factory import get_async_orchestrator
-from docling_serve.response_preparation import prepare_response
-from docling_serve.settings import docling_serve_settings
-from docling_serve.storage import get_scratch
+from docling_serve.fair_queue import DEFAULT_TENANT, TaskShare, current_task_share
+from docling_serve.helper_functions import FormDepends, get_docling_versions
+from docling_serve.metrics import MetricsMiddleware, get_metrics
+from docling_serve.ndjson_sources import (
+    SourceStreamError,
+    SourceTooLargeError,
+    parse_ndjson_sources,
+)
+from docling_serve.orchestrator_factory import (
+    TaskStatusCache,
+    cancel_task,
+    get_async_orchestrator,
+    worker_model_pool_stats,
+)
+from docling_serve.page_splitting import (
+    merge_window_results,
+    read_source_content,
+    split_pdf,
+)
+from docling_serve.readiness import get_readiness
+from docling_serve.response_preparation import (
+    EXPORT_MEDIA_TYPES,
+    prepare_export_response,
+    prepare_response,
+)
+from docling_serve.result_cache import CacheControl, get_result_cache, make_cache_key
+from docling_serve.result_expiry import get_result_expiry
+from docling_serve.settings import AsyncEngine, ResultCacheKind, docling_serve_settings
+from docling_serve.storage import ScratchFileSource, get_scratch, spool_upload
 from docling_serve.websocket_notifier import WebsocketNotifier
 
 
@@ -115,6 +162,30 @@ for handler in root_logger.handlers:  # Iterate through existing handlers
 
 _log = logging.getLogger(__name__)
 
+CacheControlHeader = Annotated[
+    str | None,
+    Header(
+        description=(
+            "Result cache directives. "
+            "`no-cache` skips the lookup and stores the new result, "
+            "`no-store` bypasses the cache."
+        ),
+    ),
+]
+
+NDJSON_REQUEST_BODY: dict[str, Any] = {
+    "requestBody": {
+        "required": True,
+        "description": (
+            "The conversion request as first line, followed by the sources. "
+            'A `{"kind": "file", "filename": ...}` line without `base64_string` '
+            "is followed by lines with JSON strings holding consecutive chunks "
+            "of the base64 content of the file."
+        ),
+        "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+    }
+}
+
 
 # Context manager to initialize and clean up the lifespan of the FastAPI app
 @asynccontextmanager
@@ -125,21 +196,31 @@ async def lifespan(app: FastAPI):
     notifier = WebsocketNotifier(orchestrator)
     orchestrator.bind_notifier(notifier)
 
-    # Warm up processing cache
-    if docling_serve_settings.load_models_at_boot:
-        await orchestrator.warm_up_caches()
+    # Warm up processing cache and start the background queue processor,
+    # the readiness tells when it is done
+    readiness = get_readiness()
+    readiness.start(orchestrator, warm_up=docling_serve_settings.load_models_at_boot)
+
+    metrics = get_metrics()
+    metrics_task = None
+    if metrics is not None:
+        metrics_task = asyncio.create_task(metrics.refresh_loop(orchestrator))
 
-    # Start the background queue processor
-    queue_task = asyncio.create_task(orchestrator.process_queue())
+    # Remove the results after they are served
+    expiry_task = None
+    if docling_serve_settings.single_use_results:
+        expiry_task = asyncio.create_task(get_result_expiry().run(orchestrator))
 
     yield
 
-    # Cancel the background queue processor on shutdown
-    queue_task.cancel()
-    try:
-        await queue_task
-    except asyncio.CancelledError:
-        _log.info("Queue processor cancelled.")
+    if metrics is not None and metrics_task is not None:
+        metrics_task.cancel()
+        metrics.shutdown()
+
+    if expiry_task is not None:
+        expiry_task.cancel()
+
+    await readiness.stop()
 
     # Remove scratch directory in case it was a tempfile
     if docling_serve_settings.scratch_path is not None:
@@ -188,18 +269,30 @@ def create_app():  # noqa: C901
         allow_headers=headers,
     )
 
+    metrics = get_metrics()
+    if metrics is not None:
+        app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+        @app.get("/metrics", tags=["health"], include_in_schema=False)
+        def prometheus_metrics() -> Response:
+            content, content_type = metrics.render()
+            return Response(content=content, media_type=content_type)
+
     # Mount the Gradio app
     if docling_serve_settings.enable_ui:
         try:
             import gradio as gr
 
-            from docling_serve.gradio_ui import ui as gradio_ui
+            from docling_serve.gradio_ui import set_api_app, ui as gradio_ui
             from docling_serve.settings import uvicorn_settings
 
             tmp_output_dir = get_scratch() / "gradio"
             tmp_output_dir.mkdir(exist_ok=True, parents=True)
             gradio_ui.gradio_output_dir = tmp_output_dir
 
+            # The UI calls this app in-process
+            set_api_app(app)
+
             # Build the root_path for Gradio, accounting for UVICORN_ROOT_PATH
             gradio_root_path = (
                 f"{uvicorn_settings.root_path}/ui"
@@ -255,6 +348,8 @@ def create_app():  # noqa: C901
 
     @app.get("/scalar", include_in_schema=False)
     async def scalar_html():
+        from scalar_fastapi import get_scalar_api_reference
+
         return get_scalar_api_reference(
             openapi_url=app.openapi_url,
             title=app.title,
@@ -266,18 +361,42 @@ def create_app():  # noqa: C901
     # Async / Sync helpers #
     ########################
 
-    async def _enque_source(
-        orchestrator: BaseOrchestrator,
+    async def _task_share(
+        request: Request,
+        x_priority: Annotated[
+            int,
+            Header(
+                ge=-10,
+                le=10,
+                description="Priority of the task, higher values go first.",
+            ),
+        ] = 0,
+    ) -> TaskShare:
+        # The queue is shared fairly between the tenants given by the header,
+        # the single API key authenticates the clients but cannot tell them apart
+        tenant = DEFAULT_TENANT
+        if docling_serve_settings.fair_share and (
+            tenant_header := request.headers.get(docling_serve_settings.tenant_header)
+        ):
+            tenant = f"tenant:{tenant_header}"
+        # The clients may lower the priority of their tasks, not raise it above
+        # the configured bound
+        priority = min(x_priority, docling_serve_settings.max_priority)
+        return TaskShare(tenant=tenant, priority=priority)
+
+    def _task_source(
+        s: FileSourceRequest | HttpSourceRequest | S3SourceRequest,
+    ) -> TaskSource:
+        if isinstance(s, FileSourceRequest):
+            return FileSource.model_validate(s)
+        elif isinstance(s, HttpSourceRequest):
+            return HttpSource.model_validate(s)
+        return S3Coordinates.model_validate(s)
+
+    def _source_task_args(
         request: ConvertDocumentsRequest | GenericChunkDocumentsRequest,
-    ) -> Task:
-        sources: list[TaskSource] = []
-        for s in request.sources:
-            if isinstance(s, FileSourceRequest):
-                sources.append(FileSource.model_validate(s))
-            elif isinstance(s, HttpSourceRequest):
-                sources.append(HttpSource.model_validate(s))
-            elif isinstance(s, S3SourceRequest):
-                sources.append(S3Coordinates.model_validate(s))
+    ) -> dict[str, Any]:
+        sources: list[TaskSource] = [_task_source(s) for s in request.sources]
 
         convert_options: ConvertDocumentsRequestOptions
         chunking_options: BaseChunkerOptions | None = None
@@ -296,16 +415,189 @@ def create_app():  # noqa: C901
         else:
             raise RuntimeError("Uknown request type.")
 
-        task = await orchestrator.enqueue(
-            task_type=task_type,
-            sources=sources,
-            convert_options=convert_options,
-            chunking_options=chunking_options,
-            chunking_export_options=chunking_export_options,
-            target=request.target,
+        return {
+            "task_type": task_type,
+            "sources": sources,
+            "convert_options": convert_options,
+            "chunking_options": chunking_options,
+            "chunking_export_options": chunking_export_options,
+            "target": request.target,
+        }
+
+    async def _file_task_args(
+        files: list[UploadFile],
+        task_type: TaskType,
+        convert_options: ConvertDocumentsRequestOptions,
+        chunking_options: BaseChunkerOptions | None,
+        chunking_export_options: ChunkingExportOptions | None,
+        target: TargetRequest,
+    ) -> dict[str, Any]:
+        _log.info(f"Received {len(files)} files for processing.")
+
+        # The local engine reads the uploads lazily from the scratch directory,
+        # the other engines need the content in a Docling DocumentStream
+        spool_files = docling_serve_settings.eng_kind == AsyncEngine.LOCAL
+
+        file_sources: list[TaskSource] = []
+        try:
+            for i, file in enumerate(files):
+                suffix = "" if len(file_sources) == 1 else f"_{i}"
+                name = file.filename if file.filename else f"file{suffix}.pdf"
+                if spool_files:
+                    spool_path, sha256 = await asyncio.to_thread(
+                        spool_upload, file.file
+                    )
+                    file_sources.append(
+                        ScratchFileSource(filename=name, path=spool_path, sha256=sha256)
+                    )
+                else:
+                    buf = BytesIO(file.file.read())
+                    file_sources.append(DocumentStream(name=name, stream=buf))
+        except BaseException:
+            _discard_sources(file_sources)
+            raise
+
+        return {
+            "task_type": task_type,
+            "sources": file_sources,
+            "convert_options": convert_options,
+            "chunking_options": chunking_options,
+            "chunking_export_options": chunking_export_options,
+            "target": target,
+        }
+
+    async def _ndjson_task_args(request: Request) -> dict[str, Any]:
+        try:
+            parser = await parse_ndjson_sources(request.stream())
+        except SourceTooLargeError as e:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e)
+            )
+        except SourceStreamError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+
+        # The spooled files are read lazily only by the local engine
+        spool_files = docling_serve_settings.eng_kind == AsyncEngine.LOCAL
+
+        sources: list[TaskSource] = []
+        try:
+            conversion_request = ConvertDocumentsRequest.model_validate(
+                {"sources": [], **(parser.request or {})}
+            )
+            task_args = _source_task_args(conversion_request)
+            for source in parser.sources:
+                if isinstance(source, ScratchFileSource):
+                    sources.append(
+                        source
+                        if spool_files
+                        else await asyncio.to_thread(source.to_document_stream)
+                    )
+                else:
+                    sources.append(_task_source(source))
+        except ValidationError as e:
+            parser.discard()
+            raise RequestValidationError(e.errors())
+        except BaseException:
+            parser.discard()
+            raise
+
+        task_args["sources"].extend(sources)
+        if not task_args["sources"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The request does not contain any source.",
+            )
+        return task_args
+
+    def _discard_sources(sources: list[TaskSource]):
+        for source in sources:
+            if isinstance(source, ScratchFileSource):
+                source.discard()
+
+    def _reject_split(options: ConvertDocumentsRequestOptions):
+        """The page windows are only converted by the synchronous endpoints."""
+        if options.split_page_count is not None:
+            raise HTTPException(
+                status_code=422,
+                detail="split_page_count is only supported by the synchronous "
+                "convert endpoints.",
+            )
+
+    def _too_many_requests(e: AdmissionRejectedError) -> HTTPException:
+        metrics = get_metrics()
+        if metrics is not None:
+            metrics.rejected_tasks.inc()
+        return HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
         )
+
+    async def _admit(
+        orchestrator: BaseOrchestrator, cost: TaskCost, check: bool = True
+    ) -> int | None:
+        """
+        Reserve the share of the task in the admission limits, returning the
+        ticket of the reservation, or None when there are no limits.
+        """
+        admission = get_admission_controller()
+        if admission is None:
+            return None
+
+        try:
+            return admission.admit(orchestrator, cost, check=check)
+        except AdmissionRejectedError as e:
+            raise _too_many_requests(e)
+
+    async def _enque(
+        orchestrator: BaseOrchestrator,
+        task_args: dict[str, Any],
+        share: TaskShare,
+        check_admission: bool = True,
+    ) -> Task:
+        # The queue of the orchestrator reads the share when the task is put,
+        # the cost of a task is its number of pages. The PDFs are only opened
+        # for the limit of the pages in flight, else their pages are estimated.
+        admission = get_admission_controller()
+        count_pages = admission is not None and admission.count_pages
+        ticket: int | None = None
+        token: contextvars.Token[TaskShare] | None = None
+        try:
+            cost = await asyncio.to_thread(
+                measure_task_cost,
+                task_args["sources"],
+                task_args["convert_options"].page_range,
+                count_pages,
+            )
+            token = current_task_share.set(
+                share.model_copy(update={"cost": max(cost.num_pages, 1)})
+            )
+            ticket = await _admit(orchestrator, cost, check=check_admission)
+            task = await orchestrator.enqueue(**task_args)
+        except BaseException:
+            admission = get_admission_controller()
+            if admission is not None and ticket is not None:
+                admission.cancel(ticket)
+            _discard_sources(task_args["sources"])
+            raise
+        finally:
+            if token is not None:
+                current_task_share.reset(token)
+
+        admission = get_admission_controller()
+        if admission is not None and ticket is not None:
+            admission.bind(ticket, task.task_id)
         return task
 
+    async def _enque_source(
+        orchestrator: BaseOrchestrator,
+        request: ConvertDocumentsRequest | GenericChunkDocumentsRequest,
+        share: TaskShare,
+    ) -> Task:
+        return await _enque(orchestrator, _source_task_args(request), share)
+
     async def _enque_file(
         orchestrator: BaseOrchestrator,
         files: list[UploadFile],
@@ -314,37 +606,269 @@ def create_app():  # noqa: C901
         chunking_options: BaseChunkerOptions | None,
         chunking_export_options: ChunkingExportOptions | None,
         target: TargetRequest,
+        share: TaskShare,
     ) -> Task:
-        _log.info(f"Received {len(files)} files for processing.")
-
-        # Load the uploaded files to Docling DocumentStream
-        file_sources: list[TaskSource] = []
-        for i, file in enumerate(files):
-            buf = BytesIO(file.file.read())
-            suffix = "" if len(file_sources) == 1 else f"_{i}"
-            name = file.filename if file.filename else f"file{suffix}.pdf"
-            file_sources.append(DocumentStream(name=name, stream=buf))
-
-        task = await orchestrator.enqueue(
+        task_args = await _file_task_args(
+            files=files,
             task_type=task_type,
-            sources=file_sources,
             convert_options=convert_options,
             chunking_options=chunking_options,
             chunking_export_options=chunking_export_options,
             target=target,
         )
-        return task
+        return await _enque(orchestrator, task_args, share)
+
+    async def _process_sync(
+        orchestrator: BaseOrchestrator,
+        background_tasks: BackgroundTasks,
+        task_args: dict[str, Any],
+        cache_control: CacheControl,
+        share: TaskShare,
+        request: Request,
+    ):
+        result_cache = get_result_cache()
+        cache_key: str | None = None
+        if result_cache is not None:
+            # The file sources not spooled are hashed, out of the event loop
+            cache_key = await asyncio.to_thread(make_cache_key, **task_args)
+            cached_result = await result_cache.get(cache_key, cache_control)
+            if cached_result is not None:
+                _discard_sources(task_args["sources"])
+                return await prepare_response(
+                    task_id=None,
+                    task_result=cached_result,
+                    orchestrator=orchestrator,
+                    background_tasks=background_tasks,
+                )
+
+        # The sub-tasks of the page windows are already removed
+        task_id: str | None = None
+        task_result = await _convert_split(orchestrator, task_args, share, request)
+        if task_result is None:
+            task = await _enque(orchestrator, task_args, share)
+            task_id = task.task_id
+            task_result = await _wait_task_result(orchestrator, task_id, request)
+
+        if result_cache is not None:
+            await result_cache.set(cache_key, task_result, cache_control)
+
+        response = await prepare_response(
+            task_id=task_id,
+            task_result=task_result,
+            orchestrator=orchestrator,
+            background_tasks=background_tasks,
+        )
+        return response
+
+    async def _wait_task_result(
+        orchestrator: BaseOrchestrator, task_id: str, request: Request | None = None
+    ) -> DoclingTaskResult:
+        try:
+            completed = await _wait_task_complete(
+                orchestrator=orchestrator, task_id=task_id, request=request
+            )
+        except asyncio.CancelledError:
+            await _cancel_task(orchestrator, task_id)
+            _delete_later(orchestrator, [task_id])
+            raise
+
+        if not completed:
+            # Nobody will fetch the result, the worker is released
+            await _cancel_task(orchestrator, task_id)
+            _delete_later(orchestrator, [task_id])
+            if request is not None and await request.is_disconnected():
+                raise HTTPException(
+                    status_code=499,
+                    detail="The client closed the request.",
+                )
+            raise HTTPException(
+                status_code=504,
+                detail=f"Conversion is taking too long. The maximum wait time is configure as DOCLING_SERVE_MAX_SYNC_WAIT={docling_serve_settings.max_sync_wait}.",
+            )
+
+        task_result = await orchestrator.task_result(task_id=task_id)
+        if task_result is None:
+            raise HTTPException(
+                status_code=404,
+                detail="Task result not found. Please wait for a completion status.",
+            )
+        return task_result
+
+    async def _cancel_task(orchestrator: BaseOrchestrator, task_id: str):
+        try:
+            if await cancel_task(orchestrator, task_id):
+                _log.info(f"Cancelled the task {task_id}")
+        except TaskNotFoundError:
+            pass
+        except Exception as e:
+            _log.error(f"Error cancelling the task {task_id}: {e}")
+
+    async def _convert_split(
+        orchestrator: BaseOrchestrator,
+        task_args: dict[str, Any],
+        share: TaskShare,
+        request: Request,
+    ) -> DoclingTaskResult | None:
+        """
+        Convert a PDF in windows of split_page_count pages, processed as parallel
+        sub-tasks and merged back into one document.
+
+        Returns None when the task is not split.
+        """
+        options = task_args["convert_options"]
+        sources = task_args["sources"]
+        if (
+            task_args["task_type"] != TaskType.CONVERT
+            or not isinstance(options, ConvertDocumentsRequestOptions)
+            or options.split_page_count is None
+            or len(sources) != 1
+            or not isinstance(task_args["target"], InBodyTarget)
+        ):
+            return None
+
+        source_content = await asyncio.to_thread(read_source_content, sources[0])
+        if source_content is None:
+            return None
+        filename, content = source_content
+        split = await asyncio.to_thread(
+            split_pdf, content, options.split_page_count, options.page_range
+        )
+        if split is None:
+            return None
+        first_page, windows = split
+        _log.info(f"Converting {filename} in {len(windows)} page windows.")
+
+        # The whole document is checked against the admission limits, the
+        # windows are then admitted without rejecting some of them
+        admission = get_admission_controller()
+        if admission is not None:
+            cost = await asyncio.to_thread(
+                measure_task_cost, sources, options.page_range, admission.count_pages
+            )
+            try:
+                admission.check(orchestrator, cost)
+            except AdmissionRejectedError as e:
+                _discard_sources(sources)
+                raise _too_many_requests(e)
+
+        # The windows replace the original source
+        _discard_sources(sources)
+        window_options = options.model_copy(
+            update={
+                "to_formats": [OutputFormat.JSON],
+                "page_range": DEFAULT_PAGE_RANGE,
+                "split_page_count": None,
+            }
+        )
+
+        start_time = time.monotonic()
+        window_tasks: list[Task] = []
+        waiters: list[asyncio.Future[DoclingTaskResult]] = []
+        try:
+            for window in windows:
+                task = await _enque(
+                    orchestrator,
+                    {
+                        **task_args,
+                        "sources": [
+                            DocumentStream(name=filename, stream=BytesIO(window))
+                        ],
+                        "convert_options": window_options,
+                    },
+                    share,
+                    check_admission=False,
+                )
+                window_tasks.append(task)
+                waiters.append(
+                    asyncio.ensure_future(
+                        _wait_task_result(orchestrator, task.task_id, request)
+                    )
+                )
+            window_results = await asyncio.gather(*waiters)
+        except BaseException:
+            # A failed window, or a window which could not be enqueued, fails
+            # the document. The waiters not started yet do not cancel their
+            # window, the windows already enqueued are all cancelled here.
+            for waiter in waiters:
+                waiter.cancel()
+            for task in window_tasks:
+                await _cancel_task(orchestrator, task.task_id)
+            _delete_later(orchestrator, [task.task_id for task in window_tasks])
+            raise
+        for task in window_tasks:
+            await orchestrator.delete_task(task_id=task.task_id)
+
+        return await asyncio.to_thread(
+            merge_window_results,
+            filename=filename,
+            content=content,
+            first_page=first_page,
+            window_results=list(window_results),
+            options=options,
+            processing_time=time.monotonic() - start_time,
+        )
+
+    async def _wait_task_complete(
+        orchestrator: BaseOrchestrator, task_id: str, request: Request | None = None
+    ) -> bool:
+        """
+        Wait until the task is completed, returns False after max_sync_wait or
+        when the client of the request is disconnected.
+        """
+        # The local and RQ engines notify the completion of the tasks, the KFP
+        # engine is polled every sync_poll_interval. The client is checked at
+        # the same interval.
+        notifier = orchestrator.notifier
+        can_signal = docling_serve_settings.eng_kind != AsyncEngine.KFP
 
-    async def _wait_task_complete(orchestrator: BaseOrchestrator, task_id: str) -> bool:
         start_time = time.monotonic()
         while True:
             task = await orchestrator.task_status(task_id=task_id)
             if task.is_completed():
                 return True
-            await asyncio.sleep(docling_serve_settings.sync_poll_interval)
-            elapsed_time = time.monotonic() - start_time
-            if elapsed_time > docling_serve_settings.max_sync_wait:
+            remaining = docling_serve_settings.max_sync_wait - (
+                time.monotonic() - start_time
+            )
+            if remaining <= 0:
+                return False
+            if request is not None and await request.is_disconnected():
+                _log.info(f"The client waiting for task {task_id} is disconnected.")
                 return False
+            if (
+                can_signal
+                and isinstance(notifier, WebsocketNotifier)
+                and task_id in notifier.task_completed
+            ):
+                timeout = remaining
+                if request is not None:
+                    timeout = min(docling_serve_settings.sync_poll_interval, remaining)
+                await notifier.wait_task_completed(task_id=task_id, timeout=timeout)
+            else:
+                await asyncio.sleep(
+                    min(docling_serve_settings.sync_poll_interval, remaining)
+                )
+
+    # Deletions waiting for the workers to stop the cancelled tasks
+    pending_deletions: set[asyncio.Task] = set()
+
+    async def _delete_when_completed(orchestrator: BaseOrchestrator, task_id: str):
+        try:
+            while not (await orchestrator.task_status(task_id=task_id)).is_completed():
+                await _wait_task_complete(orchestrator, task_id)
+            await orchestrator.delete_task(task_id=task_id)
+        except TaskNotFoundError:
+            pass
+        except Exception as e:
+            _log.error(f"Error deleting the task {task_id}: {e}")
+
+    def _delete_later(orchestrator: BaseOrchestrator, task_ids: list[str]):
+        """Delete the tasks once completed, without waiting for them."""
+        for task_id in task_ids:
+            deletion = asyncio.create_task(
+                _delete_when_completed(orchestrator, task_id)
+            )
+            pending_deletions.add(deletion)
+            deletion.add_done_callback(pending_deletions.discard)
 
     ##########################################
     # Downgrade openapi 3.1 to 3.0.x helpers #
@@ -412,12 +936,33 @@ def create_app():  # noqa: C901
     # API Endpoints definitions #
     #############################
 
+    # The downgraded spec is computed once, with its serialization and ETag
+    openapi_30_cache: list[tuple[bytes, str]] = []
+
+    def _openapi_30_document() -> tuple[bytes, str]:
+        if not openapi_30_cache:
+            spec = app.openapi()
+            downgraded = downgrade_openapi31_to_30(spec)
+            downgraded["openapi"] = "3.0.3"
+            body = JSONResponse(downgraded).body
+            etag = f'"{hashlib.sha256(body).hexdigest()}"'
+            openapi_30_cache.append((bytes(body), etag))
+        return openapi_30_cache[0]
+
     @app.get("/openapi-3.0.json")
-    def openapi_30():
-        spec = app.openapi()
-        downgraded = downgrade_openapi31_to_30(spec)
-        downgraded["openapi"] = "3.0.3"
-        return JSONResponse(downgraded)
+    def openapi_30(request: Request):
+        body, etag = _openapi_30_document()
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if etag in tags or "*" in tags:
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+                )
+
+        return Response(content=body, media_type="application/json", headers=headers)
 
     # Favicon
     @app.get("/favicon.ico", include_in_schema=False)
@@ -432,6 +977,41 @@ def create_app():  # noqa: C901
     def health() -> HealthCheckResponse:
         return HealthCheckResponse()
 
+    # Readiness, once the models are loaded and the workers can take tasks
+    @app.get(
+        "/ready",
+        tags=["health"],
+        responses={
+            status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessResponse},
+        },
+    )
+    async def ready(
+        orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+    ) -> ReadinessResponse:
+        readiness = await get_readiness().check(orchestrator)
+        if readiness.status != "ready":
+            return JSONResponse(  # type: ignore[return-value]
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content=readiness.model_dump(mode="json"),
+            )
+        return readiness
+
+    # Progress of the startup, until the server is ready or failed
+    @app.get(
+        "/ready/stream",
+        tags=["health"],
+        response_class=StreamingResponse,
+        responses={
+            200: {"content": {"application/x-ndjson": {"schema": {"type": "string"}}}}
+        },
+    )
+    async def ready_stream():
+        async def events():
+            async for event in get_readiness().progress():
+                yield event.model_dump_json() + "\n"
+
+        return StreamingResponse(events(), media_type="application/x-ndjson")
+
     # API readiness compatibility for OpenShift AI Workbench
     @app.get("/api", include_in_schema=False)
     def api_check() -> HealthCheckResponse:
@@ -445,7 +1025,7 @@ def create_app():  # noqa: C901
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Forbidden. The server is configured for not showing version details.",
             )
-        return DOCLING_VERSIONS
+        return get_docling_versions()
 
     # Convert a document from URL(s)
     @app.post(
@@ -463,35 +1043,19 @@ def create_app():  # noqa: C901
         background_tasks: BackgroundTasks,
         auth: Annotated[AuthenticationResult, Depends(require_auth)],
         orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+        share: Annotated[TaskShare, Depends(_task_share)],
+        http_request: Request,
         conversion_request: ConvertDocumentsRequest,
+        cache_control: CacheControlHeader = None,
     ):
-        task = await _enque_source(
-            orchestrator=orchestrator, request=conversion_request
-        )
-        completed = await _wait_task_complete(
-            orchestrator=orchestrator, task_id=task.task_id
-        )
-
-        if not completed:
-            # TODO: abort task!
-            raise HTTPException(
-                status_code=504,
-                detail=f"Conversion is taking too long. The maximum wait time is configure as DOCLING_SERVE_MAX_SYNC_WAIT={docling_serve_settings.max_sync_wait}.",
-            )
-
-        task_result = await orchestrator.task_result(task_id=task.task_id)
-        if task_result is None:
-            raise HTTPException(
-                status_code=404,
-                detail="Task result not found. Please wait for a completion status.",
-            )
-        response = await prepare_response(
-            task_id=task.task_id,
-            task_result=task_result,
+        return await _process_sync(
             orchestrator=orchestrator,
             background_tasks=background_tasks,
+            task_args=_source_task_args(conversion_request),
+            cache_control=CacheControl.from_header(cache_control),
+            share=share,
+            request=http_request,
         )
-        return response
 
     # Convert a document from file(s)
     @app.post(
@@ -508,46 +1072,61 @@ def create_app():  # noqa: C901
         background_tasks: BackgroundTasks,
         auth: Annotated[AuthenticationResult, Depends(require_auth)],
         orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+        share: Annotated[TaskShare, Depends(_task_share)],
+        http_request: Request,
         files: list[UploadFile],
         options: Annotated[
             ConvertDocumentsRequestOptions, FormDepends(ConvertDocumentsRequestOptions)
         ],
         target_type: Annotated[TargetName, Form()] = TargetName.INBODY,
+        cache_control: CacheControlHeader = None,
     ):
         target = InBodyTarget() if target_type == TargetName.INBODY else ZipTarget()
-        task = await _enque_file(
+        task_args = await _file_task_args(
             task_type=TaskType.CONVERT,
-            orchestrator=orchestrator,
             files=files,
             convert_options=options,
             chunking_options=None,
             chunking_export_options=None,
             target=target,
         )
-        completed = await _wait_task_complete(
-            orchestrator=orchestrator, task_id=task.task_id
+        return await _process_sync(
+            orchestrator=orchestrator,
+            background_tasks=background_tasks,
+            task_args=task_args,
+            cache_control=CacheControl.from_header(cache_control),
+            share=share,
+            request=http_request,
         )
 
-        if not completed:
-            # TODO: abort task!
-            raise HTTPException(
-                status_code=504,
-                detail=f"Conversion is taking too long. The maximum wait time is configure as DOCLING_SERVE_MAX_SYNC_WAIT={docling_serve_settings.max_sync_wait}.",
-            )
-
-        task_result = await orchestrator.task_result(task_id=task.task_id)
-        if task_result is None:
-            raise HTTPException(
-                status_code=404,
-                detail="Task result not found. Please wait for a completion status.",
-            )
-        response = await prepare_response(
-            task_id=task.task_id,
-            task_result=task_result,
+    # Convert documents streamed as NDJSON, with the files in base64 chunks
+    @app.post(
+        "/v1/convert/ndjson",
+        tags=["convert"],
+        response_model=ConvertDocumentResponse | PresignedUrlConvertDocumentResponse,
+        responses={
+            200: {
+                "content": {"application/zip": {}},
+            }
+        },
+        openapi_extra=NDJSON_REQUEST_BODY,
+    )
+    async def process_ndjson(
+        background_tasks: BackgroundTasks,
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+        orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+        share: Annotated[TaskShare, Depends(_task_share)],
+        request: Request,
+        cache_control: CacheControlHeader = None,
+    ):
+        return await _process_sync(
             orchestrator=orchestrator,
             background_tasks=background_tasks,
+            task_args=await _ndjson_task_args(request),
+            cache_control=CacheControl.from_header(cache_control),
+            share=share,
+            request=request,
         )
-        return response
 
     # Convert a document from URL(s) using the async api
     @app.post(
@@ -558,10 +1137,12 @@ def create_app():  # noqa: C901
     async def process_url_async(
         auth: Annotated[AuthenticationResult, Depends(require_auth)],
         orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+        share: Annotated[TaskShare, Depends(_task_share)],
         conversion_request: ConvertDocumentsRequest,
     ):
+        _reject_split(conversion_request.options)
         task = await _enque_source(
-            orchestrator=orchestrator, request=conversion_request
+            orchestrator=orchestrator, request=conversion_request, share=share
         )
         task_queue_position = await orchestrator.get_queue_position(
             task_id=task.task_id
@@ -574,6 +1155,37 @@ def create_app():  # noqa: C901
             task_meta=task.processing_meta,
         )
 
+    # Convert documents streamed as NDJSON using the async api
+    @app.post(
+        "/v1/convert/ndjson/async",
+        tags=["convert"],
+        response_model=TaskStatusResponse,
+        openapi_extra=NDJSON_REQUEST_BODY,
+    )
+    async def process_ndjson_async(
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+        orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+        share: Annotated[TaskShare, Depends(_task_share)],
+        request: Request,
+    ):
+        task_args = await _ndjson_task_args(request)
+        try:
+            _reject_split(task_args["convert_options"])
+        except HTTPException:
+            _discard_sources(task_args["sources"])
+            raise
+        task = await _enque(orchestrator, task_args, share)
+        task_queue_position = await orchestrator.get_queue_position(
+            task_id=task.task_id
+        )
+        return TaskStatusResponse(
+            task_id=task.task_id,
+            task_type=task.task_type,
+            task_status=task.task_status,
+            task_position=task_queue_position,
+            task_meta=task.processing_meta,
+        )
+
     # Convert a document from file(s) using the async api
     @app.post(
         "/v1/convert/file/async",
@@ -583,6 +1195,7 @@ def create_app():  # noqa: C901
     async def process_file_async(
         auth: Annotated[AuthenticationResult, Depends(require_auth)],
         orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+        share: Annotated[TaskShare, Depends(_task_share)],
         background_tasks: BackgroundTasks,
         files: list[UploadFile],
         options: Annotated[
@@ -590,6 +1203,7 @@ def create_app():  # noqa: C901
         ],
         target_type: Annotated[TargetName, Form()] = TargetName.INBODY,
     ):
+        _reject_split(options)
         target = InBodyTarget() if target_type == TargetName.INBODY else ZipTarget()
         task = await _enque_file(
             task_type=TaskType.CONVERT,
@@ -599,6 +1213,7 @@ def create_app():  # noqa: C901
             chunking_options=None,
             chunking_export_options=None,
             target=target,
+            share=share,
         )
         task_queue_position = await orchestrator.get_queue_position(
             task_id=task.task_id
@@ -628,9 +1243,12 @@ def create_app():  # noqa: C901
             background_tasks: BackgroundTasks,
             auth: Annotated[AuthenticationResult, Depends(require_auth)],
             orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+            share: Annotated[TaskShare, Depends(_task_share)],
             request: req_cls,
         ):
-            task = await _enque_source(orchestrator=orchestrator, request=request)
+            task_args = _source_task_args(request)
+            _reject_split(task_args["convert_options"])
+            task = await _enque(orchestrator, task_args, share)
             task_queue_position = await orchestrator.get_queue_position(
                 task_id=task.task_id
             )
@@ -652,6 +1270,7 @@ def create_app():  # noqa: C901
             background_tasks: BackgroundTasks,
             auth: Annotated[AuthenticationResult, Depends(require_auth)],
             orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+            share: Annotated[TaskShare, Depends(_task_share)],
             files: list[UploadFile],
             convert_options: Annotated[
                 ConvertDocumentsRequestOptions,
@@ -682,6 +1301,7 @@ def create_app():  # noqa: C901
                 Form(description="Specification for the type of output target."),
             ] = TargetName.INBODY,
         ):
+            _reject_split(convert_options)
             target = InBodyTarget() if target_type == TargetName.INBODY else ZipTarget()
             task = await _enque_file(
                 task_type=TaskType.CHUNK,
@@ -693,6 +1313,7 @@ def create_app():  # noqa: C901
                     include_converted_doc=include_converted_doc
                 ),
                 target=target,
+                share=share,
             )
             task_queue_position = await orchestrator.get_queue_position(
                 task_id=task.task_id
@@ -721,33 +1342,19 @@ def create_app():  # noqa: C901
             background_tasks: BackgroundTasks,
             auth: Annotated[AuthenticationResult, Depends(require_auth)],
             orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+            share: Annotated[TaskShare, Depends(_task_share)],
+            http_request: Request,
             request: req_cls,
+            cache_control: CacheControlHeader = None,
         ):
-            task = await _enque_source(orchestrator=orchestrator, request=request)
-            completed = await _wait_task_complete(
-                orchestrator=orchestrator, task_id=task.task_id
-            )
-
-            if not completed:
-                # TODO: abort task!
-                raise HTTPException(
-                    status_code=504,
-                    detail=f"Conversion is taking too long. The maximum wait time is configure as DOCLING_SERVE_MAX_SYNC_WAIT={docling_serve_settings.max_sync_wait}.",
-                )
-
-            task_result = await orchestrator.task_result(task_id=task.task_id)
-            if task_result is None:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Task result not found. Please wait for a completion status.",
-                )
-            response = await prepare_response(
-                task_id=task.task_id,
-                task_result=task_result,
+            return await _process_sync(
                 orchestrator=orchestrator,
                 background_tasks=background_tasks,
+                task_args=_source_task_args(request),
+                cache_control=CacheControl.from_header(cache_control),
+                share=share,
+                request=http_request,
             )
-            return response
 
         @app.post(
             f"/v1/chunk/{path_name}/file",
@@ -764,6 +1371,8 @@ def create_app():  # noqa: C901
             background_tasks: BackgroundTasks,
             auth: Annotated[AuthenticationResult, Depends(require_auth)],
             orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+            share: Annotated[TaskShare, Depends(_task_share)],
+            http_request: Request,
             files: list[UploadFile],
             convert_options: Annotated[
                 ConvertDocumentsRequestOptions,
@@ -793,11 +1402,11 @@ def create_app():  # noqa: C901
                 TargetName,
                 Form(description="Specification for the type of output target."),
             ] = TargetName.INBODY,
+            cache_control: CacheControlHeader = None,
         ):
             target = InBodyTarget() if target_type == TargetName.INBODY else ZipTarget()
-            task = await _enque_file(
+            task_args = await _file_task_args(
                 task_type=TaskType.CHUNK,
-                orchestrator=orchestrator,
                 files=files,
                 convert_options=convert_options,
                 chunking_options=chunking_options,
@@ -806,30 +1415,14 @@ def create_app():  # noqa: C901
                 ),
                 target=target,
             )
-            completed = await _wait_task_complete(
-                orchestrator=orchestrator, task_id=task.task_id
-            )
-
-            if not completed:
-                # TODO: abort task!
-                raise HTTPException(
-                    status_code=504,
-                    detail=f"Conversion is taking too long. The maximum wait time is configure as DOCLING_SERVE_MAX_SYNC_WAIT={docling_serve_settings.max_sync_wait}.",
-                )
-
-            task_result = await orchestrator.task_result(task_id=task.task_id)
-            if task_result is None:
-                raise HTTPException(
-                    status_code=404,
-                    detail="Task result not found. Please wait for a completion status.",
-                )
-            response = await prepare_response(
-                task_id=task.task_id,
-                task_result=task_result,
+            return await _process_sync(
                 orchestrator=orchestrator,
                 background_tasks=background_tasks,
+                task_args=task_args,
+                cache_control=CacheControl.from_header(cache_control),
+                share=share,
+                request=http_request,
             )
-            return response
 
     # Task status poll
     @app.get(
@@ -846,8 +1439,21 @@ def create_app():  # noqa: C901
             Query(description="Number of seconds to wait for a completed status."),
         ] = 0.0,
     ):
+        start_time = time.monotonic()
         try:
             task = await orchestrator.task_status(task_id=task_id, wait=wait)
+            # The local engine does not wait itself, its notifier signals the
+            # completion of the tasks
+            remaining = wait - (time.monotonic() - start_time)
+            notifier = orchestrator.notifier
+            if (
+                remaining > 0
+                and not task.is_completed()
+                and isinstance(notifier, WebsocketNotifier)
+                and task_id in notifier.task_completed
+            ):
+                await notifier.wait_task_completed(task_id=task_id, timeout=remaining)
+                task = await orchestrator.task_status(task_id=task_id)
             task_queue_position = await orchestrator.get_queue_position(task_id=task_id)
         except TaskNotFoundError:
             raise HTTPException(status_code=404, detail="Task not found.")
@@ -891,8 +1497,9 @@ def create_app():  # noqa: C901
             await websocket.close()
             return
 
-        # Track active WebSocket connections for this job
-        orchestrator.notifier.task_subscribers[task_id].add(websocket)
+        # Track active WebSocket connections for this job, all the messages
+        # are sent via the subscriber queue
+        subscriber = orchestrator.notifier.subscribe(task_id, websocket)
 
         try:
             task_queue_position = await orchestrator.get_queue_position(task_id=task_id)
@@ -903,7 +1510,7 @@ def create_app():  # noqa: C901
                 task_position=task_queue_position,
                 task_meta=task.processing_meta,
             )
-            await websocket.send_text(
+            subscriber.send(
                 WebsocketMessage(
                     message=MessageKind.CONNECTION, task=task_response
                 ).model_dump_json()
@@ -919,7 +1526,7 @@ def create_app():  # noqa: C901
                     task_position=task_queue_position,
                     task_meta=task.processing_meta,
                 )
-                await websocket.send_text(
+                subscriber.send(
                     WebsocketMessage(
                         message=MessageKind.UPDATE, task=task_response
                     ).model_dump_json()
@@ -932,7 +1539,7 @@ def create_app():  # noqa: C901
             _log.info(f"WebSocket disconnected for job {task_id}")
 
         finally:
-            orchestrator.notifier.task_subscribers[task_id].remove(websocket)
+            orchestrator.notifier.unsubscribe(task_id, subscriber)
 
     # Task result
     @app.get(
@@ -970,6 +1577,88 @@ def create_app():  # noqa: C901
         except TaskNotFoundError:
             raise HTTPException(status_code=404, detail="Task not found.")
 
+    # Task result in a single format
+    @app.get(
+        "/v1/result/{task_id}/{output_format}",
+        tags=["tasks"],
+        response_class=Response,
+        responses={
+            200: {
+                "content": {
+                    media_type.split(";")[0]: {}
+                    for media_type in EXPORT_MEDIA_TYPES.values()
+                },
+            }
+        },
+    )
+    async def task_result_export(
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+        orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+        background_tasks: BackgroundTasks,
+        task_id: str,
+        output_format: OutputFormat,
+        document: Annotated[
+            str | None,
+            Query(
+                description="File name or stem of the document, "
+                "required when the task converted several documents.",
+            ),
+        ] = None,
+    ):
+        """
+        Fetch a single export of the result, as raw content. The formats not
+        requested with the task are computed from the JSON export.
+        """
+        try:
+            task_result = await orchestrator.task_result(task_id=task_id)
+            if task_result is None:
+                raise HTTPException(
+                    status_code=404,
+                    detail="Task result not found. Please wait for a completion status.",
+                )
+            return await prepare_export_response(
+                task_id=task_id,
+                task_result=task_result,
+                output_format=output_format,
+                document=document,
+                background_tasks=background_tasks,
+            )
+        except TaskNotFoundError:
+            raise HTTPException(status_code=404, detail="Task not found.")
+
+    # Cancel and delete a task
+    @app.delete(
+        "/v1/task/{task_id}",
+        tags=["tasks"],
+        response_model=TaskStatusResponse,
+    )
+    async def delete_task(
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+        orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+        task_id: str,
+    ):
+        """
+        Cancel a task and delete it with its result. A queued task is revoked,
+        a running task is stopped at its next page and deleted once stopped.
+        """
+        try:
+            await cancel_task(orchestrator, task_id)
+            task = await orchestrator.task_status(task_id=task_id)
+        except TaskNotFoundError:
+            raise HTTPException(status_code=404, detail="Task not found.")
+
+        response = TaskStatusResponse(
+            task_id=task.task_id,
+            task_type=task.task_type,
+            task_status=task.task_status,
+            task_meta=task.processing_meta,
+        )
+        if task.is_completed():
+            await orchestrator.delete_task(task_id=task_id)
+        else:
+            _delete_later(orchestrator, [task_id])
+        return response
+
     # Update task progress
     @app.post(
         "/v1/callback/task/progress",
@@ -992,6 +1681,86 @@ def create_app():  # noqa: C901
                 status_code=400, detail=f"Invalid progress payload: {err}"
             )
 
+    #### Result cache
+
+    @app.get(
+        "/v1/cache/stats",
+        tags=["cache"],
+        response_model=ResultCacheStatsResponse,
+    )
+    async def cache_stats(
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+    ):
+        result_cache = get_result_cache()
+        if result_cache is None:
+            return ResultCacheStatsResponse(
+                kind=ResultCacheKind.NONE.value,
+                hits=0,
+                misses=0,
+                bypassed=0,
+                stored=0,
+            )
+        return ResultCacheStatsResponse(
+            kind=result_cache.kind.value,
+            hits=result_cache.hits,
+            misses=result_cache.misses,
+            bypassed=result_cache.bypassed,
+            stored=result_cache.stored,
+        )
+
+    @app.get(
+        "/v1/cache/status/stats",
+        tags=["cache"],
+        response_model=TaskStatusCacheStatsResponse,
+    )
+    async def task_status_cache_stats(
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+        orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+    ):
+        # Only the RQ engine caches the task status
+        status_cache: TaskStatusCache | None = getattr(
+            orchestrator, "task_status_cache", None
+        )
+        if status_cache is None:
+            return TaskStatusCacheStatsResponse(
+                ttl=0, hits=0, misses=0, coalesced=0, hit_rate=0
+            )
+        return TaskStatusCacheStatsResponse(
+            ttl=status_cache.ttl,
+            hits=status_cache.hits,
+            misses=status_cache.misses,
+            coalesced=status_cache.coalesced,
+            hit_rate=status_cache.hit_rate,
+        )
+
+    @app.get(
+        "/v1/cache/models/stats",
+        tags=["cache"],
+        response_model=ModelPoolStatsResponse,
+    )
+    async def model_pool_stats(
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+        orchestrator: Annotated[BaseOrchestrator, Depends(get_async_orchestrator)],
+    ):
+        """
+        Stats of the model pools of the workers, summed over the worker
+        processes: the local workers share the pool of the server process
+        when they share their models, else each has its own, as the RQ workers.
+        """
+        worker_stats = await worker_model_pool_stats(orchestrator)
+        if worker_stats is None:
+            raise HTTPException(
+                status_code=404,
+                detail="The workers of this engine do not pool their models.",
+            )
+        return ModelPoolStatsResponse(
+            workers=len(worker_stats),
+            **{
+                field: sum(stats[field] for stats in worker_stats)
+                for field in ("max_idle", "loaded", "idle", "hits", "misses")
+            },
+        )
+
     #### Clear requests
 
     # Offload models
@@ -1021,4 +1790,34 @@ def create_app():  # noqa: C901
         await orchestrator.clear_results(older_than=older_then)
         return ClearResponse()
 
+    # Results waiting for their removal
+    @app.get(
+        "/v1/clear/results/stats",
+        tags=["clear"],
+        response_model=ResultExpiryStatsResponse,
+    )
+    async def result_expiry_stats(
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+    ):
+        result_expiry = get_result_expiry()
+        return ResultExpiryStatsResponse(
+            pending=result_expiry.pending,
+            expired=result_expiry.expired,
+            next_expiry=result_expiry.next_expiry(),
+        )
+
+    # Clean cached results
+    @app.get(
+        "/v1/clear/cache",
+        tags=["clear"],
+        response_model=ClearResponse,
+    )
+    async def clear_cache(
+        auth: Annotated[AuthenticationResult, Depends(require_auth)],
+    ):
+        result_cache = get_result_cache()
+        if result_cache is not None:
+            await result_cache.clear()
+        return ClearResponse()
+
     return app
@@ -0,0 +1,165 @@
+import contextvars
+import logging
+import threading
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from docling.backend.abstract_backend import AbstractDocumentBackend
+from docling.backend.pdf_backend import PdfDocumentBackend
+from docling.datamodel.base_models import DocumentStream
+from docling.datamodel.document import ConversionResult
+from docling.document_converter import PdfFormatOption
+from docling_jobkit.convert.manager import DoclingConverterManager
+from docling_jobkit.datamodel.convert import ConvertDocumentsOptions
+
+from docling_serve.fair_queue import FairShareQueue
+from docling_serve.metrics import observe_conversions
+
+_log = logging.getLogger(__name__)
+
+# Period of the checks of the RQ workers for the cancellation of their job
+CANCEL_POLL_INTERVAL = 1.0  # seconds
+# Lifetime of the cancellation requests in Redis, the timeout of the RQ jobs
+CANCEL_TTL = 14400  # seconds
+
+
+class TaskCancelledError(Exception):
+    pass
+
+
+# Event set when the task being converted is cancelled, bound by the worker
+current_cancel_event: contextvars.ContextVar[Optional[threading.Event]] = (
+    contextvars.ContextVar("current_cancel_event", default=None)
+)
+
+
+def cancel_key(task_id: str) -> str:
+    """Redis key requesting the RQ worker running the task to stop it."""
+    return f"docling:tasks:{task_id}:cancel"
+
+
+_cancellable_backends: dict[type, type] = {}
+_cancellable_backends_lock = threading.Lock()
+
+
+def cancellable_backend(
+    backend: type[AbstractDocumentBackend],
+) -> type[AbstractDocumentBackend]:
+    """
+    Subclass of a PDF backend which stops loading pages once its task is
+    cancelled.
+
+    The backend of a document is created in the thread of the task, where it
+    takes the cancel event. The pages are loaded lazily by the pipeline
+    threads, each page then fails without being processed, so a running
+    conversion stops at the next page boundary.
+    """
+    if not issubclass(backend, PdfDocumentBackend):
+        return backend
+
+    with _cancellable_backends_lock:
+        if backend not in _cancellable_backends:
+            pdf_backend: Any = backend
+
+            class CancellableBackend(pdf_backend):
+                def __init__(self, *args, **kwargs):
+                    self._cancel_event = current_cancel_event.get()
+                    super().__init__(*args, **kwargs)
+
+                def load_page(self, *args, **kwargs):
+                    if self._cancel_event is not None and self._cancel_event.is_set():
+                        raise TaskCancelledError("The task was cancelled.")
+                    return super().load_page(*args, **kwargs)
+
+            CancellableBackend.__name__ = f"Cancellable{backend.__name__}"
+            CancellableBackend.__qualname__ = CancellableBackend.__name__
+            _cancellable_backends[backend] = CancellableBackend
+        return _cancellable_backends[backend]
+
+
+def _until_cancelled(
+    results: Iterable[ConversionResult], cancel_event: threading.Event
+) -> Iterator[ConversionResult]:
+    # Checked before each document, and after the last one so the partial
+    # results of a cancelled task are not exported
+    for result in results:
+        if cancel_event.is_set():
+            raise TaskCancelledError("The task was cancelled.")
+        yield result
+    if cancel_event.is_set():
+        raise TaskCancelledError("The task was cancelled.")
+
+
+class CancellableConverterManager(DoclingConverterManager):
+    """
+    Converter manager stopping the conversions of the cancelled tasks.
+
+    The conversions check the cancel event bound in `current_cancel_event`
+    at the page boundaries of the PDF documents, and between the documents.
+    The converted documents are recorded in the metrics, when enabled.
+    """
+
+    def get_pdf_pipeline_opts(
+        self, request: ConvertDocumentsOptions
+    ) -> PdfFormatOption:
+        pdf_format_option = super().get_pdf_pipeline_opts(request)
+        pdf_format_option.backend = cancellable_backend(pdf_format_option.backend)
+        return pdf_format_option
+
+    def convert_documents(
+        self,
+        sources: Iterable[Union[Path, str, DocumentStream]],
+        options: ConvertDocumentsOptions,
+        headers: Optional[dict[str, Any]] = None,
+    ) -> Iterable[ConversionResult]:
+        results = observe_conversions(
+            super().convert_documents(sources=sources, options=options, headers=headers)
+        )
+        cancel_event = current_cancel_event.get()
+        if cancel_event is None:
+            return results
+        return _until_cancelled(results, cancel_event)
+
+
+class CancellableTaskQueue(FairShareQueue):
+    """
+    Fair share queue of the local workers, revoking the queued tasks and
+    cancelling the dispatched ones.
+
+    A worker runs the task it gets in its own context, the cancel event of the
+    task is bound there when the task is taken from the queue.
+    """
+
+    def _init(self, maxsize: int):
+        super()._init(maxsize)
+        # Events of the tasks dispatched to the workers, one per worker
+        self.cancel_events: dict[str, threading.Event] = {}
+
+    def _get(self) -> str:
+        task_id = super()._get()
+        # The previous task of the worker is completed
+        previous = current_cancel_event.get()
+        self.cancel_events = {
+            t: e for t, e in self.cancel_events.items() if e is not previous
+        }
+        cancel_event = threading.Event()
+        self.cancel_events[task_id] = cancel_event
+        current_cancel_event.set(cancel_event)
+        return task_id
+
+    def revoke(self, task_id: str) -> bool:
+        """Remove a queued task, returns False when the task is not queued."""
+        if task_id not in self.order:
+            return False
+        self.order.discard(task_id)
+        self.task_done()
+        return True
+
+    def cancel(self, task_id: str) -> bool:
+        """Stop a dispatched task, returns False when it is not running."""
+        cancel_event = self.cancel_events.get(task_id)
+        if cancel_event is None:
+            return False
+        cancel_event.set()
+        return True
@@ -1,5 +1,5 @@
 # Define the input options for the API
-from typing import Annotated
+from typing import Annotated, Optional
 
 from pydantic import Field
 
@@ -38,3 +38,19 @@ class ConvertDocumentsRequestOptions(ConvertDocumentsOptions):
             le=docling_serve_settings.max_document_timeout,
         ),
     ] = docling_serve_settings.max_document_timeout
+
+    split_page_count: Annotated[
+        Optional[int],
+        Field(
+            description=(
+                "Split the PDF documents in windows of this many pages, which are "
+                "converted in parallel by the workers and merged back into one "
+                "document. Only applied by the synchronous convert endpoints, "
+                "for a single document with the inbody target, the async "
+                "endpoints reject it. "
+                "Optional, defaults to no splitting."
+            ),
+            gt=0,
+            examples=[20],
+        ),
+    ] = None
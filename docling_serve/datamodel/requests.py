@@ -2,7 +2,7 @@ import enum
 from functools import cache
 from typing import Annotated, Generic, Literal
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from pydantic_core import PydanticCustomError
 from typing_extensions import Self, TypeVar
 
@@ -27,6 +27,20 @@ from docling_serve.settings import AsyncEngine, docling_serve_settings
 class FileSourceRequest(FileSource):
     kind: Literal["file"] = "file"
 
+    @field_validator("base64_string")
+    @classmethod
+    def validate_file_size(cls, value: str) -> str:
+        # Computed from the length of the base64 content, before decoding it
+        length = len(value) - value.count("\n") - value.count("\r")
+        size = length // 4 * 3 - value[-2:].count("=")
+        if size > docling_serve_settings.max_file_size:
+            raise PydanticCustomError(
+                "file_too_large",
+                "The file size {size} exceeds the maximum of {max_size} bytes.",
+                {"size": size, "max_size": docling_serve_settings.max_file_size},
+            )
+        return value
+
 
 class HttpSourceRequest(HttpSource):
     kind: Literal["http"] = "http"
@@ -18,10 +18,60 @@ class HealthCheckResponse(BaseModel):
     status: str = "ok"
 
 
+class StartupStage(str, enum.Enum):
+    STARTING = "starting"
+    WARMING_UP = "warming_up"
+    READY = "ready"
+    FAILED = "failed"
+
+
+class StartupEvent(BaseModel):
+    stage: StartupStage
+    message: str
+    elapsed: float
+
+
+class ReadinessResponse(BaseModel):
+    status: str
+    stage: StartupStage
+    checks: dict[str, bool]
+
+
 class ClearResponse(BaseModel):
     status: str = "ok"
 
 
+class ResultCacheStatsResponse(BaseModel):
+    kind: str
+    hits: int
+    misses: int
+    bypassed: int
+    stored: int
+
+
+class ResultExpiryStatsResponse(BaseModel):
+    pending: int
+    expired: int
+    next_expiry: Optional[float] = None
+
+
+class TaskStatusCacheStatsResponse(BaseModel):
+    ttl: float
+    hits: int
+    misses: int
+    coalesced: int
+    hit_rate: float
+
+
+class ModelPoolStatsResponse(BaseModel):
+    workers: int
+    max_idle: int
+    loaded: int
+    idle: int
+    hits: int
+    misses: int
+
+
 class ConvertDocumentResponse(BaseModel):
     document: ExportDocumentResponse
     status: ConversionStatus
@@ -1,5 +1,6 @@
 """Desktop wrapper for Docling Serve using pywebview."""
 
+import json
 import logging
 import multiprocessing
 import time
@@ -37,6 +38,58 @@ def start_server(
     )
 
 
+def wait_until_ready(
+    base_url: str,
+    server_process: multiprocessing.Process,
+    timeout: float,
+) -> None:
+    """
+    Follow the startup progress stream of the server until it is ready.
+
+    The stream is opened as soon as the server accepts connections, and is
+    closed by the server once the startup is completed or failed.
+    """
+    deadline = time.monotonic() + timeout
+    connect_interval = 0.1
+
+    while time.monotonic() < deadline:
+        if not server_process.is_alive():
+            raise RuntimeError("The server process exited during the startup.")
+        try:
+            with httpx.stream(
+                "GET",
+                f"{base_url}/ready/stream",
+                timeout=httpx.Timeout(5.0, read=deadline - time.monotonic()),
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    event = json.loads(line)
+                    logger.info(f"Server {event['stage']}: {event['message']}")
+                    if event["stage"] == "ready":
+                        logger.info("Server is ready!")
+                        return
+                    if event["stage"] == "failed":
+                        raise RuntimeError(
+                            f"Server failed to start: {event['message']}"
+                        )
+        except (httpx.ConnectError, httpx.RemoteProtocolError) as e:
+            # The server is not listening yet
+            logger.debug(f"Connection to the server failed: {e}")
+            time.sleep(connect_interval)
+            connect_interval = min(connect_interval * 2, 1.0)
+        except httpx.TimeoutException:
+            break
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Server startup could not be followed: {e}") from e
+
+    raise RuntimeError(
+        f"Server did not start within {timeout:.0f} seconds. "
+        "Check if the port is already in use or if there are other errors."
+    )
+
+
 def run_desktop(
     host: str = "127.0.0.1",
     port: int = 5001,
@@ -44,6 +97,7 @@ def run_desktop(
     window_title: str = "Docling Serve",
     width: int = 1200,
     height: int = 800,
+    startup_timeout: float = 300.0,
 ) -> None:
     """
     Run Docling Serve as a desktop application.
@@ -55,6 +109,7 @@ def run_desktop(
         window_title: Title of the desktop window
         width: Window width
         height: Window height
+        startup_timeout: Seconds to wait for the server to load the models
     """
     try:
         import webview
@@ -81,31 +136,15 @@ def run_desktop(
     )
     server_process.start()
 
-    # Wait for the server to start with health check polling
+    # Wait until the models are loaded and the server can take tasks
     logger.info("Starting Docling Serve server...")
-    url = f"http://{host}:{port}/health"
-    max_retries = 30  # 30 seconds timeout
-    retry_interval = 1  # 1 second between retries
-
-    for attempt in range(max_retries):
-        try:
-            response = httpx.get(url, timeout=1.0)
-            if response.status_code == 200:
-                logger.info("Server is ready!")
-                break
-        except (httpx.ConnectError, httpx.RequestError) as e:
-            logger.debug(f"Connection attempt {attempt + 1}/{max_retries} failed: {e}")
-
-        if attempt < max_retries - 1:
-            time.sleep(retry_interval)
-        else:
-            logger.error("Server failed to start within the timeout period.")
-            server_process.terminate()
-            server_process.join(timeout=5)
-            raise RuntimeError(
-                "Server did not start within 30 seconds. "
-                "Check if the port is already in use or if there are other errors."
-            )
+    try:
+        wait_until_ready(f"http://{host}:{port}", server_process, startup_timeout)
+    except RuntimeError as e:
+        logger.error(f"Server failed to start: {e}")
+        server_process.terminate()
+        server_process.join(timeout=5)
+        raise
 
     # Build the UI URL
     url = f"http://{host}:{port}/ui"
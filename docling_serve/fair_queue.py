@@ -0,0 +1,143 @@
+import asyncio
+import bisect
+import contextvars
+import itertools
+from collections.abc import Iterable
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+DEFAULT_TENANT = "default"
+
+
+class TaskShare(BaseModel):
+    """Scheduling attributes of a task: its tenant, priority and cost."""
+
+    model_config = ConfigDict(frozen=True)
+
+    tenant: str = DEFAULT_TENANT
+    priority: int = 0
+    cost: int = 1
+
+
+# Share of the task being enqueued, read by the queue when the task is put
+current_task_share: contextvars.ContextVar[TaskShare] = contextvars.ContextVar(
+    "current_task_share", default=TaskShare()
+)
+
+
+class FairShareOrder:
+    """
+    Effective order of the queued tasks, with priorities and fair sharing.
+
+    Tasks with a higher priority go first. Within a priority, the tenants share
+    the workers with fair queuing: each task gets a virtual finish tag, its cost
+    after the tag of the previous task of its tenant (or the virtual time of the
+    priority), and the tasks are dispatched in the order of their tags. A tenant
+    submitting many tasks only delays its own tasks, the tasks of the other
+    tenants are interleaved with them instead of waiting behind.
+
+    The tags do not change once assigned, so the position of a task is found
+    with a bisect, in O(log n).
+    """
+
+    def __init__(self):
+        self._counter = itertools.count()
+        # Sorted keys (-priority, finish tag, sequence, start tag, task id)
+        self._keys: list[tuple[int, float, int, float, str]] = []
+        self._key_by_id: dict[str, tuple[int, float, int, float, str]] = {}
+        self._tenant_finish: dict[tuple[int, str], float] = {}
+        self._vtime: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._key_by_id
+
+    def push(self, task_id: str, share: TaskShare):
+        if task_id in self._key_by_id:
+            return
+        tenant = (share.priority, share.tenant)
+        start = max(
+            self._vtime.get(share.priority, 0.0), self._tenant_finish.get(tenant, 0.0)
+        )
+        finish = start + max(share.cost, 1)
+        self._tenant_finish[tenant] = finish
+        key = (-share.priority, finish, next(self._counter), start, task_id)
+        bisect.insort(self._keys, key)
+        self._key_by_id[task_id] = key
+
+        # The tenants without queued work behind the virtual time are forgotten
+        if len(self._tenant_finish) > 2 * len(self._keys) + 64:
+            self._tenant_finish = {
+                tenant: tag
+                for tenant, tag in self._tenant_finish.items()
+                if tag > self._vtime.get(tenant[0], 0.0)
+            }
+
+    def _dispatched(self, key: tuple[int, float, int, float, str]):
+        priority = -key[0]
+        self._vtime[priority] = max(self._vtime.get(priority, 0.0), key[3])
+
+    def pop(self) -> str:
+        """Remove and return the next task to dispatch."""
+        key = self._keys.pop(0)
+        del self._key_by_id[key[4]]
+        self._dispatched(key)
+        return key[4]
+
+    def discard(self, task_id: str, dispatched: bool = False):
+        key = self._key_by_id.pop(task_id, None)
+        if key is None:
+            return
+        del self._keys[bisect.bisect_left(self._keys, key)]
+        if dispatched:
+            self._dispatched(key)
+
+    def retain(self, task_ids: Iterable[str]):
+        """Keep only the given tasks, the other ones were dispatched elsewhere."""
+        keep = set(task_ids)
+        for task_id in [t for t in self._key_by_id if t not in keep]:
+            self.discard(task_id, dispatched=True)
+
+    def first(self) -> Optional[str]:
+        return self._keys[0][4] if self._keys else None
+
+    def position(self, task_id: str) -> Optional[int]:
+        key = self._key_by_id.get(task_id)
+        if key is None:
+            return None
+        return bisect.bisect_left(self._keys, key) + 1
+
+    def successor(self, task_id: str) -> Optional[str]:
+        """The task dispatched right after the given one, if any."""
+        position = self.position(task_id)
+        if position is None or position >= len(self._keys):
+            return None
+        return self._keys[position][4]
+
+    def task_ids(self) -> list[str]:
+        return [key[4] for key in self._keys]
+
+
+class FairShareQueue(asyncio.Queue[str]):
+    """
+    Queue of task ids handing them out in the order of a FairShareOrder.
+
+    The share of each task is taken from `current_task_share` when the task
+    is put, so the queue can replace the FIFO queue of the local orchestrator.
+    """
+
+    def _init(self, maxsize: int):
+        self.order = FairShareOrder()
+        self._queue = self.order  # type: ignore[assignment]
+
+    def _put(self, item: str):
+        self.order.push(item, current_task_share.get())
+
+    def _get(self) -> str:
+        return self.order.pop()
+
+    def position(self, task_id: str) -> Optional[int]:
+        return self.order.position(task_id)
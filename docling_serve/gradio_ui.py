@@ -1,4 +1,5 @@
-import base64
+import asyncio
+import contextlib
 import importlib
 import itertools
 import json
@@ -6,13 +7,15 @@ import logging
 import ssl
 import sys
 import tempfile
-import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
+from urllib.parse import quote
 
 import certifi
 import gradio as gr
 import httpx
+from websockets.asyncio.client import connect as ws_connect
 
 from docling.datamodel.base_models import FormatToExtensions
 from docling.datamodel.pipeline_options import (
@@ -21,6 +24,7 @@ from docling.datamodel.pipeline_options import (
     TableFormerMode,
     TableStructureOptions,
 )
+from docling_core.types.doc import DoclingDocument
 
 from docling_serve.helper_functions import _to_list_of_strings
 from docling_serve.settings import docling_serve_settings, uvicorn_settings
@@ -118,6 +122,40 @@ theme = gr.themes.Default(
 
 gradio_output_dir = None  # Will be set by FastAPI when mounted
 file_output_path = None  # Will be set when a new file is generated
+api_app: Optional[Any] = None  # Will be set by FastAPI when mounted
+
+# Seconds of each long polling of the status of a task
+STATUS_POLL_WAIT = 30
+
+# Seconds allowed for each call of the API
+API_TIMEOUT = 60
+
+# Characters of an output sent to the browser at once
+OUTPUT_PAGE_SIZE = 100_000
+
+# Output views, in the order of their components
+OUTPUT_FORMATS = [
+    "md",
+    "md_rendered",
+    "json",
+    "json_rendered",
+    "html",
+    "html_rendered",
+    "text",
+    "doctags",
+]
+
+# Result exports of the output views, fetched from /v1/result/{task_id}/{format}
+OUTPUT_EXPORTS = {
+    "md": "md",
+    "md_rendered": "md",
+    "json": "json",
+    "json_rendered": "json",
+    "html": "html",
+    "html_rendered": "html",
+    "text": "text",
+    "doctags": "doctags",
+}
 
 #############
 # Functions #
@@ -131,6 +169,7 @@ def get_api_endpoint() -> str:
     return f"{protocol}://{docling_serve_settings.api_host}:{uvicorn_settings.port}"
 
 
+@lru_cache
 def get_ssl_context() -> ssl.SSLContext:
     ctx = ssl.create_default_context(cafile=certifi.where())
     kube_sa_ca_cert_path = Path(
@@ -145,8 +184,61 @@ def get_ssl_context() -> ssl.SSLContext:
     return ctx
 
 
-def health_check():
-    response = httpx.get(f"{get_api_endpoint()}/health")
+def set_api_app(app: Any):
+    """Call the API app in-process, through an ASGI transport."""
+    global api_app
+    api_app = app
+    get_http_client.cache_clear()
+
+
+class TimeoutASGITransport(httpx.ASGITransport):
+    """ASGI transport applying the read timeout of the client to each call."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        timeout = request.extensions.get("timeout", {}).get("read")
+        try:
+            return await asyncio.wait_for(
+                super().handle_async_request(request), timeout=timeout
+            )
+        except asyncio.TimeoutError as e:
+            raise httpx.ReadTimeout(
+                f"No response within {timeout} seconds.", request=request
+            ) from e
+
+
+@lru_cache
+def get_loopback_client() -> httpx.AsyncClient:
+    """Client connecting to the API over the network, streaming the bodies."""
+    return httpx.AsyncClient(
+        base_url=get_api_endpoint(),
+        verify=get_ssl_context(),
+        timeout=API_TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60),
+    )
+
+
+@lru_cache
+def get_http_client() -> httpx.AsyncClient:
+    """Client shared by the UI sessions, keeping its connections to the API."""
+    if api_app is not None:
+        # The ASGI transport buffers the bodies, fine for the small responses
+        return httpx.AsyncClient(
+            transport=TimeoutASGITransport(app=api_app),
+            base_url="http://docling-serve",
+            timeout=API_TIMEOUT,
+        )
+    return get_loopback_client()
+
+
+def auth_headers(auth: str) -> dict[str, str]:
+    headers = {}
+    if docling_serve_settings.api_key:
+        headers["X-Api-Key"] = str(auth)
+    return headers
+
+
+async def health_check():
+    response = await get_http_client().get("/health")
     if response.status_code == 200:
         return "Healthy"
     return "Unhealthy"
@@ -238,59 +330,80 @@ def change_ocr_lang(ocr_engine):
     return gr.update(visible=False, value="")
 
 
-def wait_task_finish(auth: str, task_id: str, return_as_file: bool):
-    conversion_sucess = False
-    task_finished = False
-    task_status = ""
+async def wait_task_status(auth: str, task_id: str) -> str:
+    """Wait until the task is completed, returns its final status."""
+    final_statuses = ("success", "failure", "revoked")
 
-    headers = {}
-    if docling_serve_settings.api_key:
-        headers["X-Api-Key"] = str(auth)
-
-    ssl_ctx = get_ssl_context()
-    while not task_finished:
-        try:
-            response = httpx.get(
-                f"{get_api_endpoint()}/v1/status/poll/{task_id}?wait=5",
-                headers=headers,
-                verify=ssl_ctx,
-                timeout=15,
+    # The websockets do not go through the ASGI transport, the in-process
+    # calls long-poll the status instead
+    if api_app is not None:
+        while True:
+            response = await get_http_client().get(
+                f"/v1/status/poll/{task_id}",
+                params={"wait": STATUS_POLL_WAIT},
+                headers=auth_headers(auth),
             )
+            response.raise_for_status()
             task_status = response.json()["task_status"]
-            if task_status == "success":
-                conversion_sucess = True
-                task_finished = True
-
-            if task_status in ("failure", "revoked"):
-                conversion_sucess = False
-                task_finished = True
-                raise RuntimeError(f"Task failed with status {task_status!r}")
-            time.sleep(5)
-        except Exception as e:
-            logger.error(f"Error processing file(s): {e}")
-            conversion_sucess = False
-            task_finished = True
-            raise gr.Error(f"Error processing file(s): {e}", print_exception=False)
+            if task_status in final_statuses:
+                return task_status
 
-    if conversion_sucess:
-        try:
-            response = httpx.get(
-                f"{get_api_endpoint()}/v1/result/{task_id}",
-                headers=headers,
-                timeout=15,
-                verify=ssl_ctx,
-            )
-            output = response_to_output(response, return_as_file)
-            return output
-        except Exception as e:
-            logger.error(f"Error getting task result: {e}")
+    uri = get_api_endpoint().replace("http", "ws", 1) + f"/v1/status/ws/{task_id}"
+    if docling_serve_settings.api_key:
+        uri += f"?api_key={quote(str(auth))}"
+    ssl_ctx = get_ssl_context() if uri.startswith("wss") else None
+
+    async with ws_connect(uri, ssl=ssl_ctx) as websocket:
+        async for message in websocket:
+            payload = json.loads(message)
+            if payload["message"] == "error":
+                raise RuntimeError(payload["error"])
+            task_status = payload["task"]["task_status"]
+            if task_status in final_statuses:
+                return task_status
+    raise RuntimeError("The status websocket was closed.")
+
+
+async def wait_task_finish(auth: str, task_id: str, return_as_file: bool):
+    try:
+        task_status = await wait_task_status(auth, task_id)
+    except Exception as e:
+        logger.error(f"Error processing file(s): {e}")
+        raise gr.Error(f"Error processing file(s): {e}", print_exception=False)
+
+    if task_status != "success":
+        logger.error(f"Error processing file(s): task status {task_status!r}")
+        raise gr.Error(
+            f"Error processing file(s): Task failed with status {task_status!r}",
+            print_exception=False,
+        )
+
+    # The outputs shown in the browser are fetched view by view
+    if not return_as_file:
+        return (
+            gr.DownloadButton(visible=False, label="Download Output", scale=1),
+            TaskOutputs(auth, task_id),
+        )
+    try:
+        file_output_path = await download_result(auth, task_id)
+        return (
+            gr.DownloadButton(
+                visible=True,
+                label=f"Download {Path(file_output_path).name}",
+                scale=1,
+                value=file_output_path,
+            ),
+            None,
+        )
+    except Exception as e:
+        logger.error(f"Error getting task result: {e}")
 
     raise gr.Error(
         f"Error getting task result, conversion finished with status: {task_status}"
     )
 
 
-def process_url(
+async def process_url(
     auth,
     input_sources,
     to_formats,
@@ -340,19 +453,12 @@ def process_url(
         logger.error("No input sources provided.")
         raise gr.Error("No input sources provided.", print_exception=False)
 
-    headers = {}
-    if docling_serve_settings.api_key:
-        headers["X-Api-Key"] = str(auth)
+    headers = auth_headers(auth)
 
     print(f"{headers=}")
     try:
-        ssl_ctx = get_ssl_context()
-        response = httpx.post(
-            f"{get_api_endpoint()}/v1/convert/source/async",
-            json=parameters,
-            headers=headers,
-            verify=ssl_ctx,
-            timeout=60,
+        response = await get_http_client().post(
+            "/v1/convert/source/async", json=parameters, headers=headers
         )
     except Exception as e:
         logger.error(f"Error processing URL: {e}")
@@ -367,13 +473,7 @@ def process_url(
     return task_id_rendered
 
 
-def file_to_base64(file):
-    with open(file.name, "rb") as f:
-        encoded_string = base64.b64encode(f.read()).decode("utf-8")
-    return encoded_string
-
-
-def process_file(
+async def process_file(
     auth,
     files,
     to_formats,
@@ -395,47 +495,42 @@ def process_file(
     if not files or len(files) == 0:
         logger.error("No files provided.")
         raise gr.Error("No files provided.", print_exception=False)
-    files_data = [
-        {"kind": "file", "base64_string": file_to_base64(file), "filename": file.name}
-        for file in files
-    ]
-    target = {"kind": "zip" if return_as_file else "inbody"}
 
-    parameters = {
-        "sources": files_data,
-        "options": {
-            "to_formats": to_formats,
-            "image_export_mode": image_export_mode,
-            "pipeline": pipeline,
-            "ocr": ocr,
-            "force_ocr": force_ocr,
-            "ocr_engine": ocr_engine,
-            "ocr_lang": _to_list_of_strings(ocr_lang),
-            "pdf_backend": pdf_backend,
-            "table_mode": table_mode,
-            "abort_on_error": abort_on_error,
-            "return_as_file": return_as_file,
-            "do_code_enrichment": do_code_enrichment,
-            "do_formula_enrichment": do_formula_enrichment,
-            "do_picture_classification": do_picture_classification,
-            "do_picture_description": do_picture_description,
-        },
-        "target": target,
+    # Form fields of the multipart request, the lists are repeated fields
+    options = {
+        "to_formats": to_formats,
+        "image_export_mode": image_export_mode,
+        "pipeline": pipeline,
+        "ocr": ocr,
+        "force_ocr": force_ocr,
+        "ocr_engine": ocr_engine,
+        "ocr_lang": _to_list_of_strings(ocr_lang),
+        "pdf_backend": pdf_backend,
+        "table_mode": table_mode,
+        "abort_on_error": abort_on_error,
+        "return_as_file": return_as_file,
+        "do_code_enrichment": do_code_enrichment,
+        "do_formula_enrichment": do_formula_enrichment,
+        "do_picture_classification": do_picture_classification,
+        "do_picture_description": do_picture_description,
+        "target_type": "zip" if return_as_file else "inbody",
     }
 
-    headers = {}
-    if docling_serve_settings.api_key:
-        headers["X-Api-Key"] = str(auth)
-
+    # The uploaded files are streamed from the Gradio temporary files, without
+    # base64 encoding
     try:
-        ssl_ctx = get_ssl_context()
-        response = httpx.post(
-            f"{get_api_endpoint()}/v1/convert/source/async",
-            json=parameters,
-            headers=headers,
-            verify=ssl_ctx,
-            timeout=60,
-        )
+        with contextlib.ExitStack() as stack:
+            upload_files = []
+            for file in files:
+                stream = await asyncio.to_thread(open, file.name, "rb")
+                stack.enter_context(stream)
+                upload_files.append(("files", (Path(file.name).name, stream)))
+            response = await get_http_client().post(
+                "/v1/convert/file/async",
+                data=options,
+                files=upload_files,
+                headers=auth_headers(auth),
+            )
     except Exception as e:
         logger.error(f"Error processing file(s): {e}")
         raise gr.Error(f"Error processing file(s): {e}", print_exception=False)
@@ -449,52 +544,167 @@ def process_file(
     return task_id_rendered
 
 
-def response_to_output(response, return_as_file):
-    markdown_content = ""
-    json_content = ""
-    json_rendered_content = ""
-    html_content = ""
-    text_content = ""
-    doctags_content = ""
-    download_button = gr.DownloadButton(visible=False, label="Download Output", scale=1)
-    if return_as_file:
+def paginate(content: Optional[str], page_size: int = OUTPUT_PAGE_SIZE) -> list[str]:
+    """Split the content in pages of about `page_size` characters."""
+    pages: list[str] = []
+    page: list[str] = []
+    size = 0
+    last_blank = 0
+    for line in (content or "").splitlines(keepends=True):
+        if page and size + len(line) > page_size:
+            # Break after the last blank line, not inside a paragraph or a table
+            cut = last_blank or len(page)
+            pages.append("".join(page[:cut]))
+            page = page[cut:]
+            size = sum(len(line) for line in page)
+            last_blank = 0
+        page.append(line)
+        size += len(line)
+        if not line.strip():
+            last_blank = len(page)
+    pages.append("".join(page))
+    return pages
+
+
+def render_docling_json(json_content: str) -> str:
+    # Embed document JSON and trigger load at client via an image.
+    return f"""
+        <docling-img id="dclimg" pagenumbers><docling-tooltip></docling-tooltip></docling-img>
+        <script id="dcljson" type="application/json" onload="document.getElementById('dclimg').src = JSON.parse(document.getElementById('dcljson').textContent);">{json_content}</script>
+        <img src onerror="document.getElementById('dclimg').src = JSON.parse(document.getElementById('dcljson').textContent);" />
+        """
+
+
+class TaskOutputs:
+    """
+    Outputs of a converted document, kept in the state of a UI session and
+    sent to the browser one page of one view at a time. Each export is fetched
+    when its view is first shown, and paginated, the rendered document page by
+    page.
+    """
+
+    def __init__(self, auth: str, task_id: str):
+        self.auth = auth
+        self.task_id = task_id
+        self._exports: dict[str, str] = {}
+        self._pages: dict[str, list[str]] = {}
+        self._json_content: Optional[dict] = None
+        self._docling_document: Optional[DoclingDocument] = None
+
+    async def _export(self, export_format: str) -> str:
+        if export_format not in self._exports:
+            response = await get_http_client().get(
+                f"/v1/result/{self.task_id}/{export_format}",
+                headers=auth_headers(self.auth),
+            )
+            # The formats which cannot be exported are shown empty
+            if response.status_code == 404:
+                content = ""
+            else:
+                response.raise_for_status()
+                # Decoding a large export would block the other users of the UI
+                content = await asyncio.to_thread(
+                    response.content.decode, response.encoding or "utf-8"
+                )
+            self._exports[export_format] = content
+        return self._exports[export_format]
+
+    async def page(self, output_format: str, page_no: int) -> tuple[str, int]:
+        """The content of the page of the view, and the number of pages."""
+        content = await self._export(OUTPUT_EXPORTS[output_format])
+        return await asyncio.to_thread(self._page, output_format, content, page_no)
+
+    def _page(self, output_format: str, content: str, page_no: int) -> tuple[str, int]:
+        if output_format == "json_rendered":
+            return self._rendered_page(content, page_no)
+        if output_format not in self._pages:
+            self._pages[output_format] = self._paginate(output_format, content)
+        pages = self._pages[output_format]
+        page_no = min(max(page_no, 1), len(pages))
+        return pages[page_no - 1], len(pages)
+
+    def _json(self, content: str) -> dict:
+        if self._json_content is None:
+            self._json_content = json.loads(content) if content else {}
+        return self._json_content
+
+    def _paginate(self, output_format: str, content: str) -> list[str]:
+        if output_format == "json":
+            json_content = self._json(content)
+            return paginate(json.dumps(json_content, indent=2) if json_content else "")
+
+        if output_format == "html_rendered":
+            # Each page keeps the head and its styles
+            head, body_tag, body = content.partition("<body>")
+            if body_tag:
+                return [head + body_tag + page for page in paginate(body)]
+        return paginate(content)
+
+    def _rendered_page(self, content: str, page_no: int) -> tuple[str, int]:
+        json_content = self._json(content)
+        if not json_content:
+            return "", 1
+        page_nrs = sorted(int(page) for page in json_content.get("pages", {}))
+        if len(page_nrs) <= 1:
+            return render_docling_json(json.dumps(json_content)), 1
+
+        if self._docling_document is None:
+            self._docling_document = DoclingDocument.model_validate(json_content)
+        page_no = min(max(page_no, 1), len(page_nrs))
+        page_document = self._docling_document.filter(page_nrs={page_nrs[page_no - 1]})
+        return render_docling_json(json.dumps(page_document.export_to_dict())), len(
+            page_nrs
+        )
+
+
+async def download_result(auth: str, task_id: str) -> str:
+    """Stream the result file of the task to the output dir, returns its path."""
+    # Not through the ASGI transport, which would hold the whole file in memory
+    async with get_loopback_client().stream(
+        "GET", f"/v1/result/{task_id}", headers=auth_headers(auth)
+    ) as response:
+        response.raise_for_status()
         filename = (
             response.headers.get("Content-Disposition").split("filename=")[1].strip('"')
         )
         tmp_output_dir = Path(tempfile.mkdtemp(dir=gradio_output_dir, prefix="ui_"))
-        file_output_path = f"{tmp_output_dir}/{filename}"
-        # logger.info(f"Saving file to: {file_output_path}")
-        with open(file_output_path, "wb") as f:
-            f.write(response.content)
-        download_button = gr.DownloadButton(
-            visible=True, label=f"Download {filename}", scale=1, value=file_output_path
-        )
-    else:
-        full_content = response.json()
-        markdown_content = full_content.get("document").get("md_content")
-        json_content = json.dumps(
-            full_content.get("document").get("json_content"), indent=2
-        )
-        # Embed document JSON and trigger load at client via an image.
-        json_rendered_content = f"""
-            <docling-img id="dclimg" pagenumbers><docling-tooltip></docling-tooltip></docling-img>
-            <script id="dcljson" type="application/json" onload="document.getElementById('dclimg').src = JSON.parse(document.getElementById('dcljson').textContent);">{json_content}</script>
-            <img src onerror="document.getElementById('dclimg').src = JSON.parse(document.getElementById('dcljson').textContent);" />
-            """
-        html_content = full_content.get("document").get("html_content")
-        text_content = full_content.get("document").get("text_content")
-        doctags_content = full_content.get("document").get("doctags_content")
-    return (
-        markdown_content,
-        markdown_content,
-        json_content,
-        json_rendered_content,
-        html_content,
-        html_content,
-        text_content,
-        doctags_content,
-        download_button,
+        file_output_path = tmp_output_dir / filename
+        with await asyncio.to_thread(open, file_output_path, "wb") as f:
+            async for chunk in response.aiter_bytes():
+                await asyncio.to_thread(f.write, chunk)
+    return str(file_output_path)
+
+
+async def show_output(
+    outputs: Optional[TaskOutputs], task_id: str, output_format: str, page: int = 1
+):
+    # The other views are emptied, the browser only holds the page shown
+    views = dict.fromkeys(OUTPUT_FORMATS, "")
+    num_pages = 1
+    # The outputs of the session are those of the last task converted
+    if outputs is not None and outputs.task_id == task_id:
+        try:
+            views[output_format], num_pages = await outputs.page(
+                output_format, int(page)
+            )
+        except Exception as e:
+            logger.error(f"Error getting task result: {e}")
+            raise gr.Error(f"Error getting task result: {e}", print_exception=False)
+    output_page = gr.Slider(
+        minimum=1,
+        maximum=num_pages,
+        value=min(max(int(page), 1), num_pages),
+        step=1,
+        label=f"Page of {num_pages}",
+        visible=num_pages > 1,
     )
+    return (*views.values(), output_page)
+
+
+async def select_output(
+    outputs: Optional[TaskOutputs], task_id: str, output_format: str
+):
+    return (output_format, *await show_output(outputs, task_id, output_format))
 
 
 ############
@@ -700,24 +910,36 @@ with gr.Blocks(
 
     # Document output
     with gr.Row(visible=False) as content_output:
-        with gr.Tab("Docling (JSON)"):
-            output_json = gr.Code(language="json", wrap_lines=True, show_label=False)
-        with gr.Tab("Docling-Rendered"):
-            output_json_rendered = gr.HTML(label="Response")
-        with gr.Tab("Markdown"):
-            output_markdown = gr.Code(
-                language="markdown", wrap_lines=True, show_label=False
+        with gr.Column():
+            with gr.Tab("Docling (JSON)") as output_json_tab:
+                output_json = gr.Code(
+                    language="json", wrap_lines=True, show_label=False
+                )
+            with gr.Tab("Docling-Rendered") as output_json_rendered_tab:
+                output_json_rendered = gr.HTML(label="Response")
+            with gr.Tab("Markdown") as output_markdown_tab:
+                output_markdown = gr.Code(
+                    language="markdown", wrap_lines=True, show_label=False
+                )
+            with gr.Tab("Markdown-Rendered") as output_markdown_rendered_tab:
+                output_markdown_rendered = gr.Markdown(label="Response")
+            with gr.Tab("HTML") as output_html_tab:
+                output_html = gr.Code(
+                    language="html", wrap_lines=True, show_label=False
+                )
+            with gr.Tab("HTML-Rendered") as output_html_rendered_tab:
+                output_html_rendered = gr.HTML(label="Response")
+            with gr.Tab("Text") as output_text_tab:
+                output_text = gr.Code(wrap_lines=True, show_label=False)
+            with gr.Tab("DocTags") as output_doctags_tab:
+                output_doctags = gr.Code(wrap_lines=True, show_label=False)
+            output_page = gr.Slider(
+                minimum=1, maximum=1, value=1, step=1, visible=False
             )
-        with gr.Tab("Markdown-Rendered"):
-            output_markdown_rendered = gr.Markdown(label="Response")
-        with gr.Tab("HTML"):
-            output_html = gr.Code(language="html", wrap_lines=True, show_label=False)
-        with gr.Tab("HTML-Rendered"):
-            output_html_rendered = gr.HTML(label="Response")
-        with gr.Tab("Text"):
-            output_text = gr.Code(wrap_lines=True, show_label=False)
-        with gr.Tab("DocTags"):
-            output_doctags = gr.Code(wrap_lines=True, show_label=False)
+        # The view shown, only its current page is sent to the browser
+        output_format = gr.State("json")
+        # The outputs of the last task of the session
+        task_outputs = gr.State(None)
 
     # File download output
     with gr.Row(visible=False) as file_output:
@@ -727,6 +949,39 @@ with gr.Blocks(
     # UI Actions #
     ##############
 
+    output_views = [
+        output_markdown,
+        output_markdown_rendered,
+        output_json,
+        output_json_rendered,
+        output_html,
+        output_html_rendered,
+        output_text,
+        output_doctags,
+    ]
+
+    # Outputs rendered when their tab is opened, page by page
+    for tab, tab_format in [
+        (output_markdown_tab, "md"),
+        (output_markdown_rendered_tab, "md_rendered"),
+        (output_json_tab, "json"),
+        (output_json_rendered_tab, "json_rendered"),
+        (output_html_tab, "html"),
+        (output_html_rendered_tab, "html_rendered"),
+        (output_text_tab, "text"),
+        (output_doctags_tab, "doctags"),
+    ]:
+        tab.select(
+            select_output,
+            inputs=[task_outputs, task_id_rendered, gr.State(tab_format)],
+            outputs=[output_format, *output_views, output_page],
+        )
+    output_page.release(
+        show_output,
+        inputs=[task_outputs, task_id_rendered, output_format, output_page],
+        outputs=[*output_views, output_page],
+    )
+
     # Handle Return as File
     url_input.change(
         auto_set_return_as_file,
@@ -798,17 +1053,11 @@ with gr.Blocks(
     ).then(
         wait_task_finish,
         inputs=[auth, task_id_rendered, return_as_file],
-        outputs=[
-            output_markdown,
-            output_markdown_rendered,
-            output_json,
-            output_json_rendered,
-            output_html,
-            output_html_rendered,
-            output_text,
-            output_doctags,
-            download_file_btn,
-        ],
+        outputs=[download_file_btn, task_outputs],
+    ).then(
+        show_output,
+        inputs=[task_outputs, task_id_rendered, output_format],
+        outputs=[*output_views, output_page],
     )
 
     url_reset_btn.click(
@@ -886,17 +1135,11 @@ with gr.Blocks(
     ).then(
         wait_task_finish,
         inputs=[auth, task_id_rendered, return_as_file],
-        outputs=[
-            output_markdown,
-            output_markdown_rendered,
-            output_json,
-            output_json_rendered,
-            output_html,
-            output_html_rendered,
-            output_text,
-            output_doctags,
-            download_file_btn,
-        ],
+        outputs=[download_file_btn, task_outputs],
+    ).then(
+        show_output,
+        inputs=[task_outputs, task_id_rendered, output_format],
+        outputs=[*output_views, output_page],
     )
 
     file_reset_btn.click(
@@ -4,21 +4,26 @@ import json
 import platform
 import re
 import sys
-from typing import Union, get_args, get_origin
+from functools import lru_cache
+from typing import Optional, Union, get_args, get_origin
 
 from fastapi import Depends, Form
 from pydantic import BaseModel, TypeAdapter
 
-DOCLING_VERSIONS = {
-    "docling-serve": importlib.metadata.version("docling-serve"),
-    "docling-jobkit": importlib.metadata.version("docling-jobkit"),
-    "docling": importlib.metadata.version("docling"),
-    "docling-core": importlib.metadata.version("docling-core"),
-    "docling-ibm-models": importlib.metadata.version("docling-ibm-models"),
-    "docling-parse": importlib.metadata.version("docling-parse"),
-    "python": f"{sys.implementation.cache_tag} ({platform.python_version()})",
-    "plaform": platform.platform(),
-}
+
+@lru_cache
+def get_docling_versions() -> dict[str, str]:
+    """The versions of the docling packages, resolved on the first request."""
+    return {
+        "docling-serve": importlib.metadata.version("docling-serve"),
+        "docling-jobkit": importlib.metadata.version("docling-jobkit"),
+        "docling": importlib.metadata.version("docling"),
+        "docling-core": importlib.metadata.version("docling-core"),
+        "docling-ibm-models": importlib.metadata.version("docling-ibm-models"),
+        "docling-parse": importlib.metadata.version("docling-parse"),
+        "python": f"{sys.implementation.cache_tag} ({platform.python_version()})",
+        "plaform": platform.platform(),
+    }
 
 
 def is_pydantic_model(type_):
@@ -41,12 +46,26 @@ def is_pydantic_model(type_):
     return False
 
 
+@lru_cache
+def _nested_model_adapters(cls: type[BaseModel]) -> dict[str, TypeAdapter]:
+    """Adapters of the fields with nested models, received as JSON strings."""
+    return {
+        field_name: TypeAdapter(model_field.annotation)
+        for field_name, model_field in cls.model_fields.items()
+        if model_field.annotation is not None
+        and is_pydantic_model(model_field.annotation)
+    }
+
+
 # Adapted from
 # https://github.com/fastapi/fastapi/discussions/8971#discussioncomment-7892972
 def FormDepends(
     cls: type[BaseModel], prefix: str = "", excluded_fields: list[str] = []
 ):
     new_parameters = []
+    adapters = _nested_model_adapters(cls)
+    # The fields to parse, with their form parameter and the nested model adapter
+    parse_plan: list[tuple[str, str, Optional[TypeAdapter]]] = []
 
     for field_name, model_field in cls.model_fields.items():
         if field_name in excluded_fields:
@@ -65,7 +84,7 @@ def FormDepends(
         )
 
         # Flatten nested Pydantic models by accepting them as JSON strings
-        if is_pydantic_model(annotation):
+        if field_name in adapters:
             annotation = str
             default = Form(
                 None
@@ -88,23 +107,22 @@ def FormDepends(
                 annotation=annotation,
             )
         )
+        parse_plan.append(
+            (field_name, f"{prefix}{field_name}", adapters.get(field_name))
+        )
 
     async def as_form_func(**data):
         newdata = {}
-        for field_name, model_field in cls.model_fields.items():
-            if field_name in excluded_fields:
-                continue
-            value = data.get(f"{prefix}{field_name}")
-            newdata[field_name] = value
-            annotation = model_field.annotation
+        for field_name, param_name, adapter in parse_plan:
+            value = data.get(param_name)
 
             # Parse nested models from JSON string
-            if value is not None and is_pydantic_model(annotation):
+            if value is not None and adapter is not None:
                 try:
-                    validator = TypeAdapter(annotation)
-                    newdata[field_name] = validator.validate_json(value)
+                    value = adapter.validate_json(value)
                 except Exception as e:
                     raise ValueError(f"Invalid JSON for field '{field_name}': {e}")
+            newdata[field_name] = value
 
         return cls(**newdata)
 
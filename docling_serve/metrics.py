@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
+from typing import Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from docling.datamodel.document import ConversionResult
+from docling.utils.profiling import ProfilingItem
+from docling_jobkit.datamodel.task import Task
+from docling_jobkit.orchestrators.base_orchestrator import BaseOrchestrator
+
+from docling_serve.result_expiry import get_result_expiry
+from docling_serve.settings import AsyncEngine, docling_serve_settings
+
+_log = logging.getLogger(__name__)
+
+PROMETHEUS_MULTIPROC_DIR = "PROMETHEUS_MULTIPROC_DIR"
+
+# Interval for refreshing the gauges of each worker process
+REFRESH_INTERVAL = 5.0  # seconds
+
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+DURATION_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+
+def setup_multiprocess_dir():
+    """
+    Prepare the shared directory of the metrics, when running multiple uvicorn
+    workers. It must be called before the worker processes are spawned.
+    """
+    if PROMETHEUS_MULTIPROC_DIR not in os.environ:
+        os.environ[PROMETHEUS_MULTIPROC_DIR] = tempfile.mkdtemp(
+            prefix="docling_metrics_"
+        )
+
+
+def _pages_count(timings: dict[str, ProfilingItem]) -> int:
+    # The page stages are recorded once per page
+    for stage in ("page_parse", "page_init"):
+        if stage in timings:
+            return timings[stage].count
+    return 0
+
+
+class DoclingServeMetrics:
+    def __init__(self):
+        from prometheus_client import Counter, Gauge, Histogram
+
+        # With multiple workers, the local engine has a queue in each process,
+        # while the other engines share one queue
+        queue_mode = (
+            "livesum"
+            if docling_serve_settings.eng_kind == AsyncEngine.LOCAL
+            else "livemax"
+        )
+
+        self.request_duration = Histogram(
+            "docling_serve_request_duration_seconds",
+            "Latency of the HTTP requests, until the response is sent.",
+            ["method", "route", "status"],
+            buckets=LATENCY_BUCKETS,
+        )
+        self.queue_depth = Gauge(
+            "docling_serve_queue_depth",
+            "Number of tasks waiting in the queue.",
+            multiprocess_mode=queue_mode,
+        )
+        self.queue_wait = Histogram(
+            "docling_serve_queue_wait_seconds",
+            "Time spent by the tasks in the queue, before the processing starts.",
+            buckets=DURATION_BUCKETS,
+        )
+        self.task_duration = Histogram(
+            "docling_serve_task_duration_seconds",
+            "Processing time of the tasks.",
+            ["task_type", "status"],
+            buckets=DURATION_BUCKETS,
+        )
+        self.stage_duration = Histogram(
+            "docling_serve_stage_duration_seconds",
+            "Time spent in each stage of the conversion pipeline.",
+            ["stage"],
+            buckets=LATENCY_BUCKETS,
+        )
+        self.documents = Counter(
+            "docling_serve_documents",
+            "Number of converted documents.",
+            ["status"],
+        )
+        self.pages = Counter(
+            "docling_serve_pages",
+            "Number of converted pages, use rate() for the pages per second.",
+        )
+        self.result_store_size = Gauge(
+            "docling_serve_result_store_size",
+            "Number of task results held by the server.",
+            multiprocess_mode="livesum",
+        )
+        self.rejected_tasks = Counter(
+            "docling_serve_rejected_tasks",
+            "Number of tasks rejected by the admission limits.",
+        )
+        self.pending_expiries = Gauge(
+            "docling_serve_pending_result_expiries",
+            "Number of served results waiting for their removal.",
+            multiprocess_mode="livesum",
+        )
+
+    def observe_request(self, method: str, route: str, status: int, duration: float):
+        self.request_duration.labels(
+            method=method, route=route, status=str(status)
+        ).observe(duration)
+
+    def observe_task(self, task: Task):
+        """Record the queue and processing times of a completed task."""
+        if task.started_at is not None:
+            self.queue_wait.observe((task.started_at - task.created_at).total_seconds())
+            if task.finished_at is not None:
+                self.task_duration.labels(
+                    task_type=task.task_type.value, status=task.task_status.value
+                ).observe((task.finished_at - task.started_at).total_seconds())
+
+    def observe_conversion(self, conv_res: ConversionResult):
+        """Aggregate the pipeline timings of a converted document."""
+        self.documents.labels(status=conv_res.status.value).inc()
+        self.pages.inc(_pages_count(conv_res.timings))
+        for stage, item in conv_res.timings.items():
+            stage_duration = self.stage_duration.labels(stage=stage)
+            for elapsed in item.times:
+                stage_duration.observe(elapsed)
+
+    async def refresh(self, orchestrator: BaseOrchestrator):
+        self.queue_depth.set(await orchestrator.queue_size())
+
+        # The engines keep the results in different registries
+        results = getattr(
+            orchestrator,
+            "_task_results",
+            getattr(orchestrator, "_task_result_keys", {}),
+        )
+        self.result_store_size.set(len(results))
+        self.pending_expiries.set(get_result_expiry().pending)
+
+    async def refresh_loop(self, orchestrator: BaseOrchestrator):
+        while True:
+            try:
+                await self.refresh(orchestrator)
+            except Exception as e:
+                _log.error(f"Error refreshing the metrics: {e}")
+            await asyncio.sleep(REFRESH_INTERVAL)
+
+    def render(self) -> tuple[bytes, str]:
+        from prometheus_client import (
+            CONTENT_TYPE_LATEST,
+            REGISTRY,
+            CollectorRegistry,
+            generate_latest,
+        )
+        from prometheus_client.multiprocess import MultiProcessCollector
+
+        if PROMETHEUS_MULTIPROC_DIR in os.environ:
+            registry = CollectorRegistry()
+            MultiProcessCollector(registry)
+            return generate_latest(registry), CONTENT_TYPE_LATEST
+
+        return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+    def shutdown(self):
+        if PROMETHEUS_MULTIPROC_DIR in os.environ:
+            from prometheus_client.multiprocess import mark_process_dead
+
+            mark_process_dead(os.getpid())
+
+
+@lru_cache
+def get_metrics() -> Optional[DoclingServeMetrics]:
+    if not docling_serve_settings.enable_metrics:
+        return None
+
+    try:
+        metrics = DoclingServeMetrics()
+    except ImportError:
+        _log.warning(
+            "Docling Serve enable_metrics is activated, but prometheus-client "
+            "is not installed. Install it with `pip install docling-serve[metrics]` "
+            "or `pip install prometheus-client`"
+        )
+        return None
+
+    # The pipeline timings are collected only when profiling is enabled
+    from docling.datamodel.settings import settings
+
+    settings.debug.profile_pipeline_timings = True
+
+    return metrics
+
+
+def observe_conversions(
+    results: Iterable[ConversionResult],
+) -> Iterable[ConversionResult]:
+    """
+    Record the documents converted by a worker as they are produced, so the
+    results of the tasks never have to be fetched back for the metrics.
+    """
+    metrics = get_metrics()
+    if metrics is None:
+        return results
+    return _observed(results, metrics)
+
+
+def _observed(
+    results: Iterable[ConversionResult], metrics: DoclingServeMetrics
+) -> Iterator[ConversionResult]:
+    for conv_res in results:
+        metrics.observe_conversion(conv_res)
+        yield conv_res
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the latency of the requests per route."""
+
+    def __init__(self, app: ASGIApp, metrics: DoclingServeMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.monotonic()
+        status = 500
+
+        async def _send(message: Message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            # Use the route template, e.g. /v1/status/poll/{task_id}, to keep
+            # the number of labels bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            self.metrics.observe_request(
+                method=scope["method"],
+                route=route,
+                status=status,
+                duration=time.monotonic() - start_time,
+            )
@@ -0,0 +1,266 @@
+import collections
+import json
+import logging
+import threading
+import weakref
+from collections.abc import Callable
+from functools import lru_cache
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+from docling.document_converter import PdfFormatOption
+from docling.pipeline.standard_pdf_pipeline import StandardPdfPipeline
+from docling_jobkit.datamodel.convert import ConvertDocumentsOptions
+
+from docling_serve.cancellation import CancellableConverterManager
+from docling_serve.settings import docling_serve_settings
+
+_log = logging.getLogger(__name__)
+
+# The pooled pipeline rebuilds the models of StandardPdfPipeline._init_models(),
+# which is internal to docling. The docling releases with another layout of the
+# models convert with the plain pipeline, without pooling its models.
+try:
+    from docling.models.code_formula_model import (
+        CodeFormulaModel,
+        CodeFormulaModelOptions,
+    )
+    from docling.models.layout_model import LayoutModel
+    from docling.models.page_assemble_model import (
+        PageAssembleModel,
+        PageAssembleOptions,
+    )
+    from docling.models.page_preprocessing_model import (
+        PagePreprocessingModel,
+        PagePreprocessingOptions,
+    )
+    from docling.models.readingorder_model import (
+        ReadingOrderModel,
+        ReadingOrderOptions,
+    )
+    from docling.models.table_structure_model import TableStructureModel
+except ImportError:
+    MODEL_POOLING_SUPPORTED = False
+else:
+    MODEL_POOLING_SUPPORTED = hasattr(StandardPdfPipeline, "_init_models")
+
+
+def _options_key(options: Optional[BaseModel]) -> str:
+    if options is None:
+        return ""
+    data = options.model_dump(mode="json", serialize_as_any=True)
+    return f"{type(options).__name__}:{json.dumps(data, sort_keys=True)}"
+
+
+class ModelPool:
+    """
+    Models shared by the pipelines of the cached converters.
+
+    The models are keyed by the options determining their weights, the
+    pipelines built with the same model options share the loaded instances.
+    A model is referenced by the pipelines using it, and kept loaded once its
+    last pipeline is gone, up to `max_idle` models, so the eviction of a
+    converter from the options cache does not discard its weights.
+    """
+
+    def __init__(self, max_idle: int):
+        self.max_idle = max_idle
+        self.hits = 0
+        self.misses = 0
+        self._models: dict[tuple, Any] = {}
+        self._refs: collections.Counter[tuple] = collections.Counter()
+        # Models without pipeline, the least recently released first
+        self._idle: collections.OrderedDict[tuple, None] = collections.OrderedDict()
+        # Held while loading, a model is never loaded twice
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self) -> int:
+        return len(self._models)
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "max_idle": self.max_idle,
+            "loaded": self.loaded,
+            "idle": self.idle,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def acquire(self, owner: object, key: tuple, load: Callable[[], Any]) -> Any:
+        """The model of `key`, referenced by `owner` until it is collected."""
+        with self._lock:
+            if key in self._models:
+                self.hits += 1
+                self._idle.pop(key, None)
+            else:
+                self.misses += 1
+                _log.info(f"Loading the model {key[0]}")
+                self._models[key] = load()
+            self._refs[key] += 1
+            model = self._models[key]
+        weakref.finalize(owner, self.release, key)
+        return model
+
+    def release(self, key: tuple):
+        with self._lock:
+            self._refs[key] -= 1
+            if self._refs[key] > 0:
+                return
+            del self._refs[key]
+            self._idle[key] = None
+            while len(self._idle) > self.max_idle:
+                evicted, _ = self._idle.popitem(last=False)
+                _log.info(f"Unloading the model {evicted[0]}")
+                del self._models[evicted]
+
+    def clear(self):
+        """Unload the models not used by a pipeline."""
+        with self._lock:
+            for key in self._idle:
+                del self._models[key]
+            self._idle.clear()
+
+
+@lru_cache
+def get_model_pool() -> ModelPool:
+    return ModelPool(max_idle=docling_serve_settings.model_pool_size)
+
+
+class PooledStandardPdfPipeline(StandardPdfPipeline):
+    """
+    Standard PDF pipeline taking its layout, table structure, OCR and code and
+    formula models from the model pool. The other models are cheap and built
+    for each pipeline, as in StandardPdfPipeline._init_models().
+
+    The pool of the process is used, unless a subclass sets its own pool.
+    """
+
+    model_pool: Optional[ModelPool] = None
+
+    def _pooled(self, name: str, *key: Any, load: Callable[[], Any]) -> Any:
+        accelerator = _options_key(self.pipeline_options.accelerator_options)
+        pool = self.model_pool if self.model_pool is not None else get_model_pool()
+        return pool.acquire(
+            self, (name, str(self.artifacts_path), accelerator, *key), load
+        )
+
+    def _init_models(self) -> None:
+        options = self.pipeline_options
+        art_path = self.artifacts_path
+        self.keep_images = (
+            options.generate_page_images
+            or options.generate_picture_images
+            or options.generate_table_images
+        )
+        self.preprocessing_model = PagePreprocessingModel(
+            options=PagePreprocessingOptions(images_scale=options.images_scale)
+        )
+        self.ocr_model = self._pooled(
+            "ocr",
+            options.do_ocr,
+            options.allow_external_plugins,
+            _options_key(options.ocr_options),
+            load=lambda: self._make_ocr_model(art_path),
+        )
+        self.layout_model = self._pooled(
+            "layout",
+            _options_key(options.layout_options),
+            load=lambda: LayoutModel(
+                artifacts_path=art_path,
+                accelerator_options=options.accelerator_options,
+                options=options.layout_options,
+            ),
+        )
+        self.table_model = self._pooled(
+            "table_structure",
+            options.do_table_structure,
+            _options_key(options.table_structure_options),
+            load=lambda: TableStructureModel(
+                enabled=options.do_table_structure,
+                artifacts_path=art_path,
+                options=options.table_structure_options,
+                accelerator_options=options.accelerator_options,
+            ),
+        )
+        self.assemble_model = PageAssembleModel(options=PageAssembleOptions())
+        self.reading_order_model = ReadingOrderModel(options=ReadingOrderOptions())
+
+        code_formula_options = CodeFormulaModelOptions(
+            do_code_enrichment=options.do_code_enrichment,
+            do_formula_enrichment=options.do_formula_enrichment,
+        )
+        code_formula_enabled = (
+            options.do_code_enrichment or options.do_formula_enrichment
+        )
+        self.enrichment_pipe = [
+            self._pooled(
+                "code_formula",
+                code_formula_enabled,
+                _options_key(code_formula_options),
+                load=lambda: CodeFormulaModel(
+                    enabled=code_formula_enabled,
+                    artifacts_path=art_path,
+                    options=code_formula_options,
+                    accelerator_options=options.accelerator_options,
+                ),
+            ),
+            *self.enrichment_pipe,
+        ]
+
+        self.keep_backend = any(
+            (
+                options.do_formula_enrichment,
+                options.do_code_enrichment,
+                options.do_picture_classification,
+                options.do_picture_description,
+            )
+        )
+
+
+class PooledConverterManager(CancellableConverterManager):
+    """
+    Converter manager whose standard PDF pipelines share their models through
+    the model pool, the options cache only keeps the converters.
+
+    The managers given their own `model_pool` do not share their models with
+    the other managers of the process, as the local workers not sharing models.
+    When the installed docling is not supported, the standard PDF pipelines
+    are used as they are and the pool stays empty.
+    """
+
+    def __init__(self, *args, model_pool: Optional[ModelPool] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if not MODEL_POOLING_SUPPORTED and model_pool is None:
+            _log.warning(
+                "The models of the PDF pipelines are not pooled, the installed "
+                "docling version is not supported by the model pool."
+            )
+        self.model_pool = model_pool if model_pool is not None else get_model_pool()
+        self._pipeline_cls: type[PooledStandardPdfPipeline] = PooledStandardPdfPipeline
+        if model_pool is not None:
+            self._pipeline_cls = type(
+                PooledStandardPdfPipeline.__name__,
+                (PooledStandardPdfPipeline,),
+                {"model_pool": model_pool},
+            )
+
+    def get_pdf_pipeline_opts(
+        self, request: ConvertDocumentsOptions
+    ) -> PdfFormatOption:
+        pdf_format_option = super().get_pdf_pipeline_opts(request)
+        if (
+            MODEL_POOLING_SUPPORTED
+            and pdf_format_option.pipeline_cls is StandardPdfPipeline
+        ):
+            pdf_format_option.pipeline_cls = self._pipeline_cls
+        return pdf_format_option
+
+    def clear_cache(self):
+        super().clear_cache()
+        self.model_pool.clear()
@@ -0,0 +1,237 @@
+import asyncio
+import base64
+import binascii
+import hashlib
+import json
+import uuid
+from collections.abc import AsyncIterator
+from typing import Annotated, Any, Optional
+
+from pydantic import Field, TypeAdapter
+
+from docling_serve.datamodel.requests import FileSourceRequest, HttpSourceRequest
+from docling_serve.settings import docling_serve_settings
+from docling_serve.storage import ScratchFileSource, get_uploads_dir
+
+# Maximum size of a JSON object line, the file content goes in chunk lines
+MAX_LINE_SIZE = 8 * 1024 * 1024  # 8 MiB
+
+LineSourceItem = Annotated[
+    FileSourceRequest | HttpSourceRequest, Field(discriminator="kind")
+]
+_line_source_adapter: TypeAdapter[FileSourceRequest | HttpSourceRequest] = TypeAdapter(
+    LineSourceItem
+)
+
+
+class SourceStreamError(ValueError):
+    """The NDJSON stream of sources is malformed."""
+
+
+class SourceTooLargeError(SourceStreamError):
+    """A streamed file exceeds the maximum file size."""
+
+
+class Base64Spooler:
+    """Decode base64 text incrementally to a file in the scratch directory."""
+
+    def __init__(self, filename: str, max_size: int):
+        self.filename = filename
+        self.max_size = max_size
+        self.size = 0
+        self.path = get_uploads_dir() / uuid.uuid4().hex
+        self._file = self.path.open("wb")
+        self._digest = hashlib.sha256()
+        self._pending = b""
+
+    def write(self, data: bytes):
+        data = self._pending + data
+        end = len(data) - len(data) % 4
+        self._pending = data[end:]
+        if end:
+            self._decode(data[:end])
+
+    def _decode(self, data: bytes):
+        # Checked before decoding, the padding only makes it smaller
+        if self.size + len(data) // 4 * 3 - data[-2:].count(b"=") > self.max_size:
+            raise SourceTooLargeError(
+                f"The file {self.filename} exceeds the maximum size of "
+                f"{self.max_size} bytes."
+            )
+        try:
+            content = base64.b64decode(data, validate=True)
+        except binascii.Error as e:
+            raise SourceStreamError(
+                f"Invalid base64 content for the file {self.filename}: {e}"
+            ) from e
+        self.size += len(content)
+        self._digest.update(content)
+        self._file.write(content)
+
+    def close(self) -> ScratchFileSource:
+        if self._pending:
+            raise SourceStreamError(
+                f"Truncated base64 content for the file {self.filename}."
+            )
+        self._file.close()
+        return ScratchFileSource(
+            filename=self.filename, path=self.path, sha256=self._digest.hexdigest()
+        )
+
+    def discard(self):
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+
+class NdjsonSourceParser:
+    """
+    Incremental parser of a conversion request streamed as NDJSON.
+
+    The first line is the JSON request, with the options, the target and any
+    inline sources. Each following line is either a source object, or a JSON
+    string with a chunk of the base64 content of the file announced by the
+    previous `{"kind": "file", "filename": ...}` line without `base64_string`.
+    The chunks are decoded to the scratch directory as they arrive, so the
+    memory usage does not depend on the size of the files.
+    """
+
+    def __init__(self, max_file_size: Optional[int] = None):
+        self.max_file_size = max_file_size or docling_serve_settings.max_file_size
+        self.request: Optional[dict[str, Any]] = None
+        self.sources: list[
+            FileSourceRequest | HttpSourceRequest | ScratchFileSource
+        ] = []
+        self._line = bytearray()
+        self._in_chunk = False
+        self._after_chunk = False
+        self._escape = b""
+        self._spooler: Optional[Base64Spooler] = None
+
+    def feed(self, data: bytes):
+        pos = 0
+        while pos < len(data):
+            if self._in_chunk:
+                pos = self._feed_chunk(data, pos)
+            elif self._after_chunk:
+                end = data.find(b"\n", pos)
+                if data[pos : len(data) if end < 0 else end].strip():
+                    raise SourceStreamError("Unexpected content after a base64 chunk.")
+                if end < 0:
+                    return
+                self._after_chunk = False
+                pos = end + 1
+            else:
+                if not self._line:
+                    while pos < len(data) and data[pos] in b" \t\r":
+                        pos += 1
+                    if pos == len(data):
+                        return
+                    if data[pos] == ord('"'):
+                        if self._spooler is None:
+                            raise SourceStreamError(
+                                "A base64 chunk must follow a file source line."
+                            )
+                        self._in_chunk = True
+                        pos += 1
+                        continue
+
+                end = data.find(b"\n", pos)
+                self._line += data[pos : len(data) if end < 0 else end]
+                if len(self._line) > MAX_LINE_SIZE:
+                    raise SourceStreamError(
+                        f"Lines are limited to {MAX_LINE_SIZE} bytes, "
+                        "send the file content in base64 chunk lines."
+                    )
+                if end < 0:
+                    return
+                self._parse_line(bytes(self._line))
+                self._line.clear()
+                pos = end + 1
+
+    def _feed_chunk(self, data: bytes, pos: int) -> int:
+        assert self._spooler is not None
+        end = data.find(b'"', pos)
+        piece = self._escape + data[pos : len(data) if end < 0 else end]
+
+        # Some JSON encoders escape the slashes
+        self._escape = b""
+        if piece.endswith(b"\\"):
+            self._escape = b"\\"
+            piece = piece[:-1]
+        piece = piece.replace(b"\\/", b"/")
+        if b"\\" in piece:
+            raise SourceStreamError("Unexpected escape sequence in a base64 chunk.")
+
+        self._spooler.write(piece)
+        if end < 0:
+            return len(data)
+        if self._escape:
+            raise SourceStreamError("Unexpected escape sequence in a base64 chunk.")
+        self._in_chunk = False
+        self._after_chunk = True
+        return end + 1
+
+    def _parse_line(self, line: bytes):
+        if not line.strip():
+            return
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise SourceStreamError(f"Invalid JSON line: {e}") from e
+        if not isinstance(obj, dict):
+            raise SourceStreamError("Expected a JSON object or a base64 chunk.")
+
+        if self.request is None:
+            self.request = obj
+            return
+
+        self._close_spooler()
+        if obj.get("kind") == "file" and "base64_string" not in obj:
+            self._spooler = Base64Spooler(
+                filename=str(obj.get("filename", f"file_{len(self.sources)}")),
+                max_size=self.max_file_size,
+            )
+        else:
+            self.sources.append(_line_source_adapter.validate_python(obj))
+
+    def _close_spooler(self):
+        if self._spooler is not None:
+            spooler, self._spooler = self._spooler, None
+            try:
+                self.sources.append(spooler.close())
+            except BaseException:
+                spooler.discard()
+                raise
+
+    def close(self):
+        if self._in_chunk:
+            raise SourceStreamError("Unterminated base64 chunk.")
+        self._parse_line(bytes(self._line))
+        self._line.clear()
+        self._close_spooler()
+        if self.request is None:
+            raise SourceStreamError("The stream does not contain a request.")
+
+    def discard(self):
+        if self._spooler is not None:
+            self._spooler.discard()
+            self._spooler = None
+        for source in self.sources:
+            if isinstance(source, ScratchFileSource):
+                source.discard()
+
+
+async def parse_ndjson_sources(
+    stream: AsyncIterator[bytes], max_file_size: Optional[int] = None
+) -> NdjsonSourceParser:
+    """Parse a streamed NDJSON request, discarding the spooled files on errors."""
+    parser = NdjsonSourceParser(max_file_size=max_file_size)
+    try:
+        # Decoded and written to the scratch files in a thread, as spool_upload
+        async for data in stream:
+            await asyncio.to_thread(parser.feed, data)
+        await asyncio.to_thread(parser.close)
+    except BaseException:
+        parser.discard()
+        raise
+    return parser
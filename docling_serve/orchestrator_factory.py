@@ -1,5 +1,8 @@
+import asyncio
 import json
 import logging
+import time
+from collections.abc import Awaitable, Callable
 from functools import lru_cache
 from typing import Any, Optional
 
@@ -13,10 +16,64 @@ from docling_jobkit.orchestrators.base_orchestrator import (
 )
 
 from docling_serve.settings import AsyncEngine, docling_serve_settings
-from docling_serve.storage import get_scratch
+from docling_serve.storage import ScratchFileSource, get_scratch
 
 _log = logging.getLogger(__name__)
 
+# Hash of the model pool stats of the RQ workers, by worker name
+MODEL_POOL_STATS_KEY = "docling:model_pool:stats"
+
+
+class TaskStatusCache:
+    """
+    Short-lived cache of the task status, shared by the concurrent requests.
+
+    Concurrent lookups of the same task are coalesced in a single call of the
+    backend (single-flight), and the result is reused for `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: dict[str, tuple[float, Task]] = {}
+        self._inflight: dict[str, asyncio.Future[Task]] = {}
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+    def invalidate(self, task_id: str):
+        self._entries.pop(task_id, None)
+
+    async def get(self, task_id: str, fetch: Callable[[], Awaitable[Task]]) -> Task:
+        now = time.monotonic()
+        entry = self._entries.get(task_id)
+        if entry is not None and entry[0] > now:
+            self.hits += 1
+            return entry[1]
+
+        if task_id in self._inflight:
+            self.coalesced += 1
+            # Shielded, a cancelled waiter must not cancel the shared lookup
+            return await asyncio.shield(self._inflight[task_id])
+
+        self.misses += 1
+        future: asyncio.Future[Task] = asyncio.ensure_future(fetch())
+        self._inflight[task_id] = future
+        try:
+            task = await asyncio.shield(future)
+        finally:
+            if self._inflight.get(task_id) is future:
+                del self._inflight[task_id]
+
+        # Drop the expired entries, keeping the cache bounded by the active tasks
+        self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+        self._entries[task_id] = (time.monotonic() + self.ttl, task)
+        return task
+
 
 class RedisTaskStatusMixin:
     tasks: dict[str, Task]
@@ -31,53 +88,37 @@ class RedisTaskStatusMixin:
             max_connections=10,
             socket_timeout=2.0,
         )
+        self.task_status_cache = TaskStatusCache(
+            ttl=docling_serve_settings.eng_rq_status_cache_ttl
+        )
 
     async def task_status(self, task_id: str, wait: float = 0.0) -> Task:
         """
-        Get task status by checking Redis first, then falling back to RQ verification.
+        Get task status by checking RQ first, then falling back to Redis.
 
         When Redis shows 'pending' but RQ shows 'success', we update Redis
         and return the RQ status for cross-instance consistency.
+        The status is cached for a short time, see TaskStatusCache.
         """
-        _log.info(f"Task {task_id} status check")
-
-        # Always check RQ directly first - this is the most reliable source
-        rq_task = await self._get_task_from_rq_direct(task_id)
-        if rq_task:
-            _log.info(f"Task {task_id} in RQ: {rq_task.task_status}")
-
-            # Update memory registry
-            self.tasks[task_id] = rq_task
-
-            # Store/update in Redis for other instances
-            await self._store_task_in_redis(rq_task)
-            return rq_task
+        # Completed tasks, e.g. from the pubsub updates, are resolved locally
+        # and take precedence over the cached status
+        local_task = self.tasks.get(task_id)
+        if local_task is not None and local_task.is_completed():
+            self.task_status_cache.invalidate(task_id)
+            return await self._task_status(task_id, wait)
+
+        if self.task_status_cache.ttl <= 0:
+            return await self._task_status(task_id, wait)
+        return await self.task_status_cache.get(
+            task_id, lambda: self._task_status(task_id, wait)
+        )
 
-        # If not in RQ, check Redis (maybe it's cached from another instance)
-        task = await self._get_task_from_redis(task_id)
-        if task:
-            _log.info(f"Task {task_id} in Redis: {task.task_status}")
-
-            # CRITICAL FIX: Check if Redis status might be stale
-            # STARTED tasks might have completed since they were cached
-            if task.task_status in [TaskStatus.PENDING, TaskStatus.STARTED]:
-                _log.debug(f"Task {task_id} verifying stale status")
-
-                # Try to get fresh status from RQ
-                fresh_rq_task = await self._get_task_from_rq_direct(task_id)
-                if fresh_rq_task and fresh_rq_task.task_status != task.task_status:
-                    _log.info(
-                        f"Task {task_id} status updated: {fresh_rq_task.task_status}"
-                    )
+    async def _task_status(self, task_id: str, wait: float = 0.0) -> Task:
+        _log.info(f"Task {task_id} status check")
 
-                    # Update memory and Redis with fresh status
-                    self.tasks[task_id] = fresh_rq_task
-                    await self._store_task_in_redis(fresh_rq_task)
-                    return fresh_rq_task
-                else:
-                    _log.debug(f"Task {task_id} status consistent")
-
-            return task
+        tasks = await self.task_status_many([task_id])
+        if task_id in tasks:
+            return tasks[task_id]
 
         # Fall back to parent implementation
         try:
@@ -91,13 +132,58 @@ class RedisTaskStatusMixin:
             _log.warning(f"Task {task_id} not found")
             raise
 
+    async def task_status_many(self, task_ids: list[str]) -> dict[str, Task]:
+        """
+        Get the status of many tasks with a fixed number of round trips.
+
+        The Redis metadata of the tasks unknown to this instance are fetched
+        with one MGET, the RQ jobs and their latest results with one pipeline
+        and the updated tasks are stored back with one pipeline.
+        Tasks which are not found are omitted from the result.
+        """
+        tasks: dict[str, Task] = {}
+
+        unknown_ids = [task_id for task_id in task_ids if task_id not in self.tasks]
+        if unknown_ids:
+            tasks.update(await self._get_tasks_from_redis(unknown_ids))
+        for task_id in task_ids:
+            if task_id in self.tasks:
+                tasks[task_id] = self.tasks[task_id]
+
+        # Completed tasks cannot change anymore
+        active_ids = [
+            task_id
+            for task_id in task_ids
+            if task_id not in tasks or not tasks[task_id].is_completed()
+        ]
+        rq_tasks = await self._get_tasks_from_rq_direct(active_ids, known=tasks)
+        for task_id, rq_task in rq_tasks.items():
+            _log.debug(f"Task {task_id} in RQ: {rq_task.task_status}")
+            self.tasks[task_id] = rq_task
+            tasks[task_id] = rq_task
+
+        # Store/update in Redis for other instances
+        await self._store_tasks_in_redis(list(rq_tasks.values()))
+        return tasks
+
     async def _get_task_from_redis(self, task_id: str) -> Optional[Task]:
+        return (await self._get_tasks_from_redis([task_id])).get(task_id)
+
+    async def _get_tasks_from_redis(self, task_ids: list[str]) -> dict[str, Task]:
+        tasks: dict[str, Task] = {}
         try:
             async with redis.Redis(connection_pool=self._redis_pool) as r:
-                task_data = await r.get(f"{self.redis_prefix}{task_id}:metadata")
-                if not task_data:
-                    return None
+                values = await r.mget(
+                    [f"{self.redis_prefix}{task_id}:metadata" for task_id in task_ids]
+                )
+        except Exception as e:
+            _log.error(f"Redis get tasks {task_ids}: {e}")
+            return tasks
 
+        for task_id, task_data in zip(task_ids, values):
+            if not task_data:
+                continue
+            try:
                 data: dict[str, Any] = json.loads(task_data)
                 meta = data.get("processing_meta") or {}
                 meta.setdefault("num_docs", 0)
@@ -105,71 +191,80 @@ class RedisTaskStatusMixin:
                 meta.setdefault("num_succeeded", 0)
                 meta.setdefault("num_failed", 0)
 
-                return Task(
+                tasks[task_id] = Task(
                     task_id=data["task_id"],
                     task_type=data["task_type"],
                     task_status=TaskStatus(data["task_status"]),
                     processing_meta=meta,
                 )
-        except Exception as e:
-            _log.error(f"Redis get task {task_id}: {e}")
-            return None
+            except Exception as e:
+                _log.error(f"Redis get task {task_id}: {e}")
+        return tasks
 
-    async def _get_task_from_rq_direct(self, task_id: str) -> Optional[Task]:
-        try:
-            _log.debug(f"Checking RQ for task {task_id}")
-
-            temp_task = Task(
-                task_id=task_id,
-                task_type="convert",
-                task_status=TaskStatus.PENDING,
-                processing_meta={
-                    "num_docs": 0,
-                    "num_processed": 0,
-                    "num_succeeded": 0,
-                    "num_failed": 0,
-                },
-            )
+    async def _get_tasks_from_rq_direct(
+        self, task_ids: list[str], known: dict[str, Task]
+    ) -> dict[str, Task]:
+        """
+        Fetch the RQ jobs with Job.fetch_many, in one round trip.
 
-            original_task = self.tasks.get(task_id)
-            self.tasks[task_id] = temp_task
+        Returns the tasks with an RQ job, starting from the `known` task when
+        available and updating its status. The jobs which ended are resolved
+        once by the RQ orchestrator, which also reads their result key.
+        """
+        if not task_ids:
+            return {}
 
-            try:
-                await super()._update_task_from_rq(task_id)  # type: ignore[misc]
-
-                updated_task = self.tasks.get(task_id)
-                if updated_task and updated_task.task_status != TaskStatus.PENDING:
-                    _log.debug(f"RQ task {task_id}: {updated_task.task_status}")
-
-                    # Store result key if available
-                    if task_id in self._task_result_keys:
-                        try:
-                            async with redis.Redis(
-                                connection_pool=self._redis_pool
-                            ) as r:
-                                await r.set(
-                                    f"{self.redis_prefix}{task_id}:result_key",
-                                    self._task_result_keys[task_id],
-                                    ex=86400,
-                                )
-                                _log.debug(f"Stored result key for {task_id}")
-                        except Exception as e:
-                            _log.error(f"Store result key {task_id}: {e}")
-
-                    return updated_task
-                return None
-
-            finally:
-                # Restore original task state
-                if original_task:
-                    self.tasks[task_id] = original_task
-                elif task_id in self.tasks and self.tasks[task_id] == temp_task:
-                    # Only remove if it's still our temp task
-                    del self.tasks[task_id]
+        from rq.job import Job, JobStatus
 
+        try:
+            _log.debug(f"Checking RQ for tasks {task_ids}")
+            jobs = await asyncio.to_thread(
+                Job.fetch_many,
+                task_ids,
+                connection=self._redis_conn,  # type: ignore[attr-defined]
+            )
         except Exception as e:
-            _log.error(f"RQ check {task_id}: {e}")
-            return None
+            _log.error(f"RQ check {task_ids}: {e}")
+            return {}
+
+        tasks: dict[str, Task] = {}
+        for task_id, job in zip(task_ids, jobs):
+            if job is None:
+                continue
+            task = known[task_id].model_copy() if task_id in known else None
+            if task is None:
+                task = Task(
+                    task_id=task_id,
+                    task_type="convert",
+                    task_status=TaskStatus.PENDING,
+                    processing_meta={
+                        "num_docs": 0,
+                        "num_processed": 0,
+                        "num_succeeded": 0,
+                        "num_failed": 0,
+                    },
+                )
+
+            status = job.get_status(refresh=False)
+            if status in (
+                JobStatus.QUEUED,
+                JobStatus.SCHEDULED,
+                JobStatus.STOPPED,
+                JobStatus.DEFERRED,
+            ):
+                task.set_status(TaskStatus.PENDING)
+            elif status == JobStatus.STARTED:
+                task.set_status(TaskStatus.STARTED)
+            else:
+                try:
+                    self.tasks[task_id] = task
+                    await super()._update_task_from_rq(task_id)  # type: ignore[misc]
+                    task = self.tasks[task_id]
+                except Exception as e:
+                    _log.error(f"RQ check {task_id}: {e}")
+                    continue
+            tasks[task_id] = task
+        return tasks
 
     async def get_raw_task(self, task_id: str) -> Task:
         if task_id in self.tasks:
@@ -188,34 +283,68 @@ class RedisTaskStatusMixin:
             raise
 
     async def _store_task_in_redis(self, task: Task) -> None:
-        try:
-            meta: Any = task.processing_meta
-            if hasattr(meta, "model_dump"):
-                meta = meta.model_dump()
-            elif not isinstance(meta, dict):
-                meta = {
-                    "num_docs": 0,
-                    "num_processed": 0,
-                    "num_succeeded": 0,
-                    "num_failed": 0,
-                }
-
-            data: dict[str, Any] = {
-                "task_id": task.task_id,
-                "task_type": task.task_type.value
-                if hasattr(task.task_type, "value")
-                else str(task.task_type),
-                "task_status": task.task_status.value,
-                "processing_meta": meta,
+        await self._store_tasks_in_redis([task])
+
+    def _task_metadata(self, task: Task) -> dict[str, Any]:
+        meta: Any = task.processing_meta
+        if hasattr(meta, "model_dump"):
+            meta = meta.model_dump()
+        elif not isinstance(meta, dict):
+            meta = {
+                "num_docs": 0,
+                "num_processed": 0,
+                "num_succeeded": 0,
+                "num_failed": 0,
             }
+
+        return {
+            "task_id": task.task_id,
+            "task_type": task.task_type.value
+            if hasattr(task.task_type, "value")
+            else str(task.task_type),
+            "task_status": task.task_status.value,
+            "processing_meta": meta,
+        }
+
+    async def _store_tasks_in_redis(self, tasks: list[Task]) -> None:
+        """Store the tasks metadata and result keys in one MULTI/EXEC round trip."""
+        if not tasks:
+            return
+        try:
             async with redis.Redis(connection_pool=self._redis_pool) as r:
-                await r.set(
-                    f"{self.redis_prefix}{task.task_id}:metadata",
-                    json.dumps(data),
-                    ex=86400,
-                )
+                async with r.pipeline(transaction=True) as pipe:
+                    for task in tasks:
+                        pipe.set(
+                            f"{self.redis_prefix}{task.task_id}:metadata",
+                            json.dumps(self._task_metadata(task)),
+                            ex=86400,
+                        )
+                        if task.task_id in self._task_result_keys:
+                            pipe.set(
+                                f"{self.redis_prefix}{task.task_id}:result_key",
+                                self._task_result_keys[task.task_id],
+                                ex=86400,
+                            )
+                    await pipe.execute()
         except Exception as e:
-            _log.error(f"Store task {task.task_id}: {e}")
+            _log.error(f"Store tasks {[task.task_id for task in tasks]}: {e}")
+
+    async def delete_task(self, task_id: str):
+        from rq.utils import as_text
+
+        self.task_status_cache.invalidate(task_id)
+
+        # Results served before a restart, or by another instance
+        if task_id not in self._task_result_keys:
+            try:
+                async with redis.Redis(connection_pool=self._redis_pool) as r:
+                    result_key = await r.get(f"{self.redis_prefix}{task_id}:result_key")
+                if result_key:
+                    self._task_result_keys[task_id] = as_text(result_key)
+            except Exception as e:
+                _log.error(f"Redis result key {task_id}: {e}")
+
+        await super().delete_task(task_id)  # type: ignore[misc]
 
     async def enqueue(self, **kwargs):  # type: ignore[override]
         task = await super().enqueue(**kwargs)  # type: ignore[misc]
@@ -223,6 +352,8 @@ class RedisTaskStatusMixin:
         return task
 
     async def task_result(self, task_id: str):  # type: ignore[override]
+        from rq.utils import as_text
+
         result = await super().task_result(task_id)  # type: ignore[misc]
         if result is not None:
             return result
@@ -231,7 +362,7 @@ class RedisTaskStatusMixin:
             async with redis.Redis(connection_pool=self._redis_pool) as r:
                 result_key = await r.get(f"{self.redis_prefix}{task_id}:result_key")
                 if result_key:
-                    self._task_result_keys[task_id] = result_key.decode("utf-8")
+                    self._task_result_keys[task_id] = as_text(result_key)
                     return await super().task_result(task_id)  # type: ignore[misc]
         except Exception as e:
             _log.error(f"Redis result key {task_id}: {e}")
@@ -251,30 +382,300 @@ class RedisTaskStatusMixin:
                 _log.debug(f"Task {task_id} status: {original_status} -> {new_status}")
                 await self._store_task_in_redis(self.tasks[task_id])
 
-        if task_id in self._task_result_keys:
-            try:
-                async with redis.Redis(connection_pool=self._redis_pool) as r:
-                    await r.set(
-                        f"{self.redis_prefix}{task_id}:result_key",
-                        self._task_result_keys[task_id],
-                        ex=86400,
-                    )
-            except Exception as e:
-                _log.error(f"Store result key {task_id}: {e}")
+
+class RQQueuePositionsMixin:
+    """
+    Queue positions of the jobs on the plain RQ list, several at once.
+
+    The list is shared with the other instances of the server, the positions
+    of the watched tasks are fetched with one LPOS each, in one round trip.
+    """
+
+    _rq_queue: Any
+
+    async def get_queue_positions(
+        self, task_ids: list[str]
+    ) -> dict[str, Optional[int]]:
+        """The queue positions of several tasks, with one round trip."""
+
+        def fetch() -> list[Optional[int]]:
+            with self._rq_queue.connection.pipeline(transaction=False) as pipe:
+                for task_id in task_ids:
+                    pipe.lpos(self._rq_queue.key, task_id)
+                return pipe.execute()
+
+        positions = await asyncio.to_thread(fetch)
+        return {
+            task_id: position + 1 if position is not None else None
+            for task_id, position in zip(task_ids, positions)
+        }
+
+
+class FairShareRQMixin:
+    """
+    Queue the RQ jobs in a FairShareRQQueue, one list per tenant dispatched
+    round-robin by the workers, instead of the FIFO list of RQ.
+    """
+
+    _rq_queue: Any
+
+    @staticmethod
+    def make_rq_queue(config: Any) -> tuple[Any, Any]:
+        from docling_serve.rq_fair_queue import make_fair_rq_queue
+
+        return make_fair_rq_queue(config)
+
+    async def get_queue_position(self, task_id: str) -> Optional[int]:
+        try:
+            position = await asyncio.to_thread(self._rq_queue.get_job_position, task_id)
+        except Exception as e:
+            _log.error(f"Error getting the queue position of task {task_id}: {e}")
+            return None
+        return position + 1 if position is not None else None
+
+    async def get_queue_positions(
+        self, task_ids: list[str]
+    ) -> dict[str, Optional[int]]:
+        """The queue positions of several tasks, with one round trip."""
+        positions = await asyncio.to_thread(self._rq_queue.get_job_positions, task_ids)
+        return {
+            task_id: position + 1 if position is not None else None
+            for task_id, position in positions.items()
+        }
+
+
+class CancellableRQMixin:
+    """
+    Cancel the RQ jobs. The queued jobs are removed from the queue, the running
+    ones are asked to stop with a key watched by the workers.
+    """
+
+    tasks: dict[str, Task]
+    config: Any
+    notifier: Any
+    _redis_conn: Any
+    _rq_queue: Any
+
+    async def cancel_task(self, task_id: str) -> bool:
+        task = await self.task_status(task_id=task_id)  # type: ignore[attr-defined]
+        if task.is_completed():
+            return False
+
+        revoked = await asyncio.to_thread(self._cancel_job, task_id)
+        if revoked:
+            _log.info(f"Revoked the queued task {task_id}")
+            task = self.tasks.get(task_id, task)
+            task.set_status(TaskStatus.FAILURE)
+            # The update published for the other instances is skipped here, the
+            # task being completed already: its subscribers are notified now
+            task_subscribers = getattr(self.notifier, "task_subscribers", {})
+            if task_id in task_subscribers:
+                await self.notifier.notify_task_subscribers(task_id)
+                await self.notifier.notify_queue_positions()
+        return True
+
+    def _cancel_job(self, task_id: str) -> bool:
+        """Cancel the job, returns whether it was still queued."""
+        from rq.exceptions import InvalidJobOperation, NoSuchJobError
+        from rq.job import Job, JobStatus
+
+        from docling_jobkit.orchestrators.rq.orchestrator import _TaskUpdate
+
+        from docling_serve.cancellation import CANCEL_TTL, cancel_key
+
+        # Set first, a worker taking the job meanwhile stops it right away
+        self._redis_conn.set(cancel_key(task_id), 1, ex=CANCEL_TTL)
+        try:
+            job = Job.fetch(task_id, connection=self._redis_conn)
+            if job.get_status() not in (
+                JobStatus.QUEUED,
+                JobStatus.SCHEDULED,
+                JobStatus.DEFERRED,
+            ):
+                return False
+            job.cancel()
+            # RQ removes the job from the plain list, not from its tenant list
+            self._rq_queue.remove(task_id)
+        except (NoSuchJobError, InvalidJobOperation) as e:
+            _log.debug(f"Job {task_id} cannot be revoked: {e}")
+            return False
+
+        # The instances listening to the updates notify the subscribers
+        self._redis_conn.publish(
+            self.config.sub_channel,
+            _TaskUpdate(
+                task_id=task_id, task_status=TaskStatus.FAILURE
+            ).model_dump_json(),
+        )
+        return True
+
+
+class RQWorkersMixin:
+    """
+    Count the live RQ workers listening to the queue of the orchestrator, and
+    collect the stats of their model pools.
+    """
+
+    _rq_queue: Any
+    _redis_conn: Any
+
+    async def count_workers(self) -> int:
+        from rq import Worker
+
+        # The workers whose heartbeat expired are not returned
+        workers = await asyncio.to_thread(Worker.all, queue=self._rq_queue)
+        return len(workers)
+
+    async def model_pool_stats(self) -> list[dict[str, int]]:
+        from rq import Worker
+
+        def fetch() -> list[dict[str, int]]:
+            names = {worker.name for worker in Worker.all(queue=self._rq_queue)}
+            stats = self._redis_conn.hgetall(MODEL_POOL_STATS_KEY)
+            return [
+                json.loads(worker_stats)
+                for name, worker_stats in stats.items()
+                if name.decode() in names
+            ]
+
+        return await asyncio.to_thread(fetch)
+
+
+class LocalWorkerView:
+    """
+    The local orchestrator as seen by one of its workers, with the converter
+    manager of the worker.
+
+    The jobkit workers not sharing the manager of the orchestrator convert with
+    a plain DoclingConverterManager, which would not stop the cancelled tasks
+    nor take its models from the model pool. The workers are given this view,
+    as sharing the manager, each with a manager of the orchestrator's class.
+    """
+
+    def __init__(self, orchestrator: Any, cm: Any):
+        self.orchestrator = orchestrator
+        self.cm = cm
+
+    # The state of the orchestrator used by AsyncLocalWorker.loop()
+    @property
+    def tasks(self) -> Any:
+        return self.orchestrator.tasks
+
+    @property
+    def task_queue(self) -> Any:
+        return self.orchestrator.task_queue
+
+    @property
+    def queue_list(self) -> Any:
+        return self.orchestrator.queue_list
+
+    @property
+    def notifier(self) -> Any:
+        return self.orchestrator.notifier
+
+    @property
+    def _task_results(self) -> Any:
+        return self.orchestrator._task_results
+
+
+class LocalWorkersMixin:
+    """
+    Run the local workers each with its own converter manager, of the class
+    of the orchestrator's manager. Without shared models, each manager also
+    has its own model pool, the workers never run the same model instances.
+    """
+
+    config: Any
+    cm: Any
+    scratch_dir: Any
+
+    def _worker_manager(self) -> Any:
+        from docling_serve.model_pool import ModelPool
+
+        return type(self.cm)(
+            self.cm.config,
+            model_pool=ModelPool(max_idle=docling_serve_settings.model_pool_size),
+        )
+
+    async def process_queue(self):
+        from docling_jobkit.orchestrators.local.worker import AsyncLocalWorker
+
+        self.worker_managers = []
+        workers = []
+        for i in range(self.config.num_workers):
+            if self.config.shared_models:
+                cm = self.cm
+            else:
+                cm = self._worker_manager()
+                self.worker_managers.append(cm)
+            worker = AsyncLocalWorker(
+                i,
+                LocalWorkerView(self, cm),  # type: ignore[arg-type]
+                use_shared_manager=True,
+                scratch_dir=self.scratch_dir,
+            )
+            workers.append(asyncio.create_task(worker.loop()))
+        await asyncio.gather(*workers)
+
+    async def clear_converters(self):
+        await super().clear_converters()  # type: ignore[misc]
+        for cm in getattr(self, "worker_managers", []):
+            cm.clear_cache()
+
+    async def model_pool_stats(self) -> list[dict[str, int]]:
+        managers = getattr(self, "worker_managers", None) or [self.cm]
+        return [cm.model_pool.stats() for cm in managers]
+
+
+async def count_workers(orchestrator: BaseOrchestrator) -> Optional[int]:
+    """
+    Number of live workers of the engines with separate worker processes, None
+    for the engines running their workers in the queue processor.
+    """
+    count = getattr(orchestrator, "count_workers", None)
+    if count is None:
+        return None
+    return await count()
+
+
+async def worker_model_pool_stats(
+    orchestrator: BaseOrchestrator,
+) -> Optional[list[dict[str, int]]]:
+    """
+    Stats of the model pools of the workers, one per worker process, None for
+    the engines whose workers do not pool their models.
+    """
+    stats = getattr(orchestrator, "model_pool_stats", None)
+    if stats is None:
+        return None
+    return await stats()
+
+
+async def cancel_task(orchestrator: BaseOrchestrator, task_id: str) -> bool:
+    """
+    Revoke a queued task, or stop a running one at its next page, when the
+    engine supports it. Returns False when the task is already completed.
+    """
+    cancel = getattr(orchestrator, "cancel_task", None)
+    if cancel is None:
+        return False
+    return await cancel(task_id)
 
 
 @lru_cache
 def get_async_orchestrator() -> BaseOrchestrator:
     if docling_serve_settings.eng_kind == AsyncEngine.LOCAL:
-        from docling_jobkit.convert.manager import (
-            DoclingConverterManager,
-            DoclingConverterManagerConfig,
-        )
+        from docling.datamodel.base_models import InputFormat
+        from docling_jobkit.convert.manager import DoclingConverterManagerConfig
+        from docling_jobkit.datamodel.convert import ConvertDocumentsOptions
         from docling_jobkit.orchestrators.local.orchestrator import (
             LocalOrchestrator,
             LocalOrchestratorConfig,
         )
 
+        from docling_serve.cancellation import CancellableTaskQueue
+        from docling_serve.model_pool import PooledConverterManager
+
         local_config = LocalOrchestratorConfig(
             num_workers=docling_serve_settings.eng_loc_num_workers,
             shared_models=docling_serve_settings.eng_loc_share_models,
@@ -294,9 +695,50 @@ def get_async_orchestrator() -> BaseOrchestrator:
             table_batch_size=docling_serve_settings.table_batch_size,
             batch_polling_interval_seconds=docling_serve_settings.batch_polling_interval_seconds,
         )
-        cm = DoclingConverterManager(config=cm_config)
-
-        return LocalOrchestrator(config=local_config, converter_manager=cm)
+        cm = PooledConverterManager(config=cm_config)
+
+        class FairShareLocalOrchestrator(LocalWorkersMixin, LocalOrchestrator):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                # The workers take the tasks in the fair share order
+                self.fair_queue = CancellableTaskQueue()
+                self.task_queue = self.fair_queue
+
+            async def get_queue_position(self, task_id: str) -> Optional[int]:
+                return self.fair_queue.position(task_id)
+
+            async def warm_up_caches(self):
+                # Loaded in a thread, the server answers the probes meanwhile
+                def warm_up():
+                    pdf_format_option = self.cm.get_pdf_pipeline_opts(
+                        ConvertDocumentsOptions()
+                    )
+                    converter = self.cm.get_converter(pdf_format_option)
+                    converter.initialize_pipeline(InputFormat.PDF)
+
+                await asyncio.to_thread(warm_up)
+
+            async def cancel_task(self, task_id: str) -> bool:
+                task = await self.get_raw_task(task_id=task_id)
+                if task.is_completed():
+                    return False
+                if not self.fair_queue.revoke(task_id):
+                    # The worker stops the task at the next page
+                    return self.fair_queue.cancel(task_id)
+
+                _log.info(f"Revoked the queued task {task_id}")
+                self.queue_list.remove(task_id)
+                for source in task.sources:
+                    if isinstance(source, ScratchFileSource):
+                        source.discard()
+                task.sources = []
+                task.set_status(TaskStatus.FAILURE)
+                if self.notifier:
+                    await self.notifier.notify_task_subscribers(task_id)
+                    await self.notifier.notify_queue_positions()
+                return True
+
+        return FairShareLocalOrchestrator(config=local_config, converter_manager=cm)
 
     elif docling_serve_settings.eng_kind == AsyncEngine.RQ:
         from docling_jobkit.orchestrators.rq.orchestrator import (
@@ -304,7 +746,19 @@ def get_async_orchestrator() -> BaseOrchestrator:
             RQOrchestratorConfig,
         )
 
-        class RedisAwareRQOrchestrator(RedisTaskStatusMixin, RQOrchestrator):  # type: ignore[misc]
+        class RedisAwareRQOrchestrator(  # type: ignore[misc]
+            RQQueuePositionsMixin,
+            RQWorkersMixin,
+            CancellableRQMixin,
+            RedisTaskStatusMixin,
+            RQOrchestrator,
+        ):
+            pass
+
+        # The tenant lists are only read by the workers of `docling-serve
+        # rq-worker`, without fair share the jobs stay on the plain RQ list
+        # for any RQ worker
+        class FairShareRQOrchestrator(FairShareRQMixin, RedisAwareRQOrchestrator):  # type: ignore[misc]
             pass
 
         rq_config = RQOrchestratorConfig(
@@ -314,6 +768,8 @@ def get_async_orchestrator() -> BaseOrchestrator:
             scratch_dir=get_scratch(),
         )
 
+        if docling_serve_settings.fair_share:
+            return FairShareRQOrchestrator(config=rq_config)
         return RedisAwareRQOrchestrator(config=rq_config)
 
     elif docling_serve_settings.eng_kind == AsyncEngine.KFP:
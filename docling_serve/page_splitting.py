@@ -0,0 +1,205 @@
+import base64
+import logging
+from io import BytesIO
+from typing import Optional
+
+import pypdfium2 as pdfium
+
+from docling.datamodel.base_models import DocumentStream, OutputFormat
+from docling.datamodel.document import ConversionStatus, ErrorItem
+from docling.utils.locks import pypdfium2_lock
+from docling.utils.profiling import ProfilingItem
+from docling.utils.utils import create_file_hash
+from docling_core.types.doc import ContentLayer, DocItem, DoclingDocument
+from docling_core.types.doc.document import DocumentOrigin
+from docling_jobkit.datamodel.http_inputs import FileSource
+from docling_jobkit.datamodel.result import (
+    DoclingTaskResult,
+    ExportDocumentResponse,
+    ExportResult,
+)
+from docling_jobkit.datamodel.task import TaskSource
+
+from docling_serve.datamodel.convert import ConvertDocumentsRequestOptions
+from docling_serve.storage import ScratchFileSource
+
+_log = logging.getLogger(__name__)
+
+
+def read_source_content(source: TaskSource) -> Optional[tuple[str, bytes]]:
+    """Return the filename and content of a file source, None for remote sources."""
+    if isinstance(source, ScratchFileSource):
+        return source.filename, source.path.read_bytes()
+    if isinstance(source, FileSource):
+        return source.filename, base64.b64decode(source.base64_string)
+    if isinstance(source, DocumentStream):
+        return source.name, source.stream.getvalue()
+    return None
+
+
+def split_pdf(
+    content: bytes, pages_per_window: int, page_range: tuple[int, int]
+) -> Optional[tuple[int, list[bytes]]]:
+    """
+    Split the pages of a PDF within `page_range` in windows of `pages_per_window`
+    pages, each saved as a new PDF.
+
+    Returns the number of the first page and the windows, or None when the
+    content is not a PDF or it fits in a single window.
+    """
+    if not content.startswith(b"%PDF"):
+        return None
+
+    with pypdfium2_lock:
+        try:
+            pdf = pdfium.PdfDocument(content)
+        except pdfium.PdfiumError:
+            return None
+
+        try:
+            first_page = max(page_range[0], 1)
+            last_page = min(page_range[1], len(pdf))
+            if last_page - first_page + 1 <= pages_per_window:
+                return None
+
+            windows = []
+            for start in range(first_page - 1, last_page, pages_per_window):
+                end = min(start + pages_per_window, last_page)
+                window = pdfium.PdfDocument.new()
+                try:
+                    window.import_pages(pdf, pages=list(range(start, end)))
+                    buf = BytesIO()
+                    window.save(buf)
+                finally:
+                    window.close()
+                windows.append(buf.getvalue())
+        finally:
+            pdf.close()
+
+    return first_page, windows
+
+
+def _shift_pages(doc: DoclingDocument, offset: int):
+    doc.pages = {
+        page_no + offset: page.model_copy(update={"page_no": page_no + offset})
+        for page_no, page in doc.pages.items()
+    }
+    for item, _ in doc.iterate_items(
+        with_groups=True,
+        traverse_pictures=True,
+        included_content_layers=set(ContentLayer),
+    ):
+        if isinstance(item, DocItem):
+            for prov in item.prov:
+                prov.page_no += offset
+
+
+def _merge_timings(
+    results: list[ExportResult],
+) -> dict[str, ProfilingItem]:
+    timings: dict[str, ProfilingItem] = {}
+    for result in results:
+        for key, item in result.timings.items():
+            if key not in timings:
+                timings[key] = ProfilingItem(scope=item.scope)
+            timings[key].count += item.count
+            timings[key].times = [*timings[key].times, *item.times]
+            timings[key].start_timestamps = [
+                *timings[key].start_timestamps,
+                *item.start_timestamps,
+            ]
+    return timings
+
+
+def _export_merged(
+    document: ExportDocumentResponse,
+    merged: DoclingDocument,
+    options: ConvertDocumentsRequestOptions,
+):
+    image_mode = options.image_export_mode
+    if OutputFormat.JSON in options.to_formats:
+        document.json_content = merged
+    # The response has a single HTML content, the split page view takes
+    # it when requested
+    if OutputFormat.HTML_SPLIT_PAGE in options.to_formats:
+        document.html_content = merged.export_to_html(
+            image_mode=image_mode, split_page_view=True
+        )
+    elif OutputFormat.HTML in options.to_formats:
+        document.html_content = merged.export_to_html(image_mode=image_mode)
+    if OutputFormat.TEXT in options.to_formats:
+        document.text_content = merged.export_to_markdown(
+            strict_text=True,
+            image_mode=image_mode,
+        )
+    if OutputFormat.MARKDOWN in options.to_formats:
+        document.md_content = merged.export_to_markdown(
+            image_mode=image_mode,
+            page_break_placeholder=options.md_page_break_placeholder or None,
+        )
+    if OutputFormat.DOCTAGS in options.to_formats:
+        document.doctags_content = merged.export_to_doctags()
+
+
+def merge_window_results(
+    filename: str,
+    content: bytes,
+    first_page: int,
+    window_results: list[DoclingTaskResult],
+    options: ConvertDocumentsRequestOptions,
+    processing_time: float,
+) -> DoclingTaskResult:
+    """
+    Concatenate the documents converted from the page windows and export the
+    merged document in the formats requested in the options.
+    """
+    export_results: list[ExportResult] = []
+    for window_result in window_results:
+        if not isinstance(window_result.result, ExportResult):
+            raise RuntimeError("The page windows must be converted as in-body results.")
+        export_results.append(window_result.result)
+
+    docs: list[DoclingDocument] = []
+    errors: list[ErrorItem] = []
+    for result in export_results:
+        errors.extend(result.errors)
+        if result.content.json_content is not None:
+            docs.append(result.content.json_content)
+
+    if len(docs) == len(export_results):
+        status = ConversionStatus.SUCCESS
+    elif len(docs) > 0:
+        status = ConversionStatus.PARTIAL_SUCCESS
+    else:
+        status = ConversionStatus.FAILURE
+
+    document = ExportDocumentResponse(filename=filename)
+    if docs:
+        # The concatenation numbers the pages from 1, restore the page
+        # numbers of the original document
+        merged = DoclingDocument.concatenate(docs=docs)
+        if first_page > 1:
+            _shift_pages(merged, first_page - 1)
+        merged.name = docs[0].name
+        if docs[0].origin is not None:
+            merged.origin = DocumentOrigin(
+                mimetype=docs[0].origin.mimetype,
+                binary_hash=create_file_hash(BytesIO(content)),  # type: ignore[arg-type]
+                filename=filename,
+            )
+
+        _export_merged(document, merged, options)
+
+    succeeded = status == ConversionStatus.SUCCESS
+    return DoclingTaskResult(
+        result=ExportResult(
+            content=document,
+            status=status,
+            errors=errors,
+            timings=_merge_timings(export_results),
+        ),
+        processing_time=processing_time,
+        num_converted=1,
+        num_succeeded=1 if succeeded else 0,
+        num_failed=0 if succeeded else 1,
+    )
@@ -0,0 +1,139 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from functools import lru_cache
+from typing import Optional
+
+from docling_jobkit.orchestrators.base_orchestrator import BaseOrchestrator
+
+from docling_serve.admission import get_admission_controller
+from docling_serve.datamodel.responses import (
+    ReadinessResponse,
+    StartupEvent,
+    StartupStage,
+)
+from docling_serve.orchestrator_factory import count_workers
+
+_log = logging.getLogger(__name__)
+
+# Period of the heartbeats of the startup progress stream
+STARTUP_STREAM_HEARTBEAT = 15.0  # seconds
+
+
+class Readiness:
+    """
+    Startup progress and readiness of the instance.
+
+    The server accepts connections while the models are loaded: the startup
+    runs in the background, warming up the caches before starting the queue
+    processor. The instance is ready once the startup is completed, the
+    workers are alive and the queue has room for more tasks.
+    """
+
+    def __init__(self):
+        self.stage = StartupStage.STARTING
+        self.events: list[StartupEvent] = []
+        self.queue_task: Optional[asyncio.Task] = None
+        self._startup_task: Optional[asyncio.Task] = None
+        self._start_time = time.monotonic()
+        self._changed: Optional[asyncio.Event] = None
+
+    def _event(self, stage: StartupStage, message: str) -> StartupEvent:
+        return StartupEvent(
+            stage=stage,
+            message=message,
+            elapsed=round(time.monotonic() - self._start_time, 3),
+        )
+
+    def _advance(self, stage: StartupStage, message: str):
+        _log.info(f"Startup {stage.value}: {message}")
+        self.stage = stage
+        self.events.append(self._event(stage, message))
+        changed, self._changed = self._changed, None
+        if changed is not None:
+            changed.set()
+
+    def start(self, orchestrator: BaseOrchestrator, warm_up: bool):
+        """Run the startup in the background, resetting a previous lifespan."""
+        self.stage = StartupStage.STARTING
+        self.events = []
+        self.queue_task = None
+        self._start_time = time.monotonic()
+        self._advance(StartupStage.STARTING, "The server is starting.")
+        self._startup_task = asyncio.create_task(self._startup(orchestrator, warm_up))
+
+    async def _startup(self, orchestrator: BaseOrchestrator, warm_up: bool):
+        if warm_up:
+            self._advance(StartupStage.WARMING_UP, "Loading the models.")
+            try:
+                await orchestrator.warm_up_caches()
+            except Exception as e:
+                _log.exception("Error warming up the caches.")
+                self._advance(StartupStage.FAILED, f"Error loading the models: {e}")
+                return
+
+        self.queue_task = asyncio.create_task(orchestrator.process_queue())
+        self._advance(StartupStage.READY, "The server is ready.")
+
+    async def stop(self):
+        if self._startup_task is not None:
+            self._startup_task.cancel()
+
+        # Cancel the background queue processor on shutdown
+        if self.queue_task is not None:
+            self.queue_task.cancel()
+            try:
+                await self.queue_task
+            except asyncio.CancelledError:
+                _log.info("Queue processor cancelled.")
+
+    async def check(self, orchestrator: BaseOrchestrator) -> ReadinessResponse:
+        checks = {"startup": self.stage == StartupStage.READY}
+
+        workers = self.queue_task is not None and not self.queue_task.done()
+        if workers:
+            try:
+                await orchestrator.check_connection()
+                num_workers = await count_workers(orchestrator)
+                workers = num_workers is None or num_workers > 0
+            except Exception as e:
+                _log.warning(f"Error checking the workers: {e}")
+                workers = False
+        checks["workers"] = workers
+
+        admission = get_admission_controller()
+        checks["queue"] = admission is None or not admission.saturated(orchestrator)
+
+        return ReadinessResponse(
+            status="ready" if all(checks.values()) else "not_ready",
+            stage=self.stage,
+            checks=checks,
+        )
+
+    async def progress(self) -> AsyncIterator[StartupEvent]:
+        """
+        The startup events, from the first one until the startup completes or
+        fails. The last event is repeated while the stage does not change.
+        """
+        sent = 0
+        while True:
+            while sent < len(self.events):
+                yield self.events[sent]
+                sent += 1
+            if self.stage in (StartupStage.READY, StartupStage.FAILED):
+                return
+
+            if self._changed is None:
+                self._changed = asyncio.Event()
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait(), timeout=STARTUP_STREAM_HEARTBEAT
+                )
+            except asyncio.TimeoutError:
+                yield self._event(self.stage, self.events[-1].message)
+
+
+@lru_cache
+def get_readiness() -> Readiness:
+    return Readiness()
@@ -1,11 +1,20 @@
 import asyncio
+import io
 import logging
+import zipfile
+from pathlib import PurePosixPath
+from typing import Optional
 
-from fastapi import BackgroundTasks, Response
+from fastapi import BackgroundTasks, HTTPException, Response
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 
+from docling.datamodel.base_models import OutputFormat
+from docling_core.types.doc import DoclingDocument
 from docling_jobkit.datamodel.result import (
     ChunkedDocumentResult,
     DoclingTaskResult,
+    ExportDocumentResponse,
     ExportResult,
     RemoteTargetResult,
     ZipArchiveResult,
@@ -19,13 +28,45 @@ from docling_serve.datamodel.responses import (
     ConvertDocumentResponse,
     PresignedUrlConvertDocumentResponse,
 )
+from docling_serve.result_expiry import get_result_expiry
 from docling_serve.settings import docling_serve_settings
 
 _log = logging.getLogger(__name__)
 
+# Media types of the exports served alone
+EXPORT_MEDIA_TYPES = {
+    OutputFormat.MARKDOWN: "text/markdown; charset=utf-8",
+    OutputFormat.JSON: "application/json",
+    OutputFormat.HTML: "text/html; charset=utf-8",
+    OutputFormat.HTML_SPLIT_PAGE: "text/html; charset=utf-8",
+    OutputFormat.TEXT: "text/plain; charset=utf-8",
+    OutputFormat.DOCTAGS: "text/plain; charset=utf-8",
+}
+
+# File extensions of the exports, as written in the zip archives
+EXPORT_EXTENSIONS = {
+    OutputFormat.MARKDOWN: "md",
+    OutputFormat.JSON: "json",
+    OutputFormat.HTML: "html",
+    OutputFormat.HTML_SPLIT_PAGE: "html",
+    OutputFormat.TEXT: "txt",
+    OutputFormat.DOCTAGS: "doctags",
+}
+
+
+class ModelJSONResponse(JSONResponse):
+    """
+    JSON response of a pydantic model, serialized to bytes by the model's own
+    serializer. FastAPI would validate the model again against the response
+    model of the route and convert it to Python objects before encoding them.
+    """
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.__pydantic_serializer__.to_json(content, by_alias=True)
+
 
 async def prepare_response(
-    task_id: str,
+    task_id: Optional[str],
     task_result: DoclingTaskResult,
     orchestrator: BaseOrchestrator,
     background_tasks: BackgroundTasks,
@@ -68,15 +109,132 @@ async def prepare_response(
     else:
         raise ValueError("Unknown result type")
 
-    if docling_serve_settings.single_use_results:
+    if isinstance(response, BaseModel):
+        response = ModelJSONResponse(response)
 
-        async def _remove_task_impl():
-            await asyncio.sleep(docling_serve_settings.result_removal_delay)
-            await orchestrator.delete_task(task_id=task_id)
+    _schedule_removal(task_id, background_tasks)
 
-        async def _remove_task():
-            asyncio.create_task(_remove_task_impl())  # noqa: RUF006
+    return response
 
-        background_tasks.add_task(_remove_task)
 
-    return response
+def _schedule_removal(task_id: Optional[str], background_tasks: BackgroundTasks):
+    if docling_serve_settings.single_use_results and task_id is not None:
+        # The removal is scheduled once the response is sent
+        background_tasks.add_task(
+            get_result_expiry().schedule,
+            task_id,
+            docling_serve_settings.result_removal_delay,
+        )
+
+
+def _export_document(document: DoclingDocument, output_format: OutputFormat) -> str:
+    """Export the document in a format which was not stored with the result."""
+    if output_format == OutputFormat.JSON:
+        return document.model_dump_json()
+    if output_format == OutputFormat.MARKDOWN:
+        return document.export_to_markdown()
+    if output_format == OutputFormat.HTML:
+        return document.export_to_html()
+    if output_format == OutputFormat.HTML_SPLIT_PAGE:
+        return document.export_to_html(split_page_view=True)
+    if output_format == OutputFormat.TEXT:
+        return document.export_to_markdown(strict_text=True)
+    return document.export_to_doctags()
+
+
+def _select_document(stems: list[str], document: Optional[str]) -> str:
+    """The stem of the requested document, by file name or stem."""
+    if document is None:
+        if len(stems) == 1:
+            return stems[0]
+        raise HTTPException(
+            status_code=400,
+            detail="The task has several documents, select one of them with the "
+            f"`document` parameter: {', '.join(stems)}.",
+        )
+    for stem in (document, PurePosixPath(document).stem):
+        if stem in stems:
+            return stem
+    raise HTTPException(status_code=404, detail="Document not found in the result.")
+
+
+def _content_export(
+    content: ExportDocumentResponse,
+    output_format: OutputFormat,
+    document: Optional[str],
+) -> tuple[str, Optional[str]]:
+    stem = _select_document([PurePosixPath(content.filename).stem], document)
+    stored = {
+        OutputFormat.MARKDOWN: content.md_content,
+        OutputFormat.HTML: content.html_content,
+        OutputFormat.TEXT: content.text_content,
+        OutputFormat.DOCTAGS: content.doctags_content,
+    }.get(output_format)
+    if stored is not None:
+        return stem, stored
+    if content.json_content is not None:
+        return stem, _export_document(content.json_content, output_format)
+    return stem, None
+
+
+def _archive_export(
+    archive: bytes,
+    output_format: OutputFormat,
+    document: Optional[str],
+) -> tuple[str, Optional[str]]:
+    with zipfile.ZipFile(io.BytesIO(archive)) as zip_file:
+        # The exports are at the root, the referenced images in artifacts/
+        names = {name for name in zip_file.namelist() if "/" not in name}
+        stem = _select_document(
+            sorted({PurePosixPath(name).stem for name in names}), document
+        )
+        name = f"{stem}.{EXPORT_EXTENSIONS[output_format]}"
+        if output_format != OutputFormat.HTML_SPLIT_PAGE and name in names:
+            return stem, zip_file.read(name).decode("utf-8")
+        if f"{stem}.json" in names:
+            json_document = DoclingDocument.model_validate_json(
+                zip_file.read(f"{stem}.json")
+            )
+            return stem, _export_document(json_document, output_format)
+    return stem, None
+
+
+async def prepare_export_response(
+    task_id: str,
+    task_result: DoclingTaskResult,
+    output_format: OutputFormat,
+    document: Optional[str],
+    background_tasks: BackgroundTasks,
+) -> Response:
+    """
+    Return a single export of a document of the task result. The exports which
+    were not requested with the task are computed from its DoclingDocument,
+    when the JSON export was requested.
+    """
+    if isinstance(task_result.result, ExportResult):
+        stem, export = await asyncio.to_thread(
+            _content_export, task_result.result.content, output_format, document
+        )
+    elif isinstance(task_result.result, ZipArchiveResult):
+        stem, export = await asyncio.to_thread(
+            _archive_export, task_result.result.content, output_format, document
+        )
+    else:
+        raise HTTPException(
+            status_code=404, detail="The task result has no document exports."
+        )
+    if export is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"The {output_format.value} export is not available, "
+            "request the format or the json format with the task.",
+        )
+
+    _schedule_removal(task_id, background_tasks)
+
+    filename = f"{stem}.{EXPORT_EXTENSIONS[output_format]}"
+    return Response(
+        content=export.encode("utf-8"),
+        media_type=EXPORT_MEDIA_TYPES[output_format],
+        headers={"Content-Disposition": f'inline; filename="{filename}"'},
+    )
@@ -0,0 +1,340 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, cast
+
+import msgpack
+import redis.asyncio as redis
+from pydantic import BaseModel
+
+from docling.datamodel.base_models import ConversionStatus, DocumentStream
+from docling_jobkit.datamodel.chunking import BaseChunkerOptions, ChunkingExportOptions
+from docling_jobkit.datamodel.convert import ConvertDocumentsOptions
+from docling_jobkit.datamodel.http_inputs import FileSource
+from docling_jobkit.datamodel.result import (
+    ChunkedDocumentResult,
+    DoclingTaskResult,
+    ExportResult,
+)
+from docling_jobkit.datamodel.task import TaskSource
+from docling_jobkit.datamodel.task_meta import TaskType
+from docling_jobkit.datamodel.task_targets import InBodyTarget, TaskTarget, ZipTarget
+
+from docling_serve.helper_functions import get_docling_versions
+from docling_serve.settings import ResultCacheKind, docling_serve_settings
+from docling_serve.storage import ScratchFileSource, get_scratch
+
+_log = logging.getLogger(__name__)
+
+
+class CacheControl(BaseModel):
+    """Per-request cache directives, parsed from the Cache-Control header."""
+
+    lookup: bool = True
+    store: bool = True
+
+    @classmethod
+    def from_header(cls, header: Optional[str]) -> "CacheControl":
+        directives = {d.strip().lower() for d in (header or "").split(",") if d.strip()}
+        if "no-store" in directives:
+            return cls(lookup=False, store=False)
+        if "no-cache" in directives:
+            return cls(lookup=False, store=True)
+        return cls()
+
+
+def _source_digest(source: TaskSource) -> Optional[tuple[str, str]]:
+    if isinstance(source, ScratchFileSource):
+        return source.filename, source.sha256
+    if isinstance(source, FileSource):
+        content = base64.b64decode(source.base64_string)
+        return source.filename, hashlib.sha256(content).hexdigest()
+    if isinstance(source, DocumentStream):
+        return source.name, hashlib.sha256(source.stream.getbuffer()).hexdigest()
+    # The content behind urls and S3 coordinates can change, it is not cached
+    return None
+
+
+def make_cache_key(
+    task_type: TaskType,
+    sources: list[TaskSource],
+    convert_options: ConvertDocumentsOptions,
+    chunking_options: BaseChunkerOptions | None,
+    chunking_export_options: ChunkingExportOptions | None,
+    target: TaskTarget,
+) -> Optional[str]:
+    """
+    Compute the cache key of a task from the SHA-256 of its input documents and
+    the canonical JSON of its options. Returns None if the task is not cacheable.
+    """
+    # Remote targets have side effects, they are always executed
+    if not isinstance(target, InBodyTarget | ZipTarget):
+        return None
+
+    digests = []
+    for source in sources:
+        digest = _source_digest(source)
+        if digest is None:
+            return None
+        digests.append(list(digest))
+
+    key_data = {
+        "versions": {
+            name: get_docling_versions()[name] for name in ("docling", "docling-jobkit")
+        },
+        "task_type": task_type.value,
+        "target": target.kind,
+        "sources": digests,
+        "convert_options": convert_options.model_dump(
+            mode="json", serialize_as_any=True
+        ),
+        "chunking_options": None
+        if chunking_options is None
+        else chunking_options.model_dump(mode="json", serialize_as_any=True),
+        "chunking_export_options": None
+        if chunking_export_options is None
+        else chunking_export_options.model_dump(mode="json"),
+    }
+    serialized = json.dumps(key_data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode()).hexdigest()
+
+
+def _is_successful(task_result: DoclingTaskResult) -> bool:
+    """Whether all the documents of the result were fully converted."""
+    if task_result.num_failed > 0:
+        return False
+    if isinstance(task_result.result, ExportResult):
+        return (
+            task_result.result.status == ConversionStatus.SUCCESS
+            and not task_result.result.errors
+        )
+    if isinstance(task_result.result, ChunkedDocumentResult):
+        return all(
+            document.status == ConversionStatus.SUCCESS
+            for document in task_result.result.documents
+        )
+    return True
+
+
+def _pack_result(task_result: DoclingTaskResult) -> bytes:
+    # Same serialization used by the RQ workers for storing the results
+    from docling_jobkit.orchestrators.rq.worker import make_msgpack_safe
+
+    return msgpack.packb(make_msgpack_safe(task_result.model_dump()), use_bin_type=True)
+
+
+def _unpack_result(packed: bytes) -> DoclingTaskResult:
+    return DoclingTaskResult.model_validate(
+        msgpack.unpackb(packed, raw=False, strict_map_key=False)
+    )
+
+
+class BaseResultCache(ABC):
+    def __init__(self, kind: ResultCacheKind):
+        self.kind = kind
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.stored = 0
+
+    @abstractmethod
+    async def _get(self, key: str) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    async def _set(self, key: str, value: bytes):
+        pass
+
+    @abstractmethod
+    async def clear(self):
+        pass
+
+    async def get(
+        self, key: Optional[str], cache_control: CacheControl
+    ) -> Optional[DoclingTaskResult]:
+        if key is None:
+            return None
+        if not cache_control.lookup:
+            self.bypassed += 1
+            return None
+
+        try:
+            packed = await self._get(key)
+        except Exception as e:
+            _log.error(f"Result cache get {key}: {e}")
+            packed = None
+
+        if packed is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        # The results of large documents take a while to decode
+        return await asyncio.to_thread(_unpack_result, packed)
+
+    async def set(
+        self,
+        key: Optional[str],
+        task_result: DoclingTaskResult,
+        cache_control: CacheControl,
+    ):
+        if key is None or not cache_control.store:
+            return
+        # A transient failure is not replayed to the identical requests
+        if not _is_successful(task_result):
+            return
+
+        packed = await asyncio.to_thread(_pack_result, task_result)
+        try:
+            await self._set(key, packed)
+            self.stored += 1
+        except Exception as e:
+            _log.error(f"Result cache set {key}: {e}")
+
+
+class MemoryResultCache(BaseResultCache):
+    """In-process LRU cache, evicting the oldest entries above max_size bytes."""
+
+    def __init__(self, max_size: int):
+        super().__init__(kind=ResultCacheKind.MEMORY)
+        self.max_size = max_size
+        self.size = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    async def _set(self, key: str, value: bytes):
+        if len(value) > self.max_size:
+            return
+        if key in self._entries:
+            self.size -= len(self._entries.pop(key))
+        self._entries[key] = value
+        self.size += len(value)
+        while self.size > self.max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    async def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+
+class DiskResultCache(BaseResultCache):
+    """
+    Cache stored in the scratch directory, evicting the least recently used
+    files above max_size bytes.
+    """
+
+    def __init__(self, cache_dir: Path, max_size: int):
+        super().__init__(kind=ResultCacheKind.DISK)
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key
+
+    def _read(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            value = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        # Refresh the modification time, used for the LRU eviction
+        path.touch()
+        return value
+
+    def _write(self, key: str, value: bytes):
+        if len(value) > self.max_size:
+            return
+        with self._lock:
+            tmp_path = self._path(f"{key}.tmp")
+            tmp_path.write_bytes(value)
+            tmp_path.replace(self._path(key))
+
+            entries = [
+                e for e in os.scandir(self.cache_dir) if not e.name.endswith(".tmp")
+            ]
+            size = sum(e.stat().st_size for e in entries)
+            for entry in sorted(entries, key=lambda e: e.stat().st_mtime):
+                if size <= self.max_size:
+                    break
+                size -= entry.stat().st_size
+                Path(entry.path).unlink(missing_ok=True)
+
+    def _clear(self):
+        with self._lock:
+            for entry in os.scandir(self.cache_dir):
+                Path(entry.path).unlink(missing_ok=True)
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def _set(self, key: str, value: bytes):
+        await asyncio.to_thread(self._write, key, value)
+
+    async def clear(self):
+        # The lock may be held by a write, not to be waited on the event loop
+        await asyncio.to_thread(self._clear)
+
+
+class RedisResultCache(BaseResultCache):
+    """Cache shared by all instances using the Redis of the RQ engine."""
+
+    def __init__(self, redis_url: str, ttl: int):
+        super().__init__(kind=ResultCacheKind.REDIS)
+        self.prefix = "docling:cache:"
+        self.ttl = ttl
+        self._redis_pool = redis.ConnectionPool.from_url(
+            redis_url,
+            max_connections=10,
+            socket_timeout=2.0,
+        )
+
+    async def _get(self, key: str) -> Optional[bytes]:
+        async with redis.Redis(connection_pool=self._redis_pool) as r:
+            # Not decoded, the pool is created without decode_responses
+            return cast(Optional[bytes], await r.get(f"{self.prefix}{key}"))
+
+    async def _set(self, key: str, value: bytes):
+        async with redis.Redis(connection_pool=self._redis_pool) as r:
+            await r.set(f"{self.prefix}{key}", value, ex=self.ttl)
+
+    async def clear(self):
+        async with redis.Redis(connection_pool=self._redis_pool) as r:
+            async for key in r.scan_iter(match=f"{self.prefix}*"):
+                await r.delete(key)
+
+
+@lru_cache
+def get_result_cache() -> Optional[BaseResultCache]:
+    kind = docling_serve_settings.result_cache_kind
+    if kind == ResultCacheKind.NONE:
+        return None
+    elif kind == ResultCacheKind.MEMORY:
+        return MemoryResultCache(max_size=docling_serve_settings.result_cache_max_size)
+    elif kind == ResultCacheKind.DISK:
+        return DiskResultCache(
+            cache_dir=get_scratch() / "results_cache",
+            max_size=docling_serve_settings.result_cache_max_size,
+        )
+    elif kind == ResultCacheKind.REDIS:
+        return RedisResultCache(
+            redis_url=docling_serve_settings.eng_rq_redis_url,
+            ttl=docling_serve_settings.result_cache_ttl,
+        )
+
+    raise RuntimeError(f"Result cache {kind} not recognized.")
@@ -0,0 +1,171 @@
+import asyncio
+import contextlib
+import heapq
+import logging
+import time
+from functools import lru_cache
+from typing import Optional, cast
+
+import redis.asyncio as redis
+
+from docling_jobkit.orchestrators.base_orchestrator import BaseOrchestrator
+
+from docling_serve.settings import AsyncEngine, docling_serve_settings
+
+_log = logging.getLogger(__name__)
+
+# Number of results deleted concurrently
+DELETE_BATCH_SIZE = 100
+# Maximum delay before the new deadlines are persisted
+FLUSH_INTERVAL = 1.0  # seconds
+
+
+class RedisExpiryStore:
+    """Deadlines of the results kept in a Redis sorted set, surviving restarts."""
+
+    def __init__(self, redis_url: str):
+        self.key = "docling:expiry"
+        self._redis_pool = redis.ConnectionPool.from_url(
+            redis_url,
+            max_connections=10,
+            socket_timeout=2.0,
+        )
+
+    async def add(self, deadlines: dict[str, float]):
+        async with redis.Redis(connection_pool=self._redis_pool) as r:
+            await r.zadd(self.key, deadlines, nx=True)
+
+    async def remove(self, task_ids: list[str]):
+        async with redis.Redis(connection_pool=self._redis_pool) as r:
+            await r.zrem(self.key, *task_ids)
+
+    async def load(self) -> list[tuple[float, str]]:
+        async with redis.Redis(connection_pool=self._redis_pool) as r:
+            # The members are not decoded, the pool is created without
+            # decode_responses
+            entries = cast(
+                list[tuple[bytes, float]],
+                await r.zrange(self.key, 0, -1, withscores=True),
+            )
+        return [(deadline, task_id.decode()) for task_id, deadline in entries]
+
+
+class ResultExpiryScheduler:
+    """
+    Remove the results of the tasks a delay after they are served.
+
+    A single loop sleeps until the earliest deadline of a heap and deletes the
+    due results in batches. With a store, the deadlines are persisted so the
+    results are still removed after a restart.
+    """
+
+    def __init__(self, store: Optional[RedisExpiryStore] = None):
+        self.store = store
+        self.expired = 0
+        self._heap: list[tuple[float, str]] = []
+        self._deadlines: dict[str, float] = {}
+        self._unsaved: dict[str, float] = {}
+        self._wakeup = asyncio.Event()
+
+    @property
+    def pending(self) -> int:
+        return len(self._deadlines)
+
+    def _drop_superseded(self):
+        # Entries replaced by an earlier deadline of the same task
+        while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def next_expiry(self) -> Optional[float]:
+        """Seconds until the next deadline, None when nothing is scheduled."""
+        self._drop_superseded()
+        if not self._heap:
+            return None
+        return max(self._heap[0][0] - time.time(), 0.0)
+
+    def _push(self, task_id: str, deadline: float) -> bool:
+        # A result served several times is removed at the earliest deadline
+        if task_id in self._deadlines and self._deadlines[task_id] <= deadline:
+            return False
+        self._deadlines[task_id] = deadline
+        heapq.heappush(self._heap, (deadline, task_id))
+        if self._heap[0][1] == task_id:
+            self._wakeup.set()
+        return True
+
+    async def schedule(self, task_id: str, delay: float):
+        # A coroutine, so that the background tasks of the responses push the
+        # deadline on the event loop of the scheduler, not in the threadpool
+        deadline = time.time() + delay
+        if self._push(task_id, deadline) and self.store is not None:
+            self._unsaved[task_id] = deadline
+
+    def _pop_due(self) -> list[str]:
+        now = time.time()
+        due = []
+        self._drop_superseded()
+        while self._heap and self._heap[0][0] <= now:
+            _, task_id = heapq.heappop(self._heap)
+            del self._deadlines[task_id]
+            self._unsaved.pop(task_id, None)
+            due.append(task_id)
+            self._drop_superseded()
+        return due
+
+    async def expire_due(self, orchestrator: BaseOrchestrator) -> int:
+        """Delete the results past their deadline, returning their number."""
+        due = self._pop_due()
+        self.expired += len(due)
+        for i in range(0, len(due), DELETE_BATCH_SIZE):
+            batch = due[i : i + DELETE_BATCH_SIZE]
+            outcomes = await asyncio.gather(
+                *(orchestrator.delete_task(task_id=task_id) for task_id in batch),
+                return_exceptions=True,
+            )
+            for task_id, outcome in zip(batch, outcomes):
+                if isinstance(outcome, Exception):
+                    _log.error(
+                        f"Error removing the result of task {task_id}: {outcome}"
+                    )
+
+        if due and self.store is not None:
+            await self.store.remove(due)
+        return len(due)
+
+    async def _flush(self):
+        if self.store is not None and self._unsaved:
+            deadlines, self._unsaved = self._unsaved, {}
+            await self.store.add(deadlines)
+
+    async def run(self, orchestrator: BaseOrchestrator):
+        if self.store is not None:
+            try:
+                for deadline, task_id in await self.store.load():
+                    self._push(task_id, deadline)
+            except Exception as e:
+                _log.error(f"Error loading the result deadlines: {e}")
+
+        while True:
+            self._wakeup.clear()
+            try:
+                await self._flush()
+                await self.expire_due(orchestrator)
+            except Exception as e:
+                _log.error(f"Error removing the expired results: {e}")
+
+            # With a store, the new deadlines are persisted in batches
+            timeout = self.next_expiry()
+            if self.store is not None:
+                timeout = (
+                    FLUSH_INTERVAL if timeout is None else min(timeout, FLUSH_INTERVAL)
+                )
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+
+
+@lru_cache
+def get_result_expiry() -> ResultExpiryScheduler:
+    store = None
+    if docling_serve_settings.eng_kind == AsyncEngine.RQ:
+        store = RedisExpiryStore(redis_url=docling_serve_settings.eng_rq_redis_url)
+    return ResultExpiryScheduler(store=store)
@@ -0,0 +1,324 @@
+from collections.abc import Iterable
+from typing import Any, Optional
+
+import redis
+from rq import Queue
+from rq.exceptions import DequeueTimeout, NoSuchJobError
+from rq.job import JobStatus
+from rq.utils import as_text, backend_class
+
+from docling_jobkit.orchestrators.rq.orchestrator import RQOrchestratorConfig
+
+from docling_serve.fair_queue import current_task_share
+
+# Push a job on the list of its tenant, the tenant joining the back of the
+# round-robin ring of its priority when its list was empty.
+# KEYS: tenant list, ring, priorities, tenant index, wake-up list
+# ARGV: job id, priority, at front
+_PUSH_SCRIPT = """
+local n
+if ARGV[3] == '1' then
+    n = redis.call('lpush', KEYS[1], ARGV[1])
+else
+    n = redis.call('rpush', KEYS[1], ARGV[1])
+end
+if n == 1 then
+    redis.call('lpush', KEYS[2], KEYS[1])
+    redis.call('zadd', KEYS[3], ARGV[2], ARGV[2])
+end
+redis.call('hset', KEYS[4], ARGV[1], ARGV[2] .. ':' .. KEYS[1])
+redis.call('rpush', KEYS[5], 1)
+return n
+"""
+
+# Pop the next job: from the highest priority, the tenant at the tail of the
+# ring is served and moved to its head.
+# KEYS: priorities, tenant index, wake-up list
+# ARGV: ring prefix
+_POP_SCRIPT = """
+local priorities = redis.call('zrevrange', KEYS[1], 0, -1)
+for _, priority in ipairs(priorities) do
+    local ring = ARGV[1] .. priority
+    for _ = 1, redis.call('llen', ring) do
+        local tenant = redis.call('rpoplpush', ring, ring)
+        local job_id = redis.call('lpop', tenant)
+        if redis.call('llen', tenant) == 0 then
+            redis.call('lrem', ring, 1, tenant)
+        end
+        if job_id then
+            redis.call('hdel', KEYS[2], job_id)
+            return job_id
+        end
+    end
+    redis.call('zrem', KEYS[1], priority)
+end
+redis.call('del', KEYS[3])
+return false
+"""
+
+# Remove a queued job from the list of its tenant.
+# KEYS: tenant index
+# ARGV: job id, ring prefix
+_REMOVE_SCRIPT = """
+local entry = redis.call('hget', KEYS[1], ARGV[1])
+if not entry then
+    return 0
+end
+redis.call('hdel', KEYS[1], ARGV[1])
+local sep = string.find(entry, ':', 1, true)
+local priority = string.sub(entry, 1, sep - 1)
+local tenant = string.sub(entry, sep + 1)
+local removed = redis.call('lrem', tenant, 1, ARGV[1])
+if redis.call('llen', tenant) == 0 then
+    redis.call('lrem', ARGV[2] .. priority, 0, tenant)
+end
+return removed
+"""
+
+# Position of a job: the jobs of the higher priorities, then in each round of
+# its priority one job of each other tenant, until the rounds before its own.
+# KEYS: tenant index, priorities
+# ARGV: job id, ring prefix
+_POSITION_SCRIPT = """
+local entry = redis.call('hget', KEYS[1], ARGV[1])
+if not entry then
+    return false
+end
+local sep = string.find(entry, ':', 1, true)
+local priority = string.sub(entry, 1, sep - 1)
+local tenant = string.sub(entry, sep + 1)
+local index = redis.call('lpos', tenant, ARGV[1])
+if not index then
+    return false
+end
+local ahead = index
+for _, p in ipairs(redis.call('zrangebyscore', KEYS[2], '(' .. priority, '+inf')) do
+    for _, other in ipairs(redis.call('lrange', ARGV[2] .. p, 0, -1)) do
+        ahead = ahead + redis.call('llen', other)
+    end
+end
+local ring = redis.call('lrange', ARGV[2] .. priority, 0, -1)
+local rounds = index + 1
+for i = #ring, 1, -1 do
+    if ring[i] == tenant then
+        rounds = index
+    else
+        ahead = ahead + math.min(redis.call('llen', ring[i]), rounds)
+    end
+end
+return ahead + 1
+"""
+
+# Number of jobs queued over all the tenants.
+# KEYS: priorities
+# ARGV: ring prefix
+_COUNT_SCRIPT = """
+local count = 0
+for _, priority in ipairs(redis.call('zrange', KEYS[1], 0, -1)) do
+    for _, tenant in ipairs(redis.call('lrange', ARGV[1] .. priority, 0, -1)) do
+        count = count + redis.call('llen', tenant)
+    end
+end
+return count
+"""
+
+
+class FairShareRQQueue(Queue):
+    """
+    RQ queue with one Redis list per tenant and priority, dispatching the jobs
+    round-robin over the tenants of the highest priority with queued jobs.
+
+    The jobs are pushed on the list of the share in `current_task_share`, and
+    a worker using this queue class pops the next job with a script, each
+    operation costs O(number of tenants) instead of O(queue length). Unlike the
+    local fair queue, each tenant gets one job per round, whatever its cost.
+
+    The jobs pushed on the plain RQ list, e.g. retried by the RQ registries or
+    enqueued by an instance without fair share, are taken once the tenant
+    lists are empty. The stock RQ workers only read the plain list, they never
+    take the jobs of the tenant lists.
+
+    The scripts access the keys of the rings and tenant lists which are not
+    declared in KEYS, so the queue does not run on Redis Cluster.
+    """
+
+    @property
+    def fair_key(self) -> str:
+        return f"{self.key}:fair"
+
+    @property
+    def priorities_key(self) -> str:
+        return f"{self.fair_key}:priorities"
+
+    @property
+    def ring_prefix(self) -> str:
+        return f"{self.fair_key}:ring:"
+
+    @property
+    def tenant_index_key(self) -> str:
+        return f"{self.fair_key}:tenant_of"
+
+    @property
+    def wakeup_key(self) -> str:
+        return f"{self.fair_key}:wakeup"
+
+    def _run(self, source: str, keys: list, args: list, pipeline: Any = None):
+        script = self.connection.register_script(source)
+        return script(keys=keys, args=args, client=pipeline or self.connection)
+
+    def push_job_id(
+        self, job_id: str, pipeline: Optional[Any] = None, at_front: bool = False
+    ):
+        share = current_task_share.get()
+        self._run(
+            _PUSH_SCRIPT,
+            keys=[
+                f"{self.fair_key}:tenant:{share.priority}:{share.tenant}",
+                f"{self.ring_prefix}{share.priority}",
+                self.priorities_key,
+                self.tenant_index_key,
+                self.wakeup_key,
+            ],
+            args=[job_id, share.priority, int(at_front)],
+            pipeline=pipeline,
+        )
+
+    def pop_job_id(self) -> Optional[str]:
+        """Pop the next job of the tenants, or of the plain RQ list."""
+        job_id = self._run(
+            _POP_SCRIPT,
+            keys=[self.priorities_key, self.tenant_index_key, self.wakeup_key],
+            args=[self.ring_prefix],
+        )
+        if job_id is None:
+            job_id = self.connection.lpop(self.key)
+        return as_text(job_id) if job_id is not None else None
+
+    def remove(self, job_or_id: Any, pipeline: Optional[Any] = None):
+        job_id = job_or_id if isinstance(job_or_id, str) else job_or_id.id
+        self._run(
+            _REMOVE_SCRIPT,
+            keys=[self.tenant_index_key],
+            args=[job_id, self.ring_prefix],
+            pipeline=pipeline,
+        )
+        return super().remove(job_id, pipeline=pipeline)
+
+    @property
+    def count(self) -> int:
+        fair_count = self._run(
+            _COUNT_SCRIPT, keys=[self.priorities_key], args=[self.ring_prefix]
+        )
+        return int(fair_count) + self.connection.llen(self.key)
+
+    def get_job_position(self, job_or_id: Any) -> Optional[int]:
+        """The 0-based position of the job in the dispatch order, if queued."""
+        job_id = job_or_id if isinstance(job_or_id, str) else job_or_id.id
+        return self.get_job_positions([job_id])[job_id]
+
+    def get_job_positions(self, job_ids: list[str]) -> dict[str, Optional[int]]:
+        """The positions of several jobs, in one round trip."""
+        with self.connection.pipeline(transaction=False) as pipe:
+            for job_id in job_ids:
+                self._run(
+                    _POSITION_SCRIPT,
+                    keys=[self.tenant_index_key, self.priorities_key],
+                    args=[job_id, self.ring_prefix],
+                    pipeline=pipe,
+                )
+            results = pipe.execute()
+
+        positions: dict[str, Optional[int]] = {}
+        for job_id, position in zip(job_ids, results):
+            if position is not None:
+                positions[job_id] = int(position) - 1
+                continue
+            # The jobs of the plain RQ list are taken after the tenant lists
+            index: Any = self.connection.lpos(self.key, job_id)
+            positions[job_id] = (
+                None
+                if index is None
+                else self.count - self.connection.llen(self.key) + int(index)
+            )
+        return positions
+
+    def get_job_ids(self, offset: int = 0, length: int = -1) -> list[str]:
+        """The ids of the queued jobs, in dispatch order. Reads the whole queue."""
+        job_ids: list[str] = []
+        priorities: Any = self.connection.zrevrange(self.priorities_key, 0, -1)
+        for priority in priorities:
+            ring = self.connection.lrange(
+                f"{self.ring_prefix}{as_text(priority)}", 0, -1
+            )
+            # The tenant at the tail of the ring is served first
+            lists = [
+                [as_text(job_id) for job_id in self.connection.lrange(tenant, 0, -1)]
+                for tenant in reversed(ring)
+            ]
+            for round_index in range(max(map(len, lists), default=0)):
+                job_ids.extend(
+                    ids[round_index] for ids in lists if round_index < len(ids)
+                )
+        job_ids.extend(super().get_job_ids())
+        end = None if length < 0 else offset + length
+        return job_ids[offset:end]
+
+    @classmethod
+    def dequeue_any(  # type: ignore[override]
+        cls,
+        queues: Iterable[Queue],
+        timeout: Optional[int],
+        connection: redis.Redis,
+        job_class: Optional[Any] = None,
+        serializer: Optional[Any] = None,
+        death_penalty_class: Optional[Any] = None,
+    ):
+        """
+        Take the next job of the queues, in order, blocking up to `timeout`
+        seconds for a push when they are all empty.
+        """
+        job_cls: Any = backend_class(cls, "job_class", override=job_class)
+        fair_queues: list[FairShareRQQueue] = list(queues)  # type: ignore[arg-type]
+        queue_by_key = {queue.key: queue for queue in fair_queues}
+
+        def fetch(job_id: str) -> Optional[Any]:
+            try:
+                job = job_cls.fetch(
+                    job_id, connection=connection, serializer=serializer
+                )
+            except NoSuchJobError:
+                return None
+            # The cancelled jobs may still be on the list of their tenant
+            if job.get_status(refresh=False) == JobStatus.CANCELED:
+                return None
+            return job
+
+        while True:
+            for queue in fair_queues:
+                while (job_id := queue.pop_job_id()) is not None:
+                    if (job := fetch(job_id)) is not None:
+                        return job, queue
+
+            if timeout is None:
+                return None
+            # Woken up by the next push on any of the queues. The wake-up
+            # entries only unblock the workers, the next job is popped above.
+            keys = [queue.wakeup_key for queue in fair_queues] + list(queue_by_key)
+            result = connection.blpop(keys, timeout)
+            if result is None:
+                raise DequeueTimeout(timeout, keys)
+            key, value = map(as_text, result)
+            if key in queue_by_key and (job := fetch(value)) is not None:
+                return job, queue_by_key[key]
+
+
+def make_fair_rq_queue(config: RQOrchestratorConfig) -> tuple[redis.Redis, Queue]:
+    """The connection and queue of RQOrchestrator.make_rq_queue(), fair shared."""
+    conn = redis.from_url(config.redis_url)
+    rq_queue = FairShareRQQueue(
+        "convert",
+        connection=conn,
+        default_timeout=14400,
+        result_ttl=config.results_ttl,
+    )
+    return conn, rq_queue
@@ -0,0 +1,101 @@
+import json
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+from docling_jobkit.convert.manager import DoclingConverterManagerConfig
+from docling_jobkit.orchestrators.rq.orchestrator import RQOrchestratorConfig
+from docling_jobkit.orchestrators.rq.worker import CustomRQWorker
+
+from docling_serve.cancellation import (
+    CANCEL_POLL_INTERVAL,
+    cancel_key,
+    current_cancel_event,
+)
+from docling_serve.model_pool import PooledConverterManager, get_model_pool
+from docling_serve.orchestrator_factory import MODEL_POOL_STATS_KEY
+from docling_serve.rq_fair_queue import FairShareRQQueue, make_fair_rq_queue
+
+_log = logging.getLogger(__name__)
+
+
+class CancellableRQWorker(CustomRQWorker):
+    """
+    RQ worker stopping the jobs cancelled by the API, its converters share
+    their models through the model pool. The jobs are taken from the tenant
+    lists of the FairShareRQQueue, round-robin.
+
+    While a job runs, a thread watches its cancellation key in Redis and sets
+    the cancel event checked by the conversion at the page boundaries. The
+    stats of the model pool are saved in Redis after each job, for the API.
+    """
+
+    queue_class = FairShareRQQueue
+
+    def __init__(self, *args, cm_config: DoclingConverterManagerConfig, **kwargs):
+        super().__init__(*args, cm_config=cm_config, **kwargs)
+        self.conversion_manager = PooledConverterManager(cm_config)
+
+    def save_model_pool_stats(self):
+        try:
+            self.connection.hset(
+                MODEL_POOL_STATS_KEY, self.name, json.dumps(get_model_pool().stats())
+            )
+        except Exception as e:
+            _log.error(f"Error saving the model pool stats: {e}")
+
+    def register_death(self):
+        self.connection.hdel(MODEL_POOL_STATS_KEY, self.name)
+        super().register_death()
+
+    def _watch_cancel(
+        self, job_id: str, cancel_event: threading.Event, done: threading.Event
+    ):
+        key = cancel_key(job_id)
+        while True:
+            try:
+                if self.connection.exists(key):
+                    _log.info(f"Job {job_id} was cancelled.")
+                    cancel_event.set()
+                    return
+            except Exception as e:
+                _log.error(f"Error checking the cancellation of job {job_id}: {e}")
+            if done.wait(CANCEL_POLL_INTERVAL):
+                return
+
+    def perform_job(self, job, queue):
+        cancel_event = threading.Event()
+        done = threading.Event()
+        watcher = threading.Thread(
+            target=self._watch_cancel,
+            args=(job.id, cancel_event, done),
+            daemon=True,
+        )
+        watcher.start()
+        token = current_cancel_event.set(cancel_event)
+        try:
+            return super().perform_job(job, queue)
+        finally:
+            current_cancel_event.reset(token)
+            done.set()
+            self.save_model_pool_stats()
+
+
+def run_worker(
+    rq_config: Optional[RQOrchestratorConfig] = None,
+    cm_config: Optional[DoclingConverterManagerConfig] = None,
+):
+    rq_config = rq_config or RQOrchestratorConfig()
+    scratch_dir = rq_config.scratch_dir or Path(tempfile.mkdtemp(prefix="docling_"))
+    redis_conn, rq_queue = make_fair_rq_queue(rq_config)
+    cm_config = cm_config or DoclingConverterManagerConfig()
+    worker = CancellableRQWorker(
+        [rq_queue],
+        connection=redis_conn,
+        orchestrator_config=rq_config,
+        cm_config=cm_config,
+        scratch_dir=scratch_dir,
+    )
+    worker.work()
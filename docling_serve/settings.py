@@ -31,6 +31,13 @@ class AsyncEngine(str, enum.Enum):
     RQ = "rq"
 
 
+class ResultCacheKind(str, enum.Enum):
+    NONE = "none"
+    MEMORY = "memory"
+    DISK = "disk"
+    REDIS = "redis"
+
+
 class DoclingServeSettings(BaseSettings):
     model_config = SettingsConfigDict(
         env_prefix="DOCLING_SERVE_",
@@ -48,15 +55,18 @@ class DoclingServeSettings(BaseSettings):
     result_removal_delay: float = 300  # 5 minutes
     load_models_at_boot: bool = True
     options_cache_size: int = 2
+    model_pool_size: int = 8
     enable_remote_services: bool = False
     allow_external_plugins: bool = False
     show_version_info: bool = True
+    enable_metrics: bool = False
 
     api_key: str = ""
 
     max_document_timeout: float = 3_600 * 24 * 7  # 7 days
     max_num_pages: int = sys.maxsize
     max_file_size: int = sys.maxsize
+    upload_chunk_size: int = 1024 * 1024  # 1 MiB
 
     # Threading pipeline
     queue_max_size: Optional[int] = None
@@ -65,8 +75,19 @@ class DoclingServeSettings(BaseSettings):
     table_batch_size: Optional[int] = None
     batch_polling_interval_seconds: Optional[float] = None
 
+    result_cache_kind: ResultCacheKind = ResultCacheKind.NONE
+    result_cache_max_size: int = 512 * 1024 * 1024  # 512 MiB
+    result_cache_ttl: int = 3_600 * 24  # 1 day
+
     sync_poll_interval: int = 2  # seconds
     max_sync_wait: int = 120  # 2 minutes
+    max_queued_tasks: Optional[int] = None
+    max_queued_bytes: Optional[int] = None
+    max_inflight_pages: Optional[int] = None
+    ws_send_queue_size: int = 16
+    fair_share: bool = True
+    tenant_header: str = "X-Tenant-Id"
+    max_priority: int = 0
 
     cors_origins: list[str] = ["*"]
     cors_methods: list[str] = ["*"]
@@ -80,6 +101,7 @@ class DoclingServeSettings(BaseSettings):
     eng_rq_redis_url: str = ""
     eng_rq_results_prefix: str = "docling:results"
     eng_rq_sub_channel: str = "docling:updates"
+    eng_rq_status_cache_ttl: float = 0.25  # seconds
     # KFP engine
     eng_kfp_endpoint: Optional[AnyUrl] = None
     eng_kfp_token: Optional[str] = None
@@ -107,6 +129,10 @@ class DoclingServeSettings(BaseSettings):
             if not self.eng_rq_redis_url:
                 raise ValueError("RQ Redis url is required when using the RQ engine.")
 
+        if self.result_cache_kind == ResultCacheKind.REDIS:
+            if self.eng_kind != AsyncEngine.RQ:
+                raise ValueError("The redis result cache requires the RQ engine.")
+
         return self
 
 
@@ -1,6 +1,13 @@
+import hashlib
 import tempfile
+import uuid
 from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
+from typing import BinaryIO
+
+from docling.datamodel.base_models import DocumentStream
+from docling_jobkit.datamodel.http_inputs import FileSource
 
 from docling_serve.settings import docling_serve_settings
 
@@ -14,3 +21,53 @@ def get_scratch() -> Path:
     )
     scratch_dir.mkdir(exist_ok=True, parents=True)
     return scratch_dir
+
+
+def get_uploads_dir() -> Path:
+    uploads_dir = get_scratch() / "uploads"
+    uploads_dir.mkdir(exist_ok=True, parents=True)
+    return uploads_dir
+
+
+def spool_upload(stream: BinaryIO, chunk_size: int | None = None) -> tuple[Path, str]:
+    """
+    Copy an uploaded stream to a file in the scratch directory, reading at most
+    `chunk_size` bytes at a time.
+
+    Returns the path of the spooled file and the SHA-256 digest of its content.
+    """
+    chunk_size = chunk_size or docling_serve_settings.upload_chunk_size
+    spool_path = get_uploads_dir() / uuid.uuid4().hex
+    digest = hashlib.sha256()
+    try:
+        with spool_path.open("wb") as fw:
+            while chunk := stream.read(chunk_size):
+                digest.update(chunk)
+                fw.write(chunk)
+    except BaseException:
+        spool_path.unlink(missing_ok=True)
+        raise
+    return spool_path, digest.hexdigest()
+
+
+class ScratchFileSource(FileSource):
+    """
+    File source spooled to the scratch directory.
+
+    The content is loaded only when the worker builds the DocumentStream, so
+    queued tasks keep a file reference instead of the document bytes.
+    """
+
+    base64_string: str = ""
+    path: Path
+    sha256: str
+
+    def to_document_stream(self) -> DocumentStream:
+        try:
+            buf = BytesIO(self.path.read_bytes())
+        finally:
+            self.path.unlink(missing_ok=True)
+        return DocumentStream(stream=buf, name=self.filename)
+
+    def discard(self):
+        self.path.unlink(missing_ok=True)
@@ -1,4 +1,9 @@
-from fastapi import WebSocket
+import asyncio
+import contextlib
+import logging
+from typing import Optional
+
+from fastapi import WebSocket, status
 
 from docling_jobkit.datamodel.task_meta import TaskStatus
 from docling_jobkit.orchestrators.base_notifier import BaseNotifier
@@ -9,27 +14,161 @@ from docling_serve.datamodel.responses import (
     TaskStatusResponse,
     WebsocketMessage,
 )
+from docling_serve.fair_queue import FairShareOrder, FairShareQueue
+from docling_serve.metrics import get_metrics
+from docling_serve.settings import docling_serve_settings
+
+_log = logging.getLogger(__name__)
+
+# Time allowed for closing the websocket of an evicted subscriber
+CLOSE_TIMEOUT = 5.0  # seconds
+
+
+class WebsocketSubscriber:
+    """
+    Send the messages to a websocket from a dedicated task, so a slow client
+    does not delay the other subscribers. A client letting its bounded queue
+    of messages fill up is evicted.
+    """
+
+    def __init__(self, websocket: WebSocket, max_queue_size: int):
+        self.websocket = websocket
+        self.evicted = False
+        self._queue: asyncio.Queue[Optional[str]] = asyncio.Queue(
+            maxsize=max_queue_size
+        )
+        self._sender = asyncio.create_task(self._send_loop())
+        self._closer: Optional[asyncio.Task] = None
+
+    async def _send_loop(self):
+        try:
+            while True:
+                text = await self._queue.get()
+                if text is None:
+                    await self.websocket.close()
+                    return
+                await self.websocket.send_text(text)
+        except Exception as e:
+            # The client is gone, the endpoint will unsubscribe it
+            _log.debug(f"Error sending to websocket: {e}")
+
+    def _put(self, text: Optional[str]):
+        if self._sender.done():
+            return
+        try:
+            self._queue.put_nowait(text)
+        except asyncio.QueueFull:
+            self.evict()
+
+    def send(self, text: str):
+        """Queue a message, without waiting for the client to receive it."""
+        self._put(text)
+
+    def close(self):
+        """Close the websocket after sending the queued messages."""
+        self._put(None)
+
+    def evict(self):
+        if self.evicted:
+            return
+        _log.warning("Disconnecting a websocket client which is not keeping up.")
+        self.evicted = True
+        self._sender.cancel()
+        self._closer = asyncio.create_task(self._close_evicted())
+
+    async def _close_evicted(self):
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(
+                self.websocket.close(code=status.WS_1013_TRY_AGAIN_LATER),
+                timeout=CLOSE_TIMEOUT,
+            )
+
+    def cancel(self):
+        """Stop sending, when the client is gone."""
+        self._sender.cancel()
 
 
 class WebsocketNotifier(BaseNotifier):
     def __init__(self, orchestrator: BaseOrchestrator):
         super().__init__(orchestrator)
-        self.task_subscribers: dict[str, set[WebSocket]] = {}
+        self.task_subscribers: dict[str, set[WebsocketSubscriber]] = {}
+        # Tasks with at least one subscriber, the only ones sent queue positions
+        self._watched: set[str] = set()
+        self.task_completed: dict[str, asyncio.Event] = {}
+        # Tasks with a notification in progress, and the ones updated meanwhile
+        self._notifying: set[str] = set()
+        self._notify_again: set[str] = set()
+        # The last queue positions sent to the subscribers of each task
+        self._sent_positions: dict[str, Optional[int]] = {}
+
+    def _queue_order(self) -> Optional[FairShareOrder]:
+        # The fair share queue of the local engine knows the effective order
+        task_queue = getattr(self.orchestrator, "task_queue", None)
+        return task_queue.order if isinstance(task_queue, FairShareQueue) else None
 
     async def add_task(self, task_id: str):
         self.task_subscribers[task_id] = set()
+        self.task_completed[task_id] = asyncio.Event()
 
     async def remove_task(self, task_id: str):
+        self._watched.discard(task_id)
+        self._sent_positions.pop(task_id, None)
         if task_id in self.task_subscribers:
-            for websocket in self.task_subscribers[task_id]:
-                await websocket.close()
+            for subscriber in self.task_subscribers[task_id]:
+                subscriber.close()
 
             del self.task_subscribers[task_id]
 
+        # Release the waiters, they will find out that the task is gone
+        if task_id in self.task_completed:
+            self.task_completed.pop(task_id).set()
+
+    def subscribe(self, task_id: str, websocket: WebSocket) -> WebsocketSubscriber:
+        subscriber = WebsocketSubscriber(
+            websocket, max_queue_size=docling_serve_settings.ws_send_queue_size
+        )
+        self.task_subscribers[task_id].add(subscriber)
+        self._watched.add(task_id)
+        return subscriber
+
+    def unsubscribe(self, task_id: str, subscriber: WebsocketSubscriber):
+        subscriber.cancel()
+        if task_id in self.task_subscribers:
+            self._discard_subscriber(task_id, subscriber)
+
+    def _discard_subscriber(self, task_id: str, subscriber: WebsocketSubscriber):
+        subscribers = self.task_subscribers[task_id]
+        subscribers.discard(subscriber)
+        if not subscribers:
+            self._watched.discard(task_id)
+
+    async def wait_task_completed(self, task_id: str, timeout: float):
+        """Wait until the task is notified as completed, or the timeout expires."""
+        event = self.task_completed[task_id]
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+
     async def notify_task_subscribers(self, task_id: str):
         if task_id not in self.task_subscribers:
             raise RuntimeError(f"Task {task_id} does not have a subscribers list.")
 
+        # Updates arriving while the status is fetched are coalesced in one
+        # more round, instead of a lookup each
+        if task_id in self._notifying:
+            self._notify_again.add(task_id)
+            return
+
+        self._notifying.add(task_id)
+        try:
+            while True:
+                self._notify_again.discard(task_id)
+                await self._broadcast_status(task_id)
+                if task_id not in self._notify_again:
+                    break
+        finally:
+            self._notifying.discard(task_id)
+
+    async def _broadcast_status(self, task_id: str):
         try:
             # Get task status from Redis or RQ directly instead of in-memory registry
             task = await self.orchestrator.task_status(task_id=task_id)
@@ -41,36 +180,91 @@ class WebsocketNotifier(BaseNotifier):
                 task_position=task_queue_position,
                 task_meta=task.processing_meta,
             )
-            for websocket in self.task_subscribers[task_id]:
-                await websocket.send_text(
-                    WebsocketMessage(
-                        message=MessageKind.UPDATE, task=msg
-                    ).model_dump_json()
-                )
+            self._sent_positions[task_id] = task_queue_position
+            if task.is_completed() and task_id in self.task_completed:
+                completed = self.task_completed[task_id]
+                metrics = get_metrics()
+                if metrics is not None and not completed.is_set():
+                    metrics.observe_task(task)
+                completed.set()
+
+            # The message is serialized once and queued to all the subscribers
+            text = WebsocketMessage(
+                message=MessageKind.UPDATE, task=msg
+            ).model_dump_json()
+            for subscriber in list(self.task_subscribers.get(task_id, ())):
+                if subscriber.evicted:
+                    self._discard_subscriber(task_id, subscriber)
+                    continue
+                subscriber.send(text)
                 if task.is_completed():
-                    await websocket.close()
+                    subscriber.close()
         except Exception as e:
             # Log the error but don't crash the notifier
-            import logging
-
-            _log = logging.getLogger(__name__)
             _log.error(f"Error notifying subscribers for task {task_id}: {e}")
 
     async def notify_queue_positions(self):
-        """Notify all subscribers of pending tasks about queue position updates."""
-        for task_id in self.task_subscribers.keys():
-            try:
-                # Check task status directly from Redis or RQ
-                task = await self.orchestrator.task_status(task_id)
+        """
+        Notify the subscribers of the pending tasks whose queue position changed.
 
-                # Notify only pending tasks
-                if task.task_status == TaskStatus.PENDING:
-                    await self.notify_task_subscribers(task_id)
-            except Exception as e:
-                # Log the error but don't crash the notifier
-                import logging
+        Only the tasks with subscribers are looked at, and their positions are
+        computed without looking up the status of each task, so the cost is
+        proportional to the watched tasks rather than to the size of the queue.
+        """
+        watched = [
+            task_id
+            for task_id in self._watched
+            if (task := self.orchestrator.tasks.get(task_id)) is not None
+            and task.task_status == TaskStatus.PENDING
+        ]
+        if not watched:
+            return
 
-                _log = logging.getLogger(__name__)
-                _log.error(
-                    f"Error checking task {task_id} status for queue position notification: {e}"
+        # The fair share queue of the local engine gives the positions, the
+        # RQ queue is shared with other instances and gives the positions of
+        # the watched tasks in one round trip, the other engines are asked for
+        # each watched task.
+        positions: dict[str, Optional[int]]
+        queue_order = self._queue_order()
+        get_queue_positions = getattr(self.orchestrator, "get_queue_positions", None)
+        if queue_order is not None:
+            positions = {task_id: queue_order.position(task_id) for task_id in watched}
+        elif get_queue_positions is not None:
+            try:
+                positions = await get_queue_positions(watched)
+            except Exception as e:
+                _log.error(f"Error getting the queue positions: {e}")
+                return
+        else:
+            try:
+                results = await asyncio.gather(
+                    *(
+                        self.orchestrator.get_queue_position(task_id)
+                        for task_id in watched
+                    )
                 )
+            except Exception as e:
+                _log.error(f"Error getting the queue positions: {e}")
+                return
+            positions = dict(zip(watched, results))
+
+        for task_id, position in positions.items():
+            if position is None or position == self._sent_positions.get(task_id):
+                continue
+            task = self.orchestrator.tasks.get(task_id)
+            if task is None:
+                continue
+
+            self._sent_positions[task_id] = position
+            msg = TaskStatusResponse(
+                task_id=task.task_id,
+                task_type=task.task_type,
+                task_status=task.task_status,
+                task_position=position,
+                task_meta=task.processing_meta,
+            )
+            text = WebsocketMessage(
+                message=MessageKind.UPDATE, task=msg
+            ).model_dump_json()
+            for subscriber in self.task_subscribers.get(task_id, ()):
+                subscriber.send(text)
@@ -0,0 +1,168 @@
+import asyncio
+import base64
+import time
+from io import BytesIO
+
+import pypdfium2 as pdfium
+import pytest
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from docling.datamodel.base_models import DocumentStream
+from docling_jobkit.datamodel.http_inputs import FileSource, HttpSource
+from docling_jobkit.datamodel.task import Task
+from docling_jobkit.datamodel.task_meta import TaskStatus, TaskType
+
+from docling_serve.admission import (
+    DEFAULT_RETRY_AFTER,
+    AdmissionController,
+    AdmissionRejectedError,
+    TaskCost,
+    get_admission_controller,
+    measure_task_cost,
+)
+from docling_serve.app import create_app
+from docling_serve.settings import docling_serve_settings
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    return asyncio.get_event_loop()
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    headers = {}
+    if docling_serve_settings.api_key:
+        headers["X-Api-Key"] = docling_serve_settings.api_key
+    return headers
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app():
+    app = create_app()
+
+    async with LifespanManager(app) as manager:
+        print("Launching lifespan of app.")
+        yield manager.app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://app.io"
+    ) as client:
+        print("Client is ready")
+        yield client
+
+
+class FakeOrchestrator:
+    def __init__(self):
+        self.tasks: dict[str, Task] = {}
+
+    def enqueue(self, task_id: str):
+        self.tasks[task_id] = Task(
+            task_id=task_id, task_type=TaskType.CONVERT, task_status=TaskStatus.PENDING
+        )
+
+
+def make_pdf(num_pages: int) -> bytes:
+    pdf = pdfium.PdfDocument.new()
+    for _ in range(num_pages):
+        pdf.new_page(200, 200)
+    buf = BytesIO()
+    pdf.save(buf)
+    pdf.close()
+    return buf.getvalue()
+
+
+def admit(admission: AdmissionController, orchestrator: FakeOrchestrator, task_id: str):
+    ticket = admission.admit(orchestrator, TaskCost(num_bytes=100, num_pages=10))  # type: ignore[arg-type]
+    orchestrator.enqueue(task_id)
+    admission.bind(ticket, task_id)
+
+
+def test_admission_limits():
+    orchestrator = FakeOrchestrator()
+    admission = AdmissionController(max_queued_tasks=5, max_inflight_pages=80)
+    for i in range(5):
+        admit(admission, orchestrator, f"task-{i}")
+
+    # Nothing completed yet to estimate the throughput
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        admit(admission, orchestrator, "task-5")
+    assert exc_info.value.retry_after == DEFAULT_RETRY_AFTER
+
+    # The started tasks leave the queue, but their pages are still in progress
+    for i in range(4):
+        orchestrator.tasks[f"task-{i}"].set_status(TaskStatus.STARTED)
+    for i in range(5, 8):
+        admit(admission, orchestrator, f"task-{i}")
+    with pytest.raises(AdmissionRejectedError, match="Too many pages"):
+        admit(admission, orchestrator, "task-8")
+
+    # 4 completions in 10 seconds, one more task must start for the next one
+    admission._start_time = time.time() - 10
+    for i in range(3):
+        orchestrator.tasks[f"task-{i}"].set_status(TaskStatus.SUCCESS)
+    orchestrator.tasks.pop("task-3")
+    admit(admission, orchestrator, "task-8")
+    with pytest.raises(AdmissionRejectedError, match="The queue is full") as exc_info:
+        admit(admission, orchestrator, "task-9")
+    assert exc_info.value.retry_after == 3
+    assert admission.rejected == 3
+
+
+def test_admission_large_task():
+    """A task larger than the limit is admitted when the queue is empty."""
+
+    orchestrator = FakeOrchestrator()
+    admission = AdmissionController(max_queued_bytes=1000)
+    cost = TaskCost(num_bytes=5000, num_pages=1)
+    ticket = admission.admit(orchestrator, cost)  # type: ignore[arg-type]
+    with pytest.raises(AdmissionRejectedError):
+        admission.admit(orchestrator, TaskCost(num_bytes=1))  # type: ignore[arg-type]
+
+    admission.cancel(ticket)
+    admission.admit(orchestrator, TaskCost(num_bytes=1))  # type: ignore[arg-type]
+
+
+def test_measure_task_cost():
+    content = make_pdf(12)
+    sources = [
+        DocumentStream(name="doc.pdf", stream=BytesIO(content)),
+        FileSource(filename="doc.pdf", base64_string=base64.b64encode(content)),
+        FileSource(filename="doc.md", base64_string=base64.b64encode(b"# Doc")),
+        HttpSource(url="https://example.com/doc.pdf"),
+    ]
+    cost = measure_task_cost(sources, page_range=(3, 100), count_pages=True)  # type: ignore[arg-type]
+    assert cost.num_pages == 10 + 10 + 1 + 1
+    assert cost.num_bytes >= 2 * len(content)
+
+    cost = measure_task_cost(sources, page_range=(1, 100), count_pages=False)  # type: ignore[arg-type]
+    assert cost.num_pages == 4
+    assert cost.num_bytes >= 2 * len(content)
+
+    # The pages of the files not opened are estimated from their size
+    large = DocumentStream(name="doc.pdf", stream=BytesIO(bytes(1024 * 1024)))
+    cost = measure_task_cost([large], page_range=(1, 100), count_pages=False)  # type: ignore[arg-type]
+    assert cost.num_pages == 10
+
+
+@pytest.mark.asyncio
+async def test_admission_rejected(client: AsyncClient, auth_headers: dict, monkeypatch):
+    monkeypatch.setattr(docling_serve_settings, "max_queued_tasks", 0)
+    get_admission_controller.cache_clear()
+
+    try:
+        response = await client.post(
+            "/v1/convert/source/async",
+            json={"sources": [{"kind": "http", "url": "https://example.com/doc.pdf"}]},
+            headers=auth_headers,
+        )
+    finally:
+        get_admission_controller.cache_clear()
+
+    assert response.status_code == 429, response.text
+    assert response.headers["Retry-After"] == str(DEFAULT_RETRY_AFTER)
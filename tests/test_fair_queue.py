@@ -0,0 +1,290 @@
+import asyncio
+import base64
+import heapq
+import io
+
+import pypdfium2 as pdfium
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from docling_jobkit.datamodel.http_inputs import HttpSource
+from docling_jobkit.datamodel.task import Task
+from docling_jobkit.datamodel.task_targets import InBodyTarget
+
+from docling_serve.fair_queue import (
+    FairShareOrder,
+    FairShareQueue,
+    TaskShare,
+    current_task_share,
+)
+
+
+def test_fair_share_order():
+    order = FairShareOrder()
+    for i in range(100):
+        order.push(f"bulk-{i}", TaskShare(tenant="bulk"))
+    order.push("small-0", TaskShare(tenant="small"))
+    order.push("urgent-0", TaskShare(tenant="bulk", priority=5))
+
+    # The priority goes first, the other tenant is not queued behind the bulk
+    assert order.first() == "urgent-0"
+    assert order.position("small-0") == 3
+    assert order.successor("small-0") == "bulk-1"
+    assert order.position("bulk-99") == 102
+
+    assert order.pop() == "urgent-0"
+    order.discard("bulk-0", dispatched=True)
+    assert order.position("small-0") == 1
+
+    order.retain([f"bulk-{i}" for i in range(50, 100)])
+    assert len(order) == 50
+    assert "small-0" not in order
+    assert order.task_ids() == [f"bulk-{i}" for i in range(50, 100)]
+
+
+def simulate(
+    use_fair_share: bool, num_workers: int = 2
+) -> tuple[list[float], list[float]]:
+    """
+    Simulate the workers processing a bulk submission of 2000 single-page
+    tasks, while a second tenant submits a small task every 5 time units.
+
+    Returns the waiting times of the small and of the bulk tasks.
+    """
+    arrivals = [(0.0, f"bulk-{i}", "bulk") for i in range(2000)]
+    arrivals += [(5.0 * i + 0.5, f"small-{i}", "small") for i in range(100)]
+    arrivals.sort()
+
+    order = FairShareOrder()
+    fifo: list[str] = []
+    arrival_time: dict[str, float] = {}
+    waits: dict[str, list[float]] = {"bulk": [], "small": []}
+    workers_free = [0.0] * num_workers
+    next_arrival = 0
+    now = 0.0
+
+    while next_arrival < len(arrivals) or len(order) or fifo:
+        # Enqueue the tasks arrived before the next free worker
+        now = min(workers_free)
+        while next_arrival < len(arrivals) and (
+            arrivals[next_arrival][0] <= now or not (len(order) or fifo)
+        ):
+            at, task_id, tenant = arrivals[next_arrival]
+            now = max(now, at)
+            arrival_time[task_id] = at
+            if use_fair_share:
+                order.push(task_id, TaskShare(tenant=tenant))
+            else:
+                fifo.append(task_id)
+            next_arrival += 1
+
+        task_id = order.pop() if use_fair_share else fifo.pop(0)
+        start = max(heapq.heappop(workers_free), arrival_time[task_id])
+        waits[task_id.split("-")[0]].append(start - arrival_time[task_id])
+        heapq.heappush(workers_free, start + 1.0)
+
+    return waits["small"], waits["bulk"]
+
+
+def test_small_jobs_latency_under_bulk_load():
+    """Small jobs wait about one task, instead of the whole bulk submission."""
+
+    small_waits, bulk_waits = simulate(use_fair_share=True)
+    fifo_small_waits, fifo_bulk_waits = simulate(use_fair_share=False)
+    assert max(small_waits) <= 1.0
+    assert max(fifo_small_waits) >= 900
+    # The bulk submission is not delayed more than the work of the small tasks
+    assert max(bulk_waits) <= max(fifo_bulk_waits) + 100 / 2
+
+
+@pytest.mark.asyncio
+async def test_fair_share_queue():
+    queue = FairShareQueue()
+    for i in range(3):
+        await queue.put(f"bulk-{i}")
+    token = current_task_share.set(TaskShare(tenant="small"))
+    await queue.put("small-0")
+    current_task_share.reset(token)
+
+    assert queue.qsize() == 4
+    assert queue.position("small-0") == 2
+    assert [await queue.get() for _ in range(4)] == [
+        "bulk-0",
+        "small-0",
+        "bulk-1",
+        "bulk-2",
+    ]
+
+    # The waiting workers get the tasks in the effective order
+    getter = asyncio.create_task(queue.get())
+    await asyncio.sleep(0)
+    await queue.put("bulk-3")
+    assert await getter == "bulk-3"
+
+
+@pytest.mark.asyncio
+async def test_fair_share_rq_queue(tmp_path):
+    """The RQ jobs are dispatched round-robin over the tenant lists."""
+
+    fakeredis = pytest.importorskip("fakeredis")
+    # The scripts of the queue run in the Lua runtime of fakeredis
+    pytest.importorskip("lupa")
+    from docling_jobkit.orchestrators.rq.orchestrator import (
+        RQOrchestrator,
+        RQOrchestratorConfig,
+    )
+
+    from docling_serve.orchestrator_factory import FairShareRQMixin
+    from docling_serve.rq_fair_queue import FairShareRQQueue
+
+    class FairShareRQOrchestrator(FairShareRQMixin, RQOrchestrator):  # type: ignore[misc]
+        pass
+
+    config = RQOrchestratorConfig(
+        redis_url="redis://localhost:6379/", scratch_dir=tmp_path
+    )
+    orchestrator = FairShareRQOrchestrator(config=config)
+    orchestrator._redis_conn = fakeredis.FakeStrictRedis()
+    orchestrator._rq_queue.connection = orchestrator._redis_conn
+    queue = orchestrator._rq_queue
+    assert isinstance(queue, FairShareRQQueue)
+
+    async def enqueue(share: TaskShare) -> str:
+        token = current_task_share.set(share)
+        try:
+            task = await orchestrator.enqueue(
+                sources=[HttpSource(url="https://example.com/doc.pdf")],
+                target=InBodyTarget(),
+            )
+        finally:
+            current_task_share.reset(token)
+        return task.task_id
+
+    def dequeue() -> str:
+        job, _ = FairShareRQQueue.dequeue_any(
+            [queue], None, connection=orchestrator._redis_conn
+        )
+        return job.id
+
+    bulk = [await enqueue(TaskShare(tenant="bulk")) for _ in range(5)]
+    small = await enqueue(TaskShare(tenant="small"))
+    urgent = await enqueue(TaskShare(tenant="bulk", priority=1))
+
+    # The jobs are not on the plain RQ list, nothing is re-sorted
+    assert orchestrator._redis_conn.llen(queue.key) == 0
+    assert queue.get_job_ids() == [urgent, bulk[0], small, *bulk[1:]]
+    assert await orchestrator.queue_size() == 7
+    assert await orchestrator.get_queue_position(small) == 3
+    assert await orchestrator.get_queue_position(bulk[4]) == 7
+    assert await orchestrator.get_queue_positions([small, bulk[4], "gone"]) == {
+        small: 3,
+        bulk[4]: 7,
+        "gone": None,
+    }
+
+    # A worker takes the first jobs, the next small task follows the queued one
+    assert [dequeue(), dequeue()] == [urgent, bulk[0]]
+    small_1 = await enqueue(TaskShare(tenant="small"))
+    assert queue.get_job_ids() == [small, bulk[1], small_1, *bulk[2:]]
+    assert await orchestrator.get_queue_position(small_1) == 3
+
+    # The removed jobs are skipped, the jobs of the plain RQ list come last
+    queue.remove(bulk[2])
+    orchestrator._redis_conn.rpush(queue.key, bulk[2])
+    assert await orchestrator.queue_size() == 6
+    assert await orchestrator.get_queue_position(bulk[2]) == 6
+    assert [dequeue() for _ in range(6)] == [
+        small,
+        bulk[1],
+        small_1,
+        bulk[3],
+        bulk[4],
+        bulk[2],
+    ]
+    assert (
+        FairShareRQQueue.dequeue_any([queue], None, connection=orchestrator._redis_conn)
+        is None
+    )
+    assert await orchestrator.queue_size() == 0
+
+
+@pytest.mark.parametrize("fair_share", [True, False])
+def test_rq_queue_class(monkeypatch, tmp_path, fair_share: bool):
+    """Without fair share, the jobs go on the plain list read by any RQ worker."""
+
+    pytest.importorskip("rq")
+    from docling_serve.orchestrator_factory import get_async_orchestrator
+    from docling_serve.rq_fair_queue import FairShareRQQueue
+    from docling_serve.settings import AsyncEngine, docling_serve_settings
+
+    monkeypatch.setattr(docling_serve_settings, "eng_kind", AsyncEngine.RQ)
+    monkeypatch.setattr(docling_serve_settings, "fair_share", fair_share)
+    monkeypatch.setattr(
+        docling_serve_settings, "eng_rq_redis_url", "redis://localhost:6379/"
+    )
+    get_async_orchestrator.cache_clear()
+    try:
+        orchestrator = get_async_orchestrator()
+    finally:
+        get_async_orchestrator.cache_clear()
+
+    queue = orchestrator._rq_queue  # type: ignore[attr-defined]
+    assert isinstance(queue, FairShareRQQueue) == fair_share
+    assert hasattr(orchestrator, "get_queue_positions")
+
+
+@pytest.mark.asyncio
+async def test_task_share_request(monkeypatch):
+    """The tenant is the header with an API key, the priority is bounded."""
+
+    from docling_serve.app import create_app
+    from docling_serve.orchestrator_factory import get_async_orchestrator
+    from docling_serve.settings import docling_serve_settings
+
+    monkeypatch.setattr(docling_serve_settings, "api_key", "secret")
+    monkeypatch.setattr(docling_serve_settings, "max_priority", 2)
+    app = create_app()
+
+    shares: list[TaskShare] = []
+
+    class ShareRecorder:
+        async def enqueue(self, sources, target, **kwargs) -> Task:
+            shares.append(current_task_share.get())
+            return Task(task_id=str(len(shares)), sources=sources, target=target)
+
+        async def get_queue_position(self, task_id: str):
+            return None
+
+    app.dependency_overrides[get_async_orchestrator] = ShareRecorder
+
+    pdf = pdfium.PdfDocument.new()
+    for _ in range(3):
+        pdf.new_page(200, 200)
+    buf = io.BytesIO()
+    pdf.save(buf)
+    pdf.close()
+    source = {
+        "kind": "file",
+        "filename": "doc.pdf",
+        "base64_string": base64.b64encode(buf.getvalue()).decode(),
+    }
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://app.io"
+    ) as client:
+        for priority in (5, -3):
+            response = await client.post(
+                "/v1/convert/source/async",
+                json={"sources": [source, source]},
+                headers={
+                    "X-Api-Key": "secret",
+                    "X-Tenant-Id": "other",
+                    "X-Priority": str(priority),
+                },
+            )
+            assert response.status_code == 200, response.text
+
+    assert [share.priority for share in shares] == [2, -3]
+    assert [share.tenant for share in shares] == ["tenant:other", "tenant:other"]
+    # Without a limit of the pages in flight, the small PDFs are not opened
+    assert [share.cost for share in shares] == [2, 2]
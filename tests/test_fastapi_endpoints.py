@@ -62,6 +62,26 @@ async def test_openapijson(client: AsyncClient):
     assert "openapi" in schema
 
 
+@pytest.mark.asyncio
+async def test_openapi30json(client: AsyncClient):
+    response = await client.get("/openapi-3.0.json")
+    assert response.status_code == 200
+    assert response.json()["openapi"] == "3.0.3"
+    etag = response.headers["ETag"]
+
+    # The cached document is served again, or not modified
+    response_again = await client.get("/openapi-3.0.json")
+    assert response_again.content == response.content
+    assert response_again.headers["ETag"] == etag
+
+    response = await client.get(
+        "/openapi-3.0.json", headers={"If-None-Match": f'"other", W/{etag}'}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
 @pytest.mark.asyncio
 async def test_convert_file(client: AsyncClient, auth_headers: dict):
     """Test convert single file to all outputs"""
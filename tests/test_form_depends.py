@@ -0,0 +1,107 @@
+import inspect
+from typing import Any
+
+import pytest
+from pydantic import BaseModel, TypeAdapter
+
+from docling_jobkit.datamodel.chunking import (
+    HierarchicalChunkerOptions,
+    HybridChunkerOptions,
+)
+
+from docling_serve.datamodel.convert import ConvertDocumentsRequestOptions
+from docling_serve.helper_functions import FormDepends, is_pydantic_model
+
+# The local and API variants are mutually exclusive
+NESTED_FIELDS = ["picture_description_api", "vlm_pipeline_model_api"]
+
+
+def form_data(dependency) -> dict[str, Any]:
+    """The values of the form fields, with the examples of the nested models."""
+    data = {}
+    for name, param in inspect.signature(dependency).parameters.items():
+        form = param.default
+        if name in NESTED_FIELDS:
+            data[name] = form.examples[0]
+        else:
+            data[name] = form.default
+    return data
+
+
+async def legacy_parse(cls: type[BaseModel], data: dict[str, Any]) -> BaseModel:
+    # Parsing with an adapter built for each nested field of each request
+    newdata = {}
+    for field_name, model_field in cls.model_fields.items():
+        value = data.get(field_name)
+        newdata[field_name] = value
+        annotation = model_field.annotation
+        if value is not None and is_pydantic_model(annotation):
+            newdata[field_name] = TypeAdapter(annotation).validate_json(value)
+    return cls(**newdata)
+
+
+@pytest.mark.asyncio
+async def test_form_depends_nested_models():
+    dependency = FormDepends(ConvertDocumentsRequestOptions).dependency
+    data = form_data(dependency)
+    assert all(isinstance(data[name], str) for name in NESTED_FIELDS)
+
+    options = await dependency(**data)
+    assert options == await legacy_parse(ConvertDocumentsRequestOptions, data)
+    assert options.picture_description_api is not None
+    assert options.picture_description_api.params == {"model": "granite3.2-vision:2b"}
+
+    with pytest.raises(ValueError, match="picture_description_api"):
+        await dependency(**{**data, "picture_description_api": "{"})
+
+
+@pytest.mark.asyncio
+async def test_form_depends_prefix():
+    dependency = FormDepends(
+        HybridChunkerOptions, prefix="chunking_", excluded_fields=["chunker"]
+    ).dependency
+    params = inspect.signature(dependency).parameters
+    assert "chunking_max_tokens" in params
+    assert "chunking_chunker" not in params
+
+    options = await dependency(**{**form_data(dependency), "chunking_max_tokens": 64})
+    assert options.max_tokens == 64
+
+
+@pytest.mark.asyncio
+async def test_form_adapters_built_once(monkeypatch):
+    """The adapters of the nested models are built once per model, not per request."""
+
+    from docling_serve import helper_functions
+
+    built: list[Any] = []
+
+    class CountingAdapter(TypeAdapter):
+        def __init__(self, *args, **kwargs):
+            built.append(args[0])
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(helper_functions, "TypeAdapter", CountingAdapter)
+    helper_functions._nested_model_adapters.cache_clear()
+    try:
+        for cls in (
+            ConvertDocumentsRequestOptions,
+            HybridChunkerOptions,
+            HierarchicalChunkerOptions,
+        ):
+            nested = [
+                field.annotation
+                for field in cls.model_fields.values()
+                if is_pydantic_model(field.annotation)
+            ]
+            built.clear()
+            dependency = FormDepends(cls).dependency
+            FormDepends(cls, prefix="other_")
+            assert built == nested
+
+            data = form_data(dependency)
+            for _ in range(10):
+                await dependency(**data)
+            assert built == nested
+    finally:
+        helper_functions._nested_model_adapters.cache_clear()
@@ -0,0 +1,122 @@
+import json
+import tracemalloc
+
+import pytest
+from fastapi import BackgroundTasks
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from docling.datamodel.document import ConversionStatus
+from docling_core.types.doc import (
+    BoundingBox,
+    DocItemLabel,
+    DoclingDocument,
+    ProvenanceItem,
+    Size,
+)
+from docling_jobkit.datamodel.result import (
+    DoclingTaskResult,
+    ExportDocumentResponse,
+    ExportResult,
+)
+
+from docling_serve.app import create_app
+from docling_serve.datamodel.responses import ConvertDocumentResponse
+from docling_serve.response_preparation import ModelJSONResponse, prepare_response
+
+
+def make_document(num_pages: int, items_per_page: int) -> DoclingDocument:
+    document = DoclingDocument(name="large")
+    for page_no in range(1, num_pages + 1):
+        document.add_page(page_no=page_no, size=Size(width=612, height=792))
+        for i in range(items_per_page):
+            text = f"Paragraph {i} of the page {page_no}, with some text."
+            document.add_text(
+                label=DocItemLabel.TEXT,
+                text=text,
+                prov=ProvenanceItem(
+                    page_no=page_no,
+                    bbox=BoundingBox(l=72, t=72 + 30 * i, r=540, b=92 + 30 * i),
+                    charspan=(0, len(text)),
+                ),
+            )
+    return document
+
+
+def make_task_result(document: DoclingDocument) -> DoclingTaskResult:
+    return DoclingTaskResult(
+        result=ExportResult(
+            content=ExportDocumentResponse(
+                filename="large.pdf",
+                md_content=document.export_to_markdown(),
+                json_content=document,
+            ),
+            status=ConversionStatus.SUCCESS,
+        ),
+        processing_time=12.5,
+        num_converted=1,
+        num_succeeded=1,
+        num_failed=0,
+    )
+
+
+async def serialize_with_fastapi(response_field, response) -> bytes:
+    content = await serialize_response(
+        field=response_field, response_content=response, is_coroutine=True
+    )
+    return JSONResponse(content).body
+
+
+@pytest.mark.asyncio
+async def test_model_json_response():
+    task_result = make_task_result(make_document(num_pages=2, items_per_page=3))
+    response = await prepare_response(
+        task_id=None,
+        task_result=task_result,
+        orchestrator=None,  # type: ignore[arg-type]
+        background_tasks=BackgroundTasks(),
+    )
+    assert isinstance(response, ModelJSONResponse)
+    assert response.media_type == "application/json"
+
+    data = json.loads(response.body)
+    assert data["status"] == "success"
+    assert data["document"]["filename"] == "large.pdf"
+    assert len(data["document"]["json_content"]["texts"]) == 6
+
+
+@pytest.mark.asyncio
+async def test_json_response_memory():
+    """Peak memory of serializing the result of a 2000 pages document, with the
+    response model of the route and with the model serializer."""
+
+    app = create_app()
+    route = next(
+        route
+        for route in app.routes
+        if isinstance(route, APIRoute) and route.path == "/v1/result/{task_id}"
+    )
+    task_result = make_task_result(make_document(num_pages=2000, items_per_page=20))
+    assert isinstance(task_result.result, ExportResult)
+    model = ConvertDocumentResponse(
+        document=task_result.result.content,
+        status=task_result.result.status,
+        processing_time=task_result.processing_time,
+    )
+
+    fastapi_body = await serialize_with_fastapi(route.response_field, model)
+    body = ModelJSONResponse(model).body
+    assert json.loads(body) == json.loads(fastapi_body)
+    del body, fastapi_body
+
+    tracemalloc.start()
+    await serialize_with_fastapi(route.response_field, model)
+    _, fastapi_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    ModelJSONResponse(model)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < fastapi_peak / 2
@@ -0,0 +1,178 @@
+import asyncio
+import base64
+import os
+import subprocess
+import sys
+
+import pytest
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from docling_serve.settings import docling_serve_settings
+
+pytest.importorskip("prometheus_client")
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    return asyncio.get_event_loop()
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    headers = {}
+    if docling_serve_settings.api_key:
+        headers["X-Api-Key"] = docling_serve_settings.api_key
+    return headers
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app():
+    from docling_serve.app import create_app
+
+    docling_serve_settings.enable_metrics = True
+    app = create_app()
+
+    async with LifespanManager(app) as manager:
+        print("Launching lifespan of app.")
+        yield manager.app
+
+    docling_serve_settings.enable_metrics = False
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://app.io"
+    ) as client:
+        print("Client is ready")
+        yield client
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: AsyncClient, auth_headers: dict):
+    payload = {
+        "options": {
+            "from_formats": ["md"],
+            "to_formats": ["md"],
+        },
+        "sources": [
+            {
+                "kind": "file",
+                "base64_string": base64.b64encode(
+                    b"# Metrics document\n\nSome text."
+                ).decode(),
+                "filename": "metrics.md",
+            }
+        ],
+    }
+    for _ in range(2):
+        response = await client.post(
+            "/v1/convert/source", json=payload, headers=auth_headers
+        )
+        assert response.status_code == 200, "Response should be 200 OK"
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    metrics = response.text
+
+    assert (
+        'docling_serve_request_duration_seconds_count{method="POST",'
+        'route="/v1/convert/source",status="200"} 2.0'
+    ) in metrics
+    assert "docling_serve_queue_depth 0.0" in metrics
+    assert "docling_serve_queue_wait_seconds_count 2.0" in metrics
+    assert 'docling_serve_documents_total{status="success"} 2.0' in metrics
+    assert 'docling_serve_stage_duration_seconds_count{stage="pipeline_total"} 2.0' in (
+        metrics
+    )
+
+
+def _sample(metrics: str, name: str) -> float:
+    for line in metrics.splitlines():
+        if line.startswith(f"{name} "):
+            return float(line.split()[-1])
+    return 0.0
+
+
+@pytest.mark.asyncio
+async def test_metrics_result_fetches(client: AsyncClient, auth_headers: dict):
+    """The documents are counted once at completion, however the result is fetched."""
+
+    documents = 'docling_serve_documents_total{status="success"}'
+    response = await client.get("/metrics")
+    before = _sample(response.text, documents)
+
+    response = await client.post(
+        "/v1/convert/file/async",
+        files={"files": ("metrics.md", b"# Metrics document\n\nSome text.")},
+        data={"from_formats": ["md"], "to_formats": ["md"]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, "Response should be 200 OK"
+    task = response.json()
+    while task["task_status"] not in ("success", "failure"):
+        await asyncio.sleep(0.2)
+        response = await client.get(
+            f"/v1/status/poll/{task['task_id']}", headers=auth_headers
+        )
+        task = response.json()
+    assert task["task_status"] == "success"
+
+    # Counted without fetching the result, once the completion is notified
+    for _ in range(20):
+        response = await client.get("/metrics")
+        if _sample(response.text, documents) > before:
+            break
+        await asyncio.sleep(0.1)
+    assert _sample(response.text, documents) == before + 1
+
+    for _ in range(2):
+        response = await client.get(
+            f"/v1/result/{task['task_id']}", headers=auth_headers
+        )
+        assert response.status_code == 200, "Response should be 200 OK"
+    response = await client.get(
+        f"/v1/result/{task['task_id']}/md", headers=auth_headers
+    )
+    assert response.status_code == 200, "Response should be 200 OK"
+
+    response = await client.get("/metrics")
+    assert _sample(response.text, documents) == before + 1
+
+
+_WORKER_SCRIPT = """
+from docling_serve.metrics import DoclingServeMetrics
+
+metrics = DoclingServeMetrics()
+metrics.observe_request("GET", "/health", 200, 0.01)
+metrics.pages.inc(10)
+"""
+
+_SCRAPE_SCRIPT = """
+from docling_serve.metrics import DoclingServeMetrics
+
+print(DoclingServeMetrics().render()[0].decode())
+"""
+
+
+def test_metrics_multiprocess(tmp_path):
+    """The metrics of the uvicorn workers are aggregated in the shared directory."""
+
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(3):
+        subprocess.run([sys.executable, "-c", _WORKER_SCRIPT], env=env, check=True)
+
+    scrape = subprocess.run(
+        [sys.executable, "-c", _SCRAPE_SCRIPT],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    assert (
+        'docling_serve_request_duration_seconds_count{method="GET",'
+        'route="/health",status="200"} 3.0'
+    ) in scrape.stdout
+    assert "docling_serve_pages_total 30.0" in scrape.stdout
@@ -0,0 +1,243 @@
+import gc
+from io import BytesIO
+
+import pypdfium2 as pdfium
+import pytest
+
+from docling.datamodel.base_models import DocumentStream
+from docling.pipeline.standard_pdf_pipeline import StandardPdfPipeline
+from docling.pipeline.vlm_pipeline import VlmPipeline
+from docling_jobkit.convert.manager import DoclingConverterManagerConfig
+from docling_jobkit.datamodel.convert import ConvertDocumentsOptions
+
+from docling_serve import model_pool
+from docling_serve.cancellation import CancellableConverterManager
+from docling_serve.model_pool import (
+    MODEL_POOLING_SUPPORTED,
+    ModelPool,
+    PooledConverterManager,
+    PooledStandardPdfPipeline,
+    get_model_pool,
+)
+from docling_serve.orchestrator_factory import (
+    get_async_orchestrator,
+    worker_model_pool_stats,
+)
+
+requires_pooling = pytest.mark.skipif(
+    not MODEL_POOLING_SUPPORTED,
+    reason="The installed docling is not supported by the model pool",
+)
+
+# Three option sets sharing their layout and table models, rotated through the
+# options cache of two converters
+OPTION_SETS = [
+    ConvertDocumentsOptions(do_ocr=False),
+    ConvertDocumentsOptions(do_ocr=True),
+    ConvertDocumentsOptions(do_ocr=False, images_scale=1.0),
+]
+
+
+class Owner:
+    pass
+
+
+def make_pdf(num_pages: int) -> bytes:
+    pdf = pdfium.PdfDocument.new()
+    for _ in range(num_pages):
+        pdf.new_page(200, 200)
+    buf = BytesIO()
+    pdf.save(buf)
+    pdf.close()
+    return buf.getvalue()
+
+
+def test_model_pool():
+    pool = ModelPool(max_idle=1)
+    loads: list[str] = []
+
+    def acquire(owner: Owner, name: str):
+        return pool.acquire(owner, (name,), lambda: loads.append(name) or name)
+
+    first, second, third = Owner(), Owner(), Owner()
+    assert acquire(first, "layout") == "layout"
+    assert acquire(second, "layout") == "layout"
+    assert acquire(third, "table") == "table"
+    assert loads == ["layout", "table"]
+    assert (pool.hits, pool.misses) == (1, 2)
+
+    # The model stays loaded while a pipeline uses it, and after while idle
+    del first
+    gc.collect()
+    assert (pool.loaded, pool.idle) == (2, 0)
+    del second
+    gc.collect()
+    assert (pool.loaded, pool.idle) == (2, 1)
+
+    # The least recently released idle model is unloaded first
+    del third
+    gc.collect()
+    assert (pool.loaded, pool.idle) == (1, 1)
+    fourth = Owner()
+    acquire(fourth, "table")
+    assert loads == ["layout", "table"]
+    assert (pool.loaded, pool.idle) == (1, 0)
+
+    del fourth
+    gc.collect()
+    pool.clear()
+    assert pool.loaded == 0
+
+
+@requires_pooling
+def test_pooled_converter_manager():
+    manager = PooledConverterManager(DoclingConverterManagerConfig())
+    pdf_format_option = manager.get_pdf_pipeline_opts(ConvertDocumentsOptions())
+    assert pdf_format_option.pipeline_cls is PooledStandardPdfPipeline
+    assert issubclass(PooledStandardPdfPipeline, StandardPdfPipeline)
+
+    pdf_format_option = manager.get_pdf_pipeline_opts(
+        ConvertDocumentsOptions(pipeline="vlm")
+    )
+    assert pdf_format_option.pipeline_cls is VlmPipeline
+
+
+def test_pooled_converter_manager_unsupported(monkeypatch):
+    """With an unsupported docling, the standard pipeline is used as it is."""
+    monkeypatch.setattr(model_pool, "MODEL_POOLING_SUPPORTED", False)
+    manager = PooledConverterManager(DoclingConverterManagerConfig())
+    pdf_format_option = manager.get_pdf_pipeline_opts(ConvertDocumentsOptions())
+    assert pdf_format_option.pipeline_cls is StandardPdfPipeline
+
+
+@pytest.mark.asyncio
+async def test_local_workers_managers(monkeypatch):
+    """The local workers not sharing models each get a pooled manager."""
+    from docling_jobkit.orchestrators.local.worker import AsyncLocalWorker
+
+    managers = []
+
+    async def loop(self):
+        managers.append(self.orchestrator.cm)
+
+    monkeypatch.setattr(AsyncLocalWorker, "loop", loop)
+    orchestrator = get_async_orchestrator.__wrapped__()
+    orchestrator.config.num_workers = 2
+    orchestrator.config.shared_models = False
+    await orchestrator.process_queue()
+
+    assert len(managers) == 2
+    assert all(isinstance(cm, PooledConverterManager) for cm in managers)
+    assert managers[0] is not managers[1]
+    assert orchestrator.cm not in managers
+
+    stats = await worker_model_pool_stats(orchestrator)
+    assert stats == [cm.model_pool.stats() for cm in managers]
+
+
+@requires_pooling
+@pytest.mark.asyncio
+async def test_local_workers_distinct_models(monkeypatch):
+    """The local workers not sharing models never get the same model instances."""
+    from docling_jobkit.orchestrators.local.worker import AsyncLocalWorker
+
+    managers = []
+
+    async def loop(self):
+        managers.append(self.orchestrator.cm)
+
+    monkeypatch.setattr(AsyncLocalWorker, "loop", loop)
+    orchestrator = get_async_orchestrator.__wrapped__()
+    orchestrator.config.num_workers = 2
+    orchestrator.config.shared_models = False
+    await orchestrator.process_queue()
+
+    pools = [cm.model_pool for cm in managers]
+    assert pools[0] is not pools[1]
+    assert get_model_pool() not in pools
+
+    # The pipelines of each worker load their models in the worker's pool
+    owners = [Owner(), Owner()]
+    models = []
+    for cm, owner in zip(managers, owners):
+        pipeline_cls = cm.get_pdf_pipeline_opts(ConvertDocumentsOptions()).pipeline_cls
+        assert issubclass(pipeline_cls, PooledStandardPdfPipeline)
+        assert pipeline_cls.model_pool is cm.model_pool
+        models.append(pipeline_cls.model_pool.acquire(owner, ("layout",), object))
+    assert models[0] is not models[1]
+    assert [pool.misses for pool in pools] == [1, 1]
+
+    # With shared models, the workers use the manager and pool of the process
+    managers.clear()
+    orchestrator.config.shared_models = True
+    await orchestrator.process_queue()
+    assert all(cm is orchestrator.cm for cm in managers)
+    assert orchestrator.cm.model_pool is get_model_pool()
+
+
+@pytest.mark.asyncio
+async def test_rq_model_pool_stats(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    from docling_jobkit.orchestrators.rq.orchestrator import RQOrchestratorConfig
+
+    from docling_serve.orchestrator_factory import RQWorkersMixin
+    from docling_serve.rq_fair_queue import FairShareRQQueue
+    from docling_serve.rq_worker import CancellableRQWorker
+
+    connection = fakeredis.FakeStrictRedis()
+    orchestrator = RQWorkersMixin()
+    orchestrator._rq_queue = FairShareRQQueue("convert", connection=connection)
+    orchestrator._redis_conn = connection
+    worker = CancellableRQWorker(
+        [orchestrator._rq_queue],
+        connection=connection,
+        orchestrator_config=RQOrchestratorConfig(redis_url="redis://localhost:6379/"),
+        cm_config=DoclingConverterManagerConfig(),
+        scratch_dir=tmp_path,
+    )
+    worker.register_birth()
+    worker.save_model_pool_stats()
+    assert await worker_model_pool_stats(orchestrator) == [get_model_pool().stats()]  # type: ignore[arg-type]
+
+    worker.register_death()
+    assert await worker_model_pool_stats(orchestrator) == []  # type: ignore[arg-type]
+
+
+@requires_pooling
+def test_model_pool_conversions():
+    """The conversions rotating three option sets through a cache of two
+    converters load their models once with the model pool."""
+
+    rounds = 3
+    pdf = make_pdf(1)
+    config = DoclingConverterManagerConfig(options_cache_size=2)
+
+    misses = {}
+    for manager_cls in (CancellableConverterManager, PooledConverterManager):
+        get_model_pool.cache_clear()
+        manager = manager_cls(config)
+        try:
+            # The first conversion loads the models, it is not measured
+            list(
+                manager.convert_documents(
+                    sources=[DocumentStream(name="doc.pdf", stream=BytesIO(pdf))],
+                    options=OPTION_SETS[-1],
+                )
+            )
+        except Exception as e:
+            pytest.skip(f"The models cannot be loaded: {e}")
+
+        for _ in range(rounds):
+            for options in OPTION_SETS:
+                list(
+                    manager.convert_documents(
+                        sources=[DocumentStream(name="doc.pdf", stream=BytesIO(pdf))],
+                        options=options,
+                    )
+                )
+        misses[manager_cls] = get_model_pool().misses
+
+    # The evicted converters got their models back from the pool: only the
+    # distinct models of the option sets were loaded
+    assert misses[CancellableConverterManager] == 0
+    assert 0 < misses[PooledConverterManager] <= 2 * len(OPTION_SETS)
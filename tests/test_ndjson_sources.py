@@ -0,0 +1,233 @@
+import asyncio
+import base64
+import json
+import threading
+import tracemalloc
+from collections.abc import AsyncIterator
+
+import pytest
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from docling_serve.app import create_app
+from docling_serve.datamodel.requests import ConvertDocumentsRequest
+from docling_serve.ndjson_sources import (
+    Base64Spooler,
+    SourceStreamError,
+    SourceTooLargeError,
+    parse_ndjson_sources,
+)
+from docling_serve.settings import docling_serve_settings
+from docling_serve.storage import ScratchFileSource
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    return asyncio.get_event_loop()
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    headers = {}
+    if docling_serve_settings.api_key:
+        headers["X-Api-Key"] = docling_serve_settings.api_key
+    return headers
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app():
+    app = create_app()
+
+    async with LifespanManager(app) as manager:
+        print("Launching lifespan of app.")
+        yield manager.app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://app.io"
+    ) as client:
+        print("Client is ready")
+        yield client
+
+
+def make_ndjson(request: dict, files: dict[str, bytes], chunk_size: int) -> bytes:
+    lines = [json.dumps(request)]
+    for filename, content in files.items():
+        lines.append(json.dumps({"kind": "file", "filename": filename}))
+        encoded = base64.b64encode(content).decode()
+        for offset in range(0, len(encoded), chunk_size):
+            lines.append(json.dumps(encoded[offset : offset + chunk_size]))
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def iter_bytes(data: bytes, size: int) -> AsyncIterator[bytes]:
+    for offset in range(0, len(data), size):
+        yield data[offset : offset + size]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("read_size", [1, 7, 4096])
+async def test_parse_ndjson_sources(read_size: int):
+    files = {"a.md": b"# Document A\n\nSome text.", "b.bin": bytes(range(256)) * 10}
+    data = make_ndjson({"options": {"to_formats": ["md"]}}, files, chunk_size=102)
+    # Add an inline source
+    data += b'{"kind": "http", "url": "https://example.com/doc.pdf"}\n'
+
+    parser = await parse_ndjson_sources(iter_bytes(data, read_size))
+
+    assert parser.request == {"options": {"to_formats": ["md"]}}
+    file_sources = [s for s in parser.sources if isinstance(s, ScratchFileSource)]
+    assert [s.filename for s in file_sources] == ["a.md", "b.bin"]
+    assert [s.path.read_bytes() for s in file_sources] == list(files.values())
+    assert parser.sources[-1].kind == "http"  # type: ignore[union-attr]
+    for source in file_sources:
+        source.discard()
+
+
+@pytest.mark.asyncio
+async def test_parse_ndjson_sources_errors():
+    data = make_ndjson({}, {"a.bin": b"x" * 1000}, chunk_size=100)
+    with pytest.raises(SourceTooLargeError):
+        await parse_ndjson_sources(iter_bytes(data, 64), max_file_size=500)
+
+    # Escaped slashes are accepted
+    content = b"\xff\xef" * 30
+    encoded = json.dumps(base64.b64encode(content).decode()).replace("/", "\\/")
+    data = f'{{}}\n{{"kind": "file", "filename": "a.bin"}}\n{encoded}\n'.encode()
+    parser = await parse_ndjson_sources(iter_bytes(data, 5))
+    assert parser.sources[0].path.read_bytes() == content  # type: ignore[union-attr]
+    parser.discard()
+
+    for data in (
+        b'{}\n"QUJD"\n',  # chunk without a file line
+        b'{}\n{"kind": "file", "filename": "a.bin"}\n"QUJ"\n',  # truncated
+        b'{}\n{"kind": "file", "filename": "a.bin"}\n"QU*D"\n',  # invalid
+        b'{}\n{"kind": "file", "filename": "a.bin"}\n"QUJD',  # unterminated
+        b"{}\n[1, 2]\n",
+    ):
+        with pytest.raises(SourceStreamError):
+            await parse_ndjson_sources(iter_bytes(data, 3))
+
+
+@pytest.mark.asyncio
+async def test_parse_ndjson_sources_off_loop(monkeypatch):
+    """The files are decoded and written outside of the event loop thread."""
+
+    threads = set()
+    decode = Base64Spooler._decode
+
+    def _decode(self, data: bytes):
+        threads.add(threading.get_ident())
+        decode(self, data)
+
+    monkeypatch.setattr(Base64Spooler, "_decode", _decode)
+    data = make_ndjson({"options": {}}, {"doc.md": b"# Doc\n" * 1000}, 1024)
+    parser = await parse_ndjson_sources(iter_bytes(data, 4096))
+    parser.discard()
+
+    assert threads
+    assert threading.get_ident() not in threads
+
+
+def test_file_source_size_validator(monkeypatch):
+    monkeypatch.setattr(docling_serve_settings, "max_file_size", 100)
+    request = {
+        "sources": [
+            {
+                "kind": "file",
+                "filename": "a.md",
+                "base64_string": base64.b64encode(b"x" * 101).decode(),
+            }
+        ]
+    }
+    with pytest.raises(ValueError, match="exceeds the maximum of 100 bytes"):
+        ConvertDocumentsRequest.model_validate(request)
+
+    request["sources"][0]["base64_string"] = base64.b64encode(b"x" * 100).decode()
+    ConvertDocumentsRequest.model_validate(request)
+
+
+@pytest.mark.asyncio
+async def test_convert_ndjson(client: AsyncClient, auth_headers: dict):
+    data = make_ndjson(
+        {"options": {"from_formats": ["md"], "to_formats": ["md"]}},
+        {"doc.md": b"# NDJSON document\n\nSome text."},
+        chunk_size=8,
+    )
+    response = await client.post(
+        "/v1/convert/ndjson",
+        content=data,
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200, response.text
+    result = response.json()
+    assert result["status"] == "success"
+    assert "NDJSON document" in result["document"]["md_content"]
+
+    response = await client.post(
+        "/v1/convert/ndjson/async",
+        content=data,
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["task_status"] in ("pending", "started", "success")
+
+    response = await client.post(
+        "/v1/convert/ndjson",
+        content=b'{"options": {"to_formats": ["md"]}}\n"QUJD"\n',
+        headers={**auth_headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 400
+
+
+BENCHMARK_SIZE = 200 * 1024 * 1024  # base64 bytes
+BENCHMARK_CHUNK = 64 * 1024
+
+
+async def benchmark_stream() -> AsyncIterator[bytes]:
+    """Stream a 200 MB base64 source in NDJSON, as received from the network."""
+    yield b'{"options": {}}\n{"kind": "file", "filename": "large.bin"}\n'
+    line = json.dumps(base64.b64encode(b"\x00\x01\x02" * 16384).decode())
+    block = ((line + "\n") * 16).encode()
+    for _ in range(BENCHMARK_SIZE // len(block)):
+        for offset in range(0, len(block), BENCHMARK_CHUNK):
+            yield block[offset : offset + BENCHMARK_CHUNK]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_ingestion_memory():
+    """Peak memory of a 200 MB base64 source, NDJSON versus JSON body."""
+
+    tracemalloc.start()
+    parser = await parse_ndjson_sources(benchmark_stream())
+    _, ndjson_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    size = parser.sources[0].path.stat().st_size  # type: ignore[union-attr]
+    parser.discard()
+
+    body = json.dumps(
+        {
+            "options": {},
+            "sources": [
+                {
+                    "kind": "file",
+                    "filename": "large.bin",
+                    "base64_string": base64.b64encode(bytes(size)).decode(),
+                }
+            ],
+        }
+    ).encode()
+    tracemalloc.start()
+    request = ConvertDocumentsRequest.model_validate_json(body)
+    content = base64.b64decode(request.sources[0].base64_string)  # type: ignore[union-attr]
+    _, json_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(content) == size
+    del body, request, content
+
+    mb = 1024 * 1024
+    assert ndjson_peak < 16 * mb
+    assert json_peak > size
@@ -0,0 +1,260 @@
+import asyncio
+import io
+import json
+import os
+
+import pypdfium2 as pdfium
+import pytest
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from docling.datamodel.document import ConversionStatus
+from docling_core.types.doc import DocItemLabel, DoclingDocument, Size
+from docling_core.types.doc.base import BoundingBox
+from docling_core.types.doc.document import ProvenanceItem
+from docling_jobkit.datamodel.result import (
+    DoclingTaskResult,
+    ExportDocumentResponse,
+    ExportResult,
+)
+from docling_jobkit.datamodel.task import Task
+from docling_jobkit.datamodel.task_meta import TaskStatus
+
+from docling_serve.app import create_app
+from docling_serve.datamodel.convert import ConvertDocumentsRequestOptions
+from docling_serve.orchestrator_factory import get_async_orchestrator
+from docling_serve.page_splitting import merge_window_results, split_pdf
+from docling_serve.settings import docling_serve_settings
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    return asyncio.get_event_loop()
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    headers = {}
+    if docling_serve_settings.api_key:
+        headers["X-Api-Key"] = docling_serve_settings.api_key
+    return headers
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app():
+    app = create_app()
+
+    async with LifespanManager(app) as manager:
+        print("Launching lifespan of app.")
+        yield manager.app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://app.io"
+    ) as client:
+        print("Client is ready")
+        yield client
+
+
+def _make_pdf(num_pages: int) -> bytes:
+    pdf = pdfium.PdfDocument.new()
+    for _ in range(num_pages):
+        pdf.new_page(595, 842)
+    buf = io.BytesIO()
+    pdf.save(buf)
+    pdf.close()
+    return buf.getvalue()
+
+
+def _window_result(first_page: int, num_pages: int) -> DoclingTaskResult:
+    doc = DoclingDocument(name="report")
+    for page_no in range(1, num_pages + 1):
+        doc.add_page(page_no=page_no, size=Size(width=595, height=842))
+        doc.add_text(
+            label=DocItemLabel.TEXT,
+            text=f"Text of page {first_page + page_no - 1}",
+            prov=ProvenanceItem(
+                page_no=page_no,
+                bbox=BoundingBox(l=0, t=0, r=10, b=10),
+                charspan=(0, 10),
+            ),
+        )
+    return DoclingTaskResult(
+        result=ExportResult(
+            content=ExportDocumentResponse(filename="report.pdf", json_content=doc),
+            status=ConversionStatus.SUCCESS,
+        ),
+        processing_time=1.0,
+        num_converted=1,
+        num_succeeded=1,
+        num_failed=0,
+    )
+
+
+def test_split_pdf():
+    content = _make_pdf(10)
+
+    first_page, windows = split_pdf(content, 4, (1, 100))
+    assert first_page == 1
+    assert [len(pdfium.PdfDocument(w)) for w in windows] == [4, 4, 2]
+
+    first_page, windows = split_pdf(content, 2, (3, 7))
+    assert first_page == 3
+    assert [len(pdfium.PdfDocument(w)) for w in windows] == [2, 2, 1]
+
+    # Nothing to split
+    assert split_pdf(content, 10, (1, 100)) is None
+    assert split_pdf(b"# Markdown", 2, (1, 100)) is None
+
+
+def test_merge_window_results():
+    options = ConvertDocumentsRequestOptions(to_formats=["md", "json"])
+    window_results = [
+        _window_result(first_page=3, num_pages=2),
+        _window_result(first_page=5, num_pages=2),
+        _window_result(first_page=7, num_pages=1),
+    ]
+
+    task_result = merge_window_results(
+        filename="report.pdf",
+        content=_make_pdf(5),
+        first_page=3,
+        window_results=window_results,
+        options=options,
+        processing_time=1.0,
+    )
+
+    assert isinstance(task_result.result, ExportResult)
+    assert task_result.result.status == ConversionStatus.SUCCESS
+    merged = task_result.result.content.json_content
+    assert merged is not None
+    assert merged.name == "report"
+    assert sorted(merged.pages.keys()) == [3, 4, 5, 6, 7]
+    assert [t.prov[0].page_no for t in merged.texts] == [3, 4, 5, 6, 7]
+    assert [t.text for t in merged.texts] == [f"Text of page {i}" for i in range(3, 8)]
+    assert "Text of page 7" in task_result.result.content.md_content
+
+    options = ConvertDocumentsRequestOptions(to_formats=["html_split_page"])
+    task_result = merge_window_results(
+        filename="report.pdf",
+        content=_make_pdf(5),
+        first_page=3,
+        window_results=window_results,
+        options=options,
+        processing_time=1.0,
+    )
+    assert isinstance(task_result.result, ExportResult)
+    html_content = task_result.result.content.html_content
+    assert html_content is not None
+    # The pages side by side with their content
+    assert "<table>" in html_content
+    assert "Text of page 7" in html_content
+
+
+@pytest.mark.asyncio
+async def test_split_enqueue_failure():
+    """The windows already enqueued are cancelled when the next one fails."""
+
+    class FailingOrchestrator:
+        notifier = None
+
+        def __init__(self):
+            self.tasks: dict[str, Task] = {}
+            self.cancelled: list[str] = []
+            self.deleted: list[str] = []
+
+        async def enqueue(self, sources, target, **kwargs) -> Task:
+            if len(self.tasks) == 2:
+                raise RuntimeError("The queue is not reachable.")
+            task = Task(task_id=str(len(self.tasks)), sources=sources, target=target)
+            self.tasks[task.task_id] = task
+            return task
+
+        async def task_status(self, task_id: str, wait: float = 0.0) -> Task:
+            return self.tasks[task_id]
+
+        async def cancel_task(self, task_id: str) -> bool:
+            if self.tasks[task_id].is_completed():
+                return False
+            self.cancelled.append(task_id)
+            self.tasks[task_id].set_status(TaskStatus.FAILURE)
+            return True
+
+        async def delete_task(self, task_id: str):
+            self.deleted.append(task_id)
+
+    orchestrator = FailingOrchestrator()
+    app = create_app()
+    app.dependency_overrides[get_async_orchestrator] = lambda: orchestrator
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app, raise_app_exceptions=False),
+        base_url="http://app.io",
+    ) as client:
+        response = await client.post(
+            "/v1/convert/file",
+            files={"files": ("doc.pdf", _make_pdf(6), "application/pdf")},
+            data={"split_page_count": "2"},
+        )
+        assert response.status_code == 500
+
+        for _ in range(100):
+            if set(orchestrator.deleted) == {"0", "1"}:
+                break
+            await asyncio.sleep(0.01)
+
+    assert sorted(orchestrator.cancelled) == ["0", "1"]
+    assert set(orchestrator.deleted) == {"0", "1"}
+
+
+@pytest.mark.asyncio
+async def test_split_async_rejected(client: AsyncClient, auth_headers: dict):
+    """The async endpoints do not split the documents."""
+
+    response = await client.post(
+        "/v1/convert/source/async",
+        json={
+            "options": {"split_page_count": 3},
+            "sources": [{"kind": "http", "url": "https://arxiv.org/pdf/2206.01062"}],
+        },
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+    assert "split_page_count" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_convert_file_split(client: AsyncClient, auth_headers: dict):
+    """A split conversion returns one document with all the pages."""
+
+    current_dir = os.path.dirname(__file__)
+    file_path = os.path.join(current_dir, "2206.01062v1.pdf")
+
+    results = []
+    for split_page_count in (None, 3):
+        options = {
+            "to_formats": ["json"],
+            "do_ocr": False,
+            "image_export_mode": "placeholder",
+        }
+        if split_page_count is not None:
+            options["split_page_count"] = split_page_count
+        files = {
+            "files": ("2206.01062v1.pdf", open(file_path, "rb"), "application/pdf"),
+        }
+        response = await client.post(
+            "/v1/convert/file", files=files, data=options, headers=auth_headers
+        )
+        assert response.status_code == 200, "Response should be 200 OK"
+        results.append(response.json())
+
+    docs = [
+        DoclingDocument.model_validate_json(json.dumps(r["document"]["json_content"]))
+        for r in results
+    ]
+    assert results[1]["status"] == "success"
+    assert sorted(docs[1].pages.keys()) == sorted(docs[0].pages.keys())
+    assert len(docs[1].texts) == len(docs[0].texts)
@@ -0,0 +1,163 @@
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from docling_serve.admission import AdmissionController, TaskCost
+from docling_serve.app import create_app
+from docling_serve.datamodel.responses import StartupStage
+from docling_serve.readiness import Readiness
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    return asyncio.get_event_loop()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app():
+    app = create_app()
+
+    async with LifespanManager(app) as manager:
+        print("Launching lifespan of app.")
+        yield manager.app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://app.io"
+    ) as client:
+        print("Client is ready")
+        yield client
+
+
+class SlowOrchestrator:
+    """Orchestrator whose models are loaded when `loaded` is set."""
+
+    def __init__(self, error: Exception | None = None):
+        self.tasks: dict = {}
+        self.loaded = asyncio.Event()
+        self.error = error
+
+    async def warm_up_caches(self):
+        await self.loaded.wait()
+        if self.error is not None:
+            raise self.error
+
+    async def process_queue(self):
+        await asyncio.Event().wait()
+
+    async def check_connection(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_ready_endpoints(client: AsyncClient):
+    response = await client.get("/ready/stream")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0]["stage"] == "starting"
+    assert events[-1]["stage"] == "ready"
+
+    response = await client.get("/ready")
+    assert response.status_code == 200, response.text
+    assert response.json() == {
+        "status": "ready",
+        "stage": "ready",
+        "checks": {"startup": True, "workers": True, "queue": True},
+    }
+
+
+@pytest.mark.asyncio
+async def test_readiness_warm_up():
+    orchestrator = SlowOrchestrator()
+    readiness = Readiness()
+    readiness.start(orchestrator, warm_up=True)  # type: ignore[arg-type]
+    progress = readiness.progress()
+    assert (await anext(progress)).stage == StartupStage.STARTING
+    assert (await anext(progress)).stage == StartupStage.WARMING_UP
+
+    response = await readiness.check(orchestrator)  # type: ignore[arg-type]
+    assert response.status == "not_ready"
+    assert response.checks == {"startup": False, "workers": False, "queue": True}
+
+    orchestrator.loaded.set()
+    assert (await anext(progress)).stage == StartupStage.READY
+    with pytest.raises(StopAsyncIteration):
+        await anext(progress)
+    response = await readiness.check(orchestrator)  # type: ignore[arg-type]
+    assert response.status == "ready"
+
+    # The workers stopped
+    assert readiness.queue_task is not None
+    readiness.queue_task.cancel()
+    await asyncio.sleep(0)
+    response = await readiness.check(orchestrator)  # type: ignore[arg-type]
+    assert response.checks["workers"] is False
+
+    await readiness.stop()
+
+
+@pytest.mark.asyncio
+async def test_readiness_warm_up_failure():
+    orchestrator = SlowOrchestrator(error=RuntimeError("no space left"))
+    orchestrator.loaded.set()
+    readiness = Readiness()
+    readiness.start(orchestrator, warm_up=True)  # type: ignore[arg-type]
+
+    events = [event async for event in readiness.progress()]
+    assert events[-1].stage == StartupStage.FAILED
+    assert "no space left" in events[-1].message
+    assert readiness.queue_task is None
+    await readiness.stop()
+
+
+@pytest.mark.asyncio
+async def test_readiness_queue_saturated(monkeypatch):
+    admission = AdmissionController(max_queued_tasks=1)
+    monkeypatch.setattr(
+        "docling_serve.readiness.get_admission_controller", lambda: admission
+    )
+    orchestrator = SlowOrchestrator()
+    readiness = Readiness()
+    readiness.start(orchestrator, warm_up=False)  # type: ignore[arg-type]
+    _ = [event async for event in readiness.progress()]
+
+    response = await readiness.check(orchestrator)  # type: ignore[arg-type]
+    assert response.status == "ready"
+
+    ticket = admission.admit(orchestrator, TaskCost())  # type: ignore[arg-type]
+    response = await readiness.check(orchestrator)  # type: ignore[arg-type]
+    assert response.status == "not_ready"
+    assert response.checks["queue"] is False
+
+    admission.cancel(ticket)
+    response = await readiness.check(orchestrator)  # type: ignore[arg-type]
+    assert response.status == "ready"
+    await readiness.stop()
+
+
+@pytest.mark.asyncio
+async def test_count_rq_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    from rq import Queue, Worker
+
+    from docling_serve.orchestrator_factory import RQWorkersMixin, count_workers
+
+    connection = fakeredis.FakeStrictRedis()
+    orchestrator = RQWorkersMixin()
+    orchestrator._rq_queue = Queue("convert", connection=connection)
+    assert await count_workers(orchestrator) == 0  # type: ignore[arg-type]
+
+    worker = Worker([orchestrator._rq_queue], connection=connection)
+    worker.register_birth()
+    assert await count_workers(orchestrator) == 1  # type: ignore[arg-type]
+
+    worker.register_death()
+    assert await count_workers(orchestrator) == 0  # type: ignore[arg-type]
+    assert await count_workers(SlowOrchestrator()) is None  # type: ignore[arg-type]
@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+import redis
+import redis.asyncio
+from rq.job import JobStatus
+from rq.results import Result
+
+from docling_jobkit.datamodel.task import Task
+from docling_jobkit.datamodel.task_meta import TaskStatus, TaskType
+from docling_jobkit.orchestrators.rq.orchestrator import (
+    RQOrchestrator,
+    RQOrchestratorConfig,
+)
+
+from docling_serve.orchestrator_factory import RedisTaskStatusMixin
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class RedisAwareRQOrchestrator(RedisTaskStatusMixin, RQOrchestrator):  # type: ignore[misc]
+    pass
+
+
+class RoundTripCounter:
+    """Count the commands (or pipelines) sent to Redis by all the clients."""
+
+    def __init__(self, monkeypatch):
+        self.count = 0
+        for cls in (
+            redis.connection.AbstractConnection,
+            redis.asyncio.connection.AbstractConnection,
+        ):
+            send_packed_command = cls.send_packed_command
+
+            def _counted(conn, *args, _send=send_packed_command, **kwargs):
+                self.count += 1
+                return _send(conn, *args, **kwargs)
+
+            monkeypatch.setattr(cls, "send_packed_command", _counted)
+
+
+@pytest.fixture
+def orchestrator(tmp_path):
+    server = fakeredis.FakeServer()
+    config = RQOrchestratorConfig(
+        redis_url="redis://localhost:6379/", scratch_dir=tmp_path
+    )
+    orchestrator = RedisAwareRQOrchestrator(config=config)
+
+    orchestrator._redis_conn = fakeredis.FakeStrictRedis(server=server)
+    orchestrator._rq_queue.connection = orchestrator._redis_conn
+    orchestrator._async_redis_conn = fakeredis.FakeAsyncRedis(server=server)
+    orchestrator._redis_pool = fakeredis.FakeAsyncRedis(server=server).connection_pool
+    return orchestrator
+
+
+def _make_jobs(orchestrator, num_jobs: int) -> list[str]:
+    """Create queued, started and finished jobs in RQ."""
+    task_ids = []
+    for i in range(num_jobs):
+        task_id = f"task-{i}"
+        job = orchestrator._rq_queue.enqueue("os.getcwd", job_id=task_id)
+        if i % 3 == 1:
+            job.set_status(JobStatus.STARTED)
+        elif i % 3 == 2:
+            job.set_status(JobStatus.FINISHED)
+            Result.create(
+                job,
+                Result.Type.SUCCESSFUL,
+                ttl=500,
+                return_value=f"docling:results:{task_id}",
+            )
+        orchestrator.tasks[task_id] = Task(
+            task_id=task_id, task_type=TaskType.CONVERT, task_status=TaskStatus.PENDING
+        )
+        task_ids.append(task_id)
+    return task_ids
+
+
+@pytest.mark.asyncio
+async def test_task_status_round_trips(orchestrator, monkeypatch):
+    """Each status lookup costs a fixed number of round trips."""
+
+    num_jobs = 60
+    task_ids = _make_jobs(orchestrator, num_jobs)
+
+    # Open the connections before counting
+    await orchestrator.task_status(task_ids[0])
+
+    # The ended jobs are resolved once, by the lookups of the RQ orchestrator
+    counter = RoundTripCounter(monkeypatch)
+    await orchestrator.task_status_many(task_ids)
+    num_ended = num_jobs // 3
+    assert counter.count <= 2 + 3 * num_ended
+
+    counter.count = 0
+    for task_id in task_ids:
+        await orchestrator.task_status(task_id)
+    single_round_trips = counter.count / num_jobs
+
+    counter.count = 0
+    tasks = await orchestrator.task_status_many(task_ids)
+    many_round_trips = counter.count
+
+    assert single_round_trips <= 2
+    assert many_round_trips <= 2
+
+    statuses = [tasks[task_id].task_status for task_id in task_ids]
+    assert statuses[:3] == [TaskStatus.PENDING, TaskStatus.STARTED, TaskStatus.SUCCESS]
+    assert orchestrator._task_result_keys["task-2"] == "docling:results:task-2"
+
+
+@pytest.mark.asyncio
+async def test_task_status_from_other_instance(orchestrator):
+    """Tasks created by another instance are found via the Redis metadata."""
+
+    task_ids = _make_jobs(orchestrator, 3)
+    await orchestrator.task_status_many(task_ids)
+
+    other = RedisAwareRQOrchestrator(config=orchestrator.config)
+    other._redis_conn = orchestrator._redis_conn
+    other._redis_pool = orchestrator._redis_pool
+
+    tasks = await other.task_status_many([*task_ids, "unknown-task"])
+    assert "unknown-task" not in tasks
+    assert tasks["task-2"].task_status == TaskStatus.SUCCESS
+    assert tasks["task-1"].task_type == TaskType.CONVERT
+
+    # The result key is shared via Redis
+    async with redis.asyncio.Redis(connection_pool=other._redis_pool) as r:
+        result_key = await r.get("docling:tasks:task-2:result_key")
+    assert result_key == b"docling:results:task-2"
+
+
+@pytest.mark.asyncio
+async def test_task_status_cache(orchestrator, monkeypatch):
+    """Concurrent polls of the same task share one backend lookup."""
+
+    task_ids = _make_jobs(orchestrator, 2)
+    await orchestrator.task_status(task_ids[1])
+    orchestrator.task_status_cache.invalidate(task_ids[1])
+
+    counter = RoundTripCounter(monkeypatch)
+    tasks = await asyncio.gather(
+        *(orchestrator.task_status(task_ids[1]) for _ in range(100))
+    )
+    assert all(task.task_status == TaskStatus.STARTED for task in tasks)
+    assert counter.count <= 2
+
+    status_cache = orchestrator.task_status_cache
+    assert status_cache.coalesced == 99
+
+    # Cached within the ttl
+    await orchestrator.task_status(task_ids[1])
+    assert counter.count <= 2
+    assert status_cache.hits == 1
+
+    # Expired after the ttl
+    await asyncio.sleep(status_cache.ttl)
+    await orchestrator.task_status(task_ids[1])
+    assert counter.count > 2
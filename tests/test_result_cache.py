@@ -0,0 +1,284 @@
+import asyncio
+import base64
+import threading
+import time
+
+import pytest
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from docling.datamodel.base_models import ConversionStatus
+from docling_jobkit.datamodel.http_inputs import FileSource, HttpSource
+from docling_jobkit.datamodel.result import DoclingTaskResult, ExportResult
+from docling_jobkit.datamodel.task_meta import TaskType
+from docling_jobkit.datamodel.task_targets import InBodyTarget, ZipTarget
+
+from docling_serve.app import create_app
+from docling_serve.datamodel.convert import ConvertDocumentsRequestOptions
+from docling_serve.result_cache import (
+    CacheControl,
+    DiskResultCache,
+    MemoryResultCache,
+    get_result_cache,
+    make_cache_key,
+)
+from docling_serve.settings import ResultCacheKind, docling_serve_settings
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    return asyncio.get_event_loop()
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    headers = {}
+    if docling_serve_settings.api_key:
+        headers["X-Api-Key"] = docling_serve_settings.api_key
+    return headers
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app():
+    app = create_app()
+
+    async with LifespanManager(app) as manager:
+        print("Launching lifespan of app.")
+        yield manager.app
+
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    monkeypatch.setattr(
+        docling_serve_settings, "result_cache_kind", ResultCacheKind.MEMORY
+    )
+    get_result_cache.cache_clear()
+    yield get_result_cache()
+    get_result_cache.cache_clear()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://app.io"
+    ) as client:
+        print("Client is ready")
+        yield client
+
+
+def _file_source(content: bytes, filename: str = "doc.md") -> FileSource:
+    return FileSource(
+        base64_string=base64.b64encode(content).decode(), filename=filename
+    )
+
+
+def _task_result(content: str) -> DoclingTaskResult:
+    return DoclingTaskResult.model_validate(
+        {
+            "result": ExportResult(
+                content={"filename": "doc.md", "md_content": content},
+                status="success",
+            ),
+            "processing_time": 0.1,
+            "num_converted": 1,
+            "num_succeeded": 1,
+            "num_failed": 0,
+        }
+    )
+
+
+def test_cache_key():
+    options = ConvertDocumentsRequestOptions()
+    key_args = {
+        "task_type": TaskType.CONVERT,
+        "convert_options": options,
+        "chunking_options": None,
+        "chunking_export_options": None,
+        "target": InBodyTarget(),
+    }
+
+    key = make_cache_key(sources=[_file_source(b"# Doc")], **key_args)
+    assert key is not None
+    assert key == make_cache_key(sources=[_file_source(b"# Doc")], **key_args)
+    assert key != make_cache_key(sources=[_file_source(b"# Other")], **key_args)
+    assert key != make_cache_key(
+        sources=[_file_source(b"# Doc")],
+        **{**key_args, "convert_options": options.model_copy(update={"do_ocr": False})},
+    )
+    assert key != make_cache_key(
+        sources=[_file_source(b"# Doc")], **{**key_args, "target": ZipTarget()}
+    )
+
+    # Remote content is never cached
+    assert (
+        make_cache_key(
+            sources=[HttpSource(url="https://example.com/doc.pdf")], **key_args
+        )
+        is None
+    )
+
+
+def test_cache_control():
+    assert CacheControl.from_header(None) == CacheControl(lookup=True, store=True)
+    assert CacheControl.from_header("no-cache") == CacheControl(
+        lookup=False, store=True
+    )
+    assert CacheControl.from_header("max-age=0, No-Store") == CacheControl(
+        lookup=False, store=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_eviction():
+    result = _task_result("x" * 1000)
+    cache = MemoryResultCache(max_size=10_000)
+    control = CacheControl()
+
+    for i in range(20):
+        await cache.set(f"key{i}", result, control)
+    assert cache.size <= cache.max_size
+    assert await cache.get("key0", control) is None
+    cached = await cache.get("key19", control)
+    assert cached is not None
+    assert cached.result.content.md_content == result.result.content.md_content
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    await cache.get("key19", CacheControl(lookup=False))
+    assert cache.bypassed == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_serialization_off_loop(monkeypatch):
+    """The results are encoded and decoded out of the event loop."""
+
+    from docling_serve import result_cache
+
+    threads: list[int] = []
+
+    def record(func):
+        def wrapper(*args):
+            threads.append(threading.get_ident())
+            return func(*args)
+
+        return wrapper
+
+    monkeypatch.setattr(result_cache, "_pack_result", record(result_cache._pack_result))
+    monkeypatch.setattr(
+        result_cache, "_unpack_result", record(result_cache._unpack_result)
+    )
+
+    cache = MemoryResultCache(max_size=10_000)
+    control = CacheControl()
+    await cache.set("key", _task_result("# Doc"), control)
+    assert await cache.get("key", control) is not None
+
+    assert len(threads) == 2
+    assert threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_failed_results_not_cached():
+    cache = MemoryResultCache(max_size=10_000)
+    control = CacheControl()
+
+    partial = _task_result("# Doc")
+    partial.result.status = ConversionStatus.PARTIAL_SUCCESS  # type: ignore[union-attr]
+    await cache.set("partial", partial, control)
+    failed = _task_result("")
+    failed.num_succeeded, failed.num_failed = 0, 1
+    await cache.set("failed", failed, control)
+    assert cache.stored == 0
+    assert await cache.get("partial", control) is None
+
+    await cache.set("success", _task_result("# Doc"), control)
+    assert cache.stored == 1
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_eviction(tmp_path):
+    result = _task_result("x" * 1000)
+    cache = DiskResultCache(cache_dir=tmp_path, max_size=10_000)
+    control = CacheControl()
+
+    for i in range(20):
+        await cache.set(f"key{i}", result, control)
+        # Make the modification times distinct for the LRU order
+        time.sleep(0.01)
+    assert sum(p.stat().st_size for p in tmp_path.iterdir()) <= cache.max_size
+    assert await cache.get("key0", control) is None
+    assert await cache.get("key19", control) is not None
+
+    await cache.clear()
+    assert await cache.get("key19", control) is None
+
+
+@pytest.mark.asyncio
+async def test_disk_cache_clear_off_loop(tmp_path):
+    """Clearing waits for a write in progress without blocking the event loop."""
+
+    cache = DiskResultCache(cache_dir=tmp_path, max_size=10_000)
+    control = CacheControl()
+    await cache.set("key", _task_result("# Doc"), control)
+
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    beating = asyncio.create_task(heartbeat())
+    # A write holding the lock
+    cache._lock.acquire()
+    threading.Timer(0.2, cache._lock.release).start()
+    try:
+        await cache.clear()
+    finally:
+        beating.cancel()
+
+    assert ticks >= 5
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_convert_cached(
+    client: AsyncClient, auth_headers: dict, memory_cache: MemoryResultCache
+):
+    """Repeated sync conversions of the same input are served from the cache."""
+
+    payload = {
+        "options": {
+            "from_formats": ["md"],
+            "to_formats": ["md"],
+        },
+        "sources": [
+            {
+                "kind": "file",
+                "base64_string": base64.b64encode(
+                    b"# Cached document\n\nSome text."
+                ).decode(),
+                "filename": "cached.md",
+            }
+        ],
+    }
+
+    for headers in ({}, {}, {"Cache-Control": "no-cache"}):
+        response = await client.post(
+            "/v1/convert/source", json=payload, headers={**auth_headers, **headers}
+        )
+        assert response.status_code == 200, "Response should be 200 OK"
+        assert "Cached document" in response.json()["document"]["md_content"]
+
+    response = await client.get("/v1/cache/stats", headers=auth_headers)
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["kind"] == "memory"
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["bypassed"] == 1
+    assert stats["stored"] == 2
+
+    response = await client.get("/v1/clear/cache", headers=auth_headers)
+    assert response.status_code == 200
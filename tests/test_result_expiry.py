@@ -0,0 +1,188 @@
+import asyncio
+import contextlib
+import threading
+
+import pytest
+from fastapi import BackgroundTasks
+
+from docling.datamodel.document import ConversionStatus
+from docling_jobkit.datamodel.result import (
+    DoclingTaskResult,
+    ExportDocumentResponse,
+    ExportResult,
+)
+
+from docling_serve.response_preparation import prepare_response
+from docling_serve.result_expiry import (
+    RedisExpiryStore,
+    ResultExpiryScheduler,
+    get_result_expiry,
+)
+from docling_serve.settings import docling_serve_settings
+
+
+class FakeOrchestrator:
+    def __init__(self):
+        self.deleted: list[str] = []
+
+    async def delete_task(self, task_id: str):
+        self.deleted.append(task_id)
+
+
+@pytest.fixture
+def result_expiry(monkeypatch):
+    monkeypatch.setattr(docling_serve_settings, "single_use_results", True)
+    get_result_expiry.cache_clear()
+    yield get_result_expiry()
+    get_result_expiry.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_result_expiry_stress(result_expiry, monkeypatch):
+    """Serving many results does not add one sleeping task per result."""
+
+    monkeypatch.setattr(docling_serve_settings, "result_removal_delay", 2)
+    orchestrator = FakeOrchestrator()
+    # The scheduler loop, and its timed wait
+    num_tasks = len(asyncio.all_tasks()) + 2
+    expiry_task = asyncio.create_task(result_expiry.run(orchestrator))  # type: ignore[arg-type]
+
+    task_result = DoclingTaskResult(
+        result=ExportResult(
+            content=ExportDocumentResponse(filename="doc.md", md_content="# Doc"),
+            status=ConversionStatus.SUCCESS,
+        ),
+        processing_time=0.1,
+        num_converted=1,
+        num_succeeded=1,
+        num_failed=0,
+    )
+
+    num_results = 50_000
+    for i in range(num_results):
+        background_tasks = BackgroundTasks()
+        await prepare_response(
+            task_id=f"task-{i}",
+            task_result=task_result,
+            orchestrator=orchestrator,  # type: ignore[arg-type]
+            background_tasks=background_tasks,
+        )
+        await background_tasks()
+
+    assert len(asyncio.all_tasks()) <= num_tasks
+    # Some results may already be removed
+    assert result_expiry.pending + result_expiry.expired == num_results
+
+    for _ in range(100):
+        if result_expiry.pending == 0:
+            break
+        await asyncio.sleep(0.1)
+
+    assert result_expiry.pending == 0
+    assert result_expiry.expired == num_results
+    assert len(orchestrator.deleted) == num_results
+    assert len(asyncio.all_tasks()) <= num_tasks
+
+    expiry_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await expiry_task
+
+
+@pytest.mark.asyncio
+async def test_result_expiry_background_tasks(result_expiry, monkeypatch):
+    """The deadlines scheduled by the responses are pushed on the event loop."""
+
+    monkeypatch.setattr(docling_serve_settings, "result_removal_delay", 0.1)
+    orchestrator = FakeOrchestrator()
+    expiry_task = asyncio.create_task(result_expiry.run(orchestrator))  # type: ignore[arg-type]
+    # The scheduler waits without deadline
+    await asyncio.sleep(0.05)
+
+    push_threads: list[int] = []
+    push = result_expiry._push
+
+    def recording_push(task_id: str, deadline: float) -> bool:
+        push_threads.append(threading.get_ident())
+        return push(task_id, deadline)
+
+    monkeypatch.setattr(result_expiry, "_push", recording_push)
+
+    task_result = DoclingTaskResult(
+        result=ExportResult(
+            content=ExportDocumentResponse(filename="doc.md", md_content="# Doc"),
+            status=ConversionStatus.SUCCESS,
+        ),
+        processing_time=0.1,
+        num_converted=1,
+        num_succeeded=1,
+        num_failed=0,
+    )
+    background_tasks = BackgroundTasks()
+    await prepare_response(
+        task_id="task-1",
+        task_result=task_result,
+        orchestrator=orchestrator,  # type: ignore[arg-type]
+        background_tasks=background_tasks,
+    )
+    await background_tasks()
+
+    assert push_threads == [threading.get_ident()]
+    # The scheduler is woken up for the new deadline
+    await asyncio.sleep(0.5)
+    assert orchestrator.deleted == ["task-1"]
+
+    expiry_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await expiry_task
+
+
+@pytest.mark.asyncio
+async def test_result_expiry_earliest_deadline():
+    """A result served again keeps its earliest deadline."""
+
+    result_expiry = ResultExpiryScheduler()
+    await result_expiry.schedule("task-1", delay=100)
+    await result_expiry.schedule("task-1", delay=0)
+    await result_expiry.schedule("task-1", delay=50)
+    assert result_expiry.pending == 1
+
+    orchestrator = FakeOrchestrator()
+    assert await result_expiry.expire_due(orchestrator) == 1  # type: ignore[arg-type]
+    assert orchestrator.deleted == ["task-1"]
+    assert result_expiry.pending == 0
+    assert result_expiry.next_expiry() is None
+
+
+@pytest.mark.asyncio
+async def test_result_expiry_restart():
+    """The deadlines kept in Redis are loaded by the next instance."""
+
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+
+    def make_store() -> RedisExpiryStore:
+        store = RedisExpiryStore(redis_url="redis://localhost:6379/")
+        store._redis_pool = fakeredis.FakeAsyncRedis(server=server).connection_pool
+        return store
+
+    result_expiry = ResultExpiryScheduler(store=make_store())
+    await result_expiry.schedule("task-1", delay=0.2)
+    await result_expiry.schedule("task-2", delay=3600)
+    expiry_task = asyncio.create_task(result_expiry.run(FakeOrchestrator()))  # type: ignore[arg-type]
+    await asyncio.sleep(0.05)
+    # The instance stops before the removal
+    expiry_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await expiry_task
+
+    result_expiry = ResultExpiryScheduler(store=make_store())
+    orchestrator = FakeOrchestrator()
+    expiry_task = asyncio.create_task(result_expiry.run(orchestrator))  # type: ignore[arg-type]
+    await asyncio.sleep(0.5)
+    expiry_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await expiry_task
+
+    assert orchestrator.deleted == ["task-1"]
+    assert result_expiry.pending == 1
+    assert [task_id for _, task_id in await make_store().load()] == ["task-2"]
@@ -0,0 +1,136 @@
+import asyncio
+import json
+from io import BytesIO
+
+import pytest
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from docling_serve.app import create_app
+from docling_serve.settings import docling_serve_settings
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    return asyncio.get_event_loop()
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    headers = {}
+    if docling_serve_settings.api_key:
+        headers["X-Api-Key"] = docling_serve_settings.api_key
+    return headers
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app():
+    app = create_app()
+
+    async with LifespanManager(app) as manager:
+        print("Launching lifespan of app.")
+        yield manager.app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://app.io"
+    ) as client:
+        print("Client is ready")
+        yield client
+
+
+def make_html(title: str) -> bytes:
+    return f"<html><body><h1>{title}</h1><p>Some text.</p></body></html>".encode()
+
+
+async def convert(
+    client: AsyncClient,
+    auth_headers: dict,
+    titles: list[str],
+    to_formats: list[str],
+    target_type: str = "inbody",
+) -> str:
+    response = await client.post(
+        "/v1/convert/file/async",
+        data={"to_formats": to_formats, "target_type": target_type},
+        files=[
+            ("files", (f"{title}.html", BytesIO(make_html(title)), "text/html"))
+            for title in titles
+        ],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    task_id = response.json()["task_id"]
+
+    response = await client.get(
+        f"/v1/status/poll/{task_id}", params={"wait": 30}, headers=auth_headers
+    )
+    assert response.json()["task_status"] == "success", response.text
+    return task_id
+
+
+@pytest.mark.asyncio
+async def test_result_export(client: AsyncClient, auth_headers: dict):
+    task_id = await convert(client, auth_headers, ["intro"], ["md", "json"])
+
+    response = await client.get(f"/v1/result/{task_id}/md", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "text/markdown; charset=utf-8"
+    assert response.headers["content-disposition"] == 'inline; filename="intro.md"'
+    assert response.text.startswith("# intro")
+
+    response = await client.get(f"/v1/result/{task_id}/json", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.text)["name"] == "intro"
+
+    # Computed from the DoclingDocument
+    response = await client.get(
+        f"/v1/result/{task_id}/text",
+        params={"document": "intro.html"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert "Some text." in response.text
+
+    response = await client.get(
+        f"/v1/result/{task_id}/md", params={"document": "other"}, headers=auth_headers
+    )
+    assert response.status_code == 404, response.text
+
+
+@pytest.mark.asyncio
+async def test_result_export_not_requested(client: AsyncClient, auth_headers: dict):
+    task_id = await convert(client, auth_headers, ["intro"], ["md"])
+
+    response = await client.get(f"/v1/result/{task_id}/html", headers=auth_headers)
+    assert response.status_code == 404, response.text
+
+
+@pytest.mark.asyncio
+async def test_result_export_archive(client: AsyncClient, auth_headers: dict):
+    task_id = await convert(
+        client, auth_headers, ["intro", "outro"], ["md", "json"], target_type="zip"
+    )
+
+    response = await client.get(f"/v1/result/{task_id}/md", headers=auth_headers)
+    assert response.status_code == 400, response.text
+    assert "intro, outro" in response.json()["detail"]
+
+    response = await client.get(
+        f"/v1/result/{task_id}/md", params={"document": "outro"}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.text.startswith("# outro")
+
+    response = await client.get(
+        f"/v1/result/{task_id}/html",
+        params={"document": "intro.html"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "text/html; charset=utf-8"
+    assert "<h1>intro</h1>" in response.text
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+# Modules loaded by the server only, the CLI imports them when it starts it
+SERVER_MODULES = ["uvicorn", "fastapi", "docling", "docling_jobkit", "torch"]
+
+
+def import_times(*args: str) -> tuple[subprocess.CompletedProcess, dict[str, float]]:
+    """Run python with `-X importtime`, returns the cumulative times in seconds
+    of the imported modules."""
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1e6
+    return process, times
+
+
+def test_cli_imports():
+    """The CLI starts without importing the server modules."""
+    process, times = import_times("-c", "import docling_serve.__main__")
+    assert process.returncode == 0, process.stderr
+
+    assert "docling_serve.__main__" in times
+    assert [name for name in SERVER_MODULES if name in times] == []
+
+
+def test_cli_version():
+    process, times = import_times("-m", "docling_serve", "--version")
+    assert process.returncode == 0, process.stderr
+    assert "Docling Serve version" in process.stdout
+    assert [name for name in SERVER_MODULES if name in times] == []
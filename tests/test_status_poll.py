@@ -0,0 +1,103 @@
+import asyncio
+import time
+from io import BytesIO
+
+import pypdfium2 as pdfium
+import pytest
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from docling_serve.app import create_app
+from docling_serve.orchestrator_factory import get_async_orchestrator
+from docling_serve.settings import docling_serve_settings
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    return asyncio.get_event_loop()
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    headers = {}
+    if docling_serve_settings.api_key:
+        headers["X-Api-Key"] = docling_serve_settings.api_key
+    return headers
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app():
+    app = create_app()
+
+    async with LifespanManager(app) as manager:
+        print("Launching lifespan of app.")
+        yield manager.app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://app.io"
+    ) as client:
+        print("Client is ready")
+        yield client
+
+
+def make_pdf(num_pages: int) -> bytes:
+    pdf = pdfium.PdfDocument.new()
+    for _ in range(num_pages):
+        pdf.new_page(200, 200)
+    buf = BytesIO()
+    pdf.save(buf)
+    pdf.close()
+    return buf.getvalue()
+
+
+@pytest.mark.asyncio
+async def test_status_poll_waits(client: AsyncClient, auth_headers: dict):
+    """The long polling returns as soon as the task is completed."""
+
+    # The source cannot be fetched, the task fails once started
+    response = await client.post(
+        "/v1/convert/source/async",
+        json={"sources": [{"kind": "http", "url": "http://localhost:1/doc.pdf"}]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    task_id = response.json()["task_id"]
+
+    start_time = time.monotonic()
+    response = await client.get(
+        f"/v1/status/poll/{task_id}", params={"wait": 10}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["task_status"] == "failure"
+    assert time.monotonic() - start_time < 5
+
+
+@pytest.mark.asyncio
+async def test_file_upload_form(client: AsyncClient, auth_headers: dict):
+    """The multipart upload used by the UI, with its options as form fields."""
+
+    response = await client.post(
+        "/v1/convert/file/async",
+        data={
+            "to_formats": ["md", "json"],
+            "do_ocr": False,
+            "ocr_lang": ["en", "fr"],
+            "abort_on_error": True,
+            "target_type": "zip",
+        },
+        files=[("files", ("doc.pdf", BytesIO(make_pdf(1))))],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    task_id = response.json()["task_id"]
+
+    task = get_async_orchestrator().tasks[task_id]
+    assert task.convert_options is not None
+    assert [f.value for f in task.convert_options.to_formats] == ["md", "json"]
+    assert task.convert_options.do_ocr is False
+    assert task.convert_options.ocr_lang == ["en", "fr"]
+    assert task.target.kind == "zip"
@@ -0,0 +1,101 @@
+import asyncio
+import base64
+import statistics
+import time
+
+import pytest
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from docling_serve.app import create_app
+from docling_serve.orchestrator_factory import get_async_orchestrator
+from docling_serve.settings import docling_serve_settings
+from docling_serve.websocket_notifier import WebsocketNotifier
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    return asyncio.get_event_loop()
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    headers = {}
+    if docling_serve_settings.api_key:
+        headers["X-Api-Key"] = docling_serve_settings.api_key
+    return headers
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app():
+    app = create_app()
+
+    async with LifespanManager(app) as manager:
+        yield manager.app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://app.io"
+    ) as client:
+        yield client
+
+
+async def measure_sync_latencies(
+    client: AsyncClient, auth_headers: dict, num_requests: int
+) -> list[float]:
+    payload = {
+        "options": {
+            "from_formats": ["md"],
+            "to_formats": ["md"],
+        },
+        "sources": [
+            {
+                "kind": "file",
+                "base64_string": base64.b64encode(
+                    b"# Small document\n\nSome text."
+                ).decode(),
+                "filename": "small.md",
+            }
+        ],
+    }
+
+    latencies = []
+    for _ in range(num_requests):
+        start_time = time.monotonic()
+        response = await client.post(
+            "/v1/convert/source", json=payload, headers=auth_headers
+        )
+        latencies.append(time.monotonic() - start_time)
+        assert response.status_code == 200, "Response should be 200 OK"
+    return latencies
+
+
+def percentile(values: list[float], pct: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+@pytest.mark.asyncio
+async def test_sync_latency(client: AsyncClient, auth_headers: dict, monkeypatch):
+    """Compare the sync latency with completion notifications and with polling."""
+
+    num_requests = 10
+    notifier = get_async_orchestrator().notifier
+    assert isinstance(notifier, WebsocketNotifier)
+
+    # Warm up the converter for markdown inputs
+    await measure_sync_latencies(client, auth_headers, num_requests=1)
+
+    notified = await measure_sync_latencies(client, auth_headers, num_requests)
+
+    # Emulate the previous fixed-interval polling
+    async def _poll(task_id: str, timeout: float):
+        await asyncio.sleep(min(docling_serve_settings.sync_poll_interval, timeout))
+
+    monkeypatch.setattr(notifier, "wait_task_completed", _poll)
+    polled = await measure_sync_latencies(client, auth_headers, num_requests)
+
+    assert percentile(notified, 50) < percentile(polled, 50)
+    assert percentile(notified, 99) < docling_serve_settings.sync_poll_interval
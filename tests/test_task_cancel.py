@@ -0,0 +1,358 @@
+import asyncio
+import json
+import threading
+from io import BytesIO
+
+import pypdfium2 as pdfium
+import pytest
+import pytest_asyncio
+from asgi_lifespan import LifespanManager
+from httpx import ASGITransport, AsyncClient
+
+from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.document import InputDocument
+from docling_jobkit.datamodel.http_inputs import HttpSource
+from docling_jobkit.datamodel.task_meta import TaskStatus
+from docling_jobkit.datamodel.task_targets import InBodyTarget
+
+from docling_serve.app import create_app
+from docling_serve.cancellation import (
+    CancellableTaskQueue,
+    TaskCancelledError,
+    _until_cancelled,
+    cancel_key,
+    cancellable_backend,
+    current_cancel_event,
+)
+from docling_serve.orchestrator_factory import cancel_task, get_async_orchestrator
+from docling_serve.settings import docling_serve_settings
+from docling_serve.websocket_notifier import WebsocketNotifier
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    return asyncio.get_event_loop()
+
+
+@pytest.fixture(scope="session")
+def auth_headers():
+    headers = {}
+    if docling_serve_settings.api_key:
+        headers["X-Api-Key"] = docling_serve_settings.api_key
+    return headers
+
+
+@pytest_asyncio.fixture(scope="session")
+async def app():
+    app = create_app()
+
+    async with LifespanManager(app) as manager:
+        print("Launching lifespan of app.")
+        yield manager.app
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(app):
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://app.io"
+    ) as client:
+        print("Client is ready")
+        yield client
+
+
+def make_html(i: int) -> bytes:
+    rows = "".join(f"<tr><td>{i}-{r}</td><td>cell {r}</td></tr>" for r in range(200))
+    return f"<html><body><h1>Doc {i}</h1><table>{rows}</table></body></html>".encode()
+
+
+def make_pdf(num_pages: int) -> bytes:
+    pdf = pdfium.PdfDocument.new()
+    for _ in range(num_pages):
+        pdf.new_page(200, 200)
+    buf = BytesIO()
+    pdf.save(buf)
+    pdf.close()
+    return buf.getvalue()
+
+
+def test_cancellable_backend():
+    """The pages of a cancelled task are not loaded anymore."""
+
+    backend = cancellable_backend(PyPdfiumDocumentBackend)
+    assert cancellable_backend(PyPdfiumDocumentBackend) is backend
+
+    cancel_event = threading.Event()
+    token = current_cancel_event.set(cancel_event)
+    try:
+        in_doc = InputDocument(
+            path_or_stream=BytesIO(make_pdf(3)),
+            format=InputFormat.PDF,
+            backend=backend,
+            filename="doc.pdf",
+        )
+    finally:
+        current_cancel_event.reset(token)
+
+    # The pipeline threads load the pages without the context of the task
+    doc_backend = in_doc._backend
+    assert isinstance(doc_backend, PyPdfiumDocumentBackend)
+    result: list = []
+    thread = threading.Thread(target=lambda: result.append(doc_backend.load_page(0)))
+    thread.start()
+    thread.join()
+    assert result[0].is_valid()
+    result[0].unload()
+
+    cancel_event.set()
+    with pytest.raises(TaskCancelledError):
+        doc_backend.load_page(1)
+    doc_backend.unload()
+
+
+def test_until_cancelled():
+    cancel_event = threading.Event()
+    results = _until_cancelled(iter(["doc-0", "doc-1", "doc-2"]), cancel_event)  # type: ignore[arg-type]
+    assert next(results) == "doc-0"
+    cancel_event.set()
+    with pytest.raises(TaskCancelledError):
+        next(results)
+
+
+@pytest.mark.asyncio
+async def test_cancellable_task_queue():
+    queue = CancellableTaskQueue()
+    for i in range(3):
+        await queue.put(f"task-{i}")
+
+    async def worker() -> tuple[str, threading.Event | None]:
+        task_id = await queue.get()
+        return task_id, current_cancel_event.get()
+
+    task_id, cancel_event = await asyncio.create_task(worker())
+    assert task_id == "task-0"
+    assert cancel_event is not None
+
+    assert queue.revoke("task-1")
+    assert not queue.revoke("task-0")
+    assert queue.qsize() == 1
+
+    assert queue.cancel("task-0")
+    assert cancel_event.is_set()
+    assert not queue.cancel("task-1")
+
+
+@pytest.mark.asyncio
+async def test_cancel_local_task():
+    # A separate orchestrator, without workers, so the tasks stay queued
+    orchestrator = get_async_orchestrator.__wrapped__()
+    tasks = [
+        await orchestrator.enqueue(
+            sources=[HttpSource(url="https://example.com/doc.pdf")],
+            target=InBodyTarget(),
+        )
+        for _ in range(3)
+    ]
+
+    assert await cancel_task(orchestrator, tasks[1].task_id)
+    assert tasks[1].task_status == TaskStatus.FAILURE
+    assert await orchestrator.get_queue_position(tasks[2].task_id) == 2
+    assert await orchestrator.queue_size() == 2
+
+    # A dispatched task is stopped by its worker
+    assert await orchestrator.task_queue.get() == tasks[0].task_id
+    assert await cancel_task(orchestrator, tasks[0].task_id)
+    assert orchestrator.fair_queue.cancel_events[tasks[0].task_id].is_set()  # type: ignore[attr-defined]
+
+    # Completed tasks are not cancelled
+    assert not await cancel_task(orchestrator, tasks[1].task_id)
+
+
+class FakeSubscriber:
+    evicted = False
+
+    def __init__(self):
+        self.sent: list[str] = []
+        self.closed = False
+
+    def send(self, text: str):
+        self.sent.append(text)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_cancel_rq_task(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    # The scripts of the fair share queue run in the Lua runtime of fakeredis
+    pytest.importorskip("lupa")
+    from docling_jobkit.orchestrators.rq.orchestrator import (
+        RQOrchestrator,
+        RQOrchestratorConfig,
+    )
+
+    from docling_serve.orchestrator_factory import (
+        CancellableRQMixin,
+        FairShareRQMixin,
+    )
+
+    class CancellableRQOrchestrator(  # type: ignore[misc]
+        CancellableRQMixin, FairShareRQMixin, RQOrchestrator
+    ):
+        pass
+
+    config = RQOrchestratorConfig(
+        redis_url="redis://localhost:6379/", scratch_dir=tmp_path
+    )
+    orchestrator = CancellableRQOrchestrator(config=config)
+    orchestrator._redis_conn = fakeredis.FakeStrictRedis()
+    orchestrator._rq_queue.connection = orchestrator._redis_conn
+    notifier = WebsocketNotifier(orchestrator)
+    orchestrator.bind_notifier(notifier)
+
+    task_ids = []
+    for _ in range(3):
+        task = await orchestrator.enqueue(
+            sources=[HttpSource(url="https://example.com/doc.pdf")],
+            target=InBodyTarget(),
+        )
+        task_ids.append(task.task_id)
+
+    subscriber = FakeSubscriber()
+    notifier.task_subscribers[task_ids[1]].add(subscriber)  # type: ignore[arg-type]
+
+    # The queued job is removed from the queue, its subscribers are notified
+    assert await cancel_task(orchestrator, task_ids[1])
+    assert orchestrator._rq_queue.get_job_ids() == [task_ids[0], task_ids[2]]
+    assert (await orchestrator.task_status(task_ids[1])).task_status == (
+        TaskStatus.FAILURE
+    )
+    assert notifier.task_completed[task_ids[1]].is_set()
+    assert [json.loads(text)["task"]["task_status"] for text in subscriber.sent] == [
+        "failure"
+    ]
+    assert subscriber.closed
+
+    # The running job is asked to stop
+    job = orchestrator._rq_queue.fetch_job(task_ids[0])
+    assert orchestrator._rq_queue.pop_job_id() == task_ids[0]
+    job.set_status("started")
+    assert await cancel_task(orchestrator, task_ids[0])
+    assert orchestrator._redis_conn.exists(cancel_key(task_ids[0]))
+    assert orchestrator._rq_queue.get_job_ids() == [task_ids[2]]
+
+
+@pytest.mark.asyncio
+async def test_delete_task(client: AsyncClient, auth_headers: dict):
+    response = await client.delete("/v1/task/unknown", headers=auth_headers)
+    assert response.status_code == 404
+
+    # The source cannot be fetched, the task fails right away
+    response = await client.post(
+        "/v1/convert/source/async",
+        json={"sources": [{"kind": "http", "url": "http://localhost:1/doc.pdf"}]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    task_id = response.json()["task_id"]
+
+    response = await client.delete(f"/v1/task/{task_id}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["task_id"] == task_id
+
+    # Deleted right away when completed, or once the worker stopped it
+    for _ in range(100):
+        response = await client.get(f"/v1/status/poll/{task_id}", headers=auth_headers)
+        if response.status_code == 404:
+            break
+        await asyncio.sleep(0.1)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_running_task(client: AsyncClient, auth_headers: dict):
+    """A running local conversion is stopped by its worker."""
+
+    # Converted in about a second, the documents are checked one by one
+    response = await client.post(
+        "/v1/convert/file/async",
+        data={"to_formats": ["md"], "target_type": "zip"},
+        files=[
+            ("files", (f"doc-{i}.html", BytesIO(make_html(i)), "text/html"))
+            for i in range(40)
+        ],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200, response.text
+    task_id = response.json()["task_id"]
+    task = get_async_orchestrator().tasks[task_id]
+    for _ in range(100):
+        if task.task_status == TaskStatus.STARTED:
+            break
+        await asyncio.sleep(0.01)
+    assert task.task_status == TaskStatus.STARTED
+
+    response = await client.delete(f"/v1/task/{task_id}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    for _ in range(100):
+        response = await client.get(f"/v1/status/poll/{task_id}", headers=auth_headers)
+        if response.status_code == 404:
+            break
+        await asyncio.sleep(0.1)
+    assert response.status_code == 404
+    # Stopped before the conversion of all the documents
+    assert task.task_status == TaskStatus.FAILURE
+
+
+@pytest.mark.asyncio
+async def test_sync_timeout_cancels_task(
+    app, client: AsyncClient, auth_headers: dict, monkeypatch
+):
+    monkeypatch.setattr(docling_serve_settings, "max_sync_wait", 0)
+    orchestrator = get_async_orchestrator()
+    num_tasks = len(orchestrator.tasks)
+
+    response = await client.post(
+        "/v1/convert/source",
+        json={"sources": [{"kind": "http", "url": "http://localhost:1/doc.pdf"}]},
+        headers=auth_headers,
+    )
+    assert response.status_code == 504, response.text
+
+    # The abandoned task is not kept
+    for _ in range(100):
+        if len(orchestrator.tasks) == num_tasks:
+            break
+        await asyncio.sleep(0.1)
+    assert len(orchestrator.tasks) == num_tasks
+
+
+def test_rq_worker_watches_cancel(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    from docling_jobkit.convert.manager import DoclingConverterManagerConfig
+    from docling_jobkit.orchestrators.rq.orchestrator import RQOrchestratorConfig
+
+    from docling_serve.rq_fair_queue import FairShareRQQueue
+    from docling_serve.rq_worker import CancellableRQWorker
+
+    connection = fakeredis.FakeStrictRedis()
+    worker = CancellableRQWorker(
+        [FairShareRQQueue("convert", connection=connection)],
+        connection=connection,
+        orchestrator_config=RQOrchestratorConfig(redis_url="redis://localhost:6379/"),
+        cm_config=DoclingConverterManagerConfig(),
+        scratch_dir=tmp_path,
+    )
+
+    cancel_event = threading.Event()
+    done = threading.Event()
+    watcher = threading.Thread(
+        target=worker._watch_cancel, args=("job-0", cancel_event, done)
+    )
+    watcher.start()
+    connection.set(cancel_key("job-0"), 1)
+    assert cancel_event.wait(timeout=5)
+    watcher.join(timeout=5)
+    assert not watcher.is_alive()
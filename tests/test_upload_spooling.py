@@ -0,0 +1,62 @@
+import hashlib
+import io
+import tracemalloc
+
+from docling_serve.storage import ScratchFileSource, get_scratch, spool_upload
+
+MB = 1024 * 1024
+
+
+class _ZeroStream(io.RawIOBase):
+    """Readable stream producing `size` zero bytes without holding them."""
+
+    def __init__(self, size: int):
+        self.remaining = size
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = min(len(b), self.remaining)
+        b[:n] = bytes(n)
+        self.remaining -= n
+        return n
+
+
+def test_spool_upload_memory_is_flat():
+    """Spooling N x 100 MB uploads must not hold them in memory."""
+
+    num_files = 3
+    file_size = 100 * MB
+
+    # The peak of the allocations during the uploads only, unlike the peak
+    # RSS of the process which may be reached before
+    tracemalloc.start()
+    paths = []
+    try:
+        for _ in range(num_files):
+            path, _ = spool_upload(_ZeroStream(file_size), chunk_size=MB)
+            paths.append(path)
+            assert path.parent.parent == get_scratch()
+            assert path.stat().st_size == file_size
+        _, peak = tracemalloc.get_traced_memory()
+        assert peak / MB < 32, f"Peak allocations of {peak / MB:.1f} MB"
+    finally:
+        tracemalloc.stop()
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+
+def test_scratch_file_source_is_lazy():
+    """The spooled file is read only when the document stream is requested."""
+
+    content = b"%PDF-1.4 fake content"
+    path, sha256 = spool_upload(io.BytesIO(content))
+    assert sha256 == hashlib.sha256(content).hexdigest()
+    source = ScratchFileSource(filename="doc.pdf", path=path, sha256=sha256)
+    assert path.exists()
+
+    doc_stream = source.to_document_stream()
+    assert doc_stream.name == "doc.pdf"
+    assert doc_stream.stream.getvalue() == content
+    assert not path.exists()
@@ -0,0 +1,239 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from docling_jobkit.datamodel.task import Task
+from docling_jobkit.datamodel.task_meta import TaskStatus, TaskType
+
+from docling_serve.settings import docling_serve_settings
+from docling_serve.websocket_notifier import WebsocketNotifier
+
+
+class FakeOrchestrator:
+    def __init__(self):
+        self.task = Task(
+            task_id="task-1", task_type=TaskType.CONVERT, task_status=TaskStatus.PENDING
+        )
+        self.tasks: dict[str, Task] = {}
+        self.lookups = 0
+
+    async def task_status(self, task_id: str, wait: float = 0.0) -> Task:
+        self.lookups += 1
+        # Simulate a round trip to the backend
+        await asyncio.sleep(0.01)
+        return self.task
+
+    async def get_queue_position(self, task_id: str):
+        return 1
+
+
+class FakeWebSocket:
+    """A simulated client reading its messages with some latency."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.messages: list[str] = []
+        self.close_code = None
+
+    async def send_text(self, text: str):
+        await asyncio.sleep(self.latency)
+        self.messages.append(text)
+
+    async def close(self, code: int = 1000):
+        self.close_code = code
+
+
+@pytest.mark.asyncio
+async def test_websocket_fanout(monkeypatch):
+    """Many clients watching one task cost one lookup and serialization per update."""
+
+    monkeypatch.setattr(docling_serve_settings, "ws_send_queue_size", 4)
+    orchestrator = FakeOrchestrator()
+    notifier = WebsocketNotifier(orchestrator)  # type: ignore[arg-type]
+    await notifier.add_task("task-1")
+
+    num_clients = 500
+    num_updates = 10
+    clients = [FakeWebSocket(latency=0.001) for _ in range(num_clients)]
+    stalled = FakeWebSocket(latency=3600)
+    for websocket in [*clients, stalled]:
+        notifier.subscribe("task-1", websocket)  # type: ignore[arg-type]
+
+    start_time = time.monotonic()
+    for _ in range(num_updates):
+        await notifier.notify_task_subscribers("task-1")
+    orchestrator.task = orchestrator.task.model_copy(
+        update={"task_status": TaskStatus.SUCCESS}
+    )
+    await notifier.notify_task_subscribers("task-1")
+    notify_elapsed = time.monotonic() - start_time
+
+    # Let the subscribers drain their queues
+    for _ in range(100):
+        if all(ws.close_code is not None for ws in clients):
+            break
+        await asyncio.sleep(0.01)
+
+    assert orchestrator.lookups == num_updates + 1
+    assert notify_elapsed < 1.0
+    for websocket in clients:
+        assert len(websocket.messages) == num_updates + 1
+        assert websocket.close_code == 1000
+    # All the clients received the same serialized message
+    assert len({id(ws.messages[-1]) for ws in clients}) == 1
+    assert notifier.task_completed["task-1"].is_set()
+
+    # The stalled client was evicted instead of delaying the others
+    assert stalled.close_code == 1013
+    assert len(notifier.task_subscribers["task-1"]) == num_clients
+
+
+@pytest.mark.asyncio
+async def test_websocket_coalesced_updates():
+    """Updates arriving during a status lookup are merged in one more lookup."""
+
+    orchestrator = FakeOrchestrator()
+    notifier = WebsocketNotifier(orchestrator)  # type: ignore[arg-type]
+    await notifier.add_task("task-1")
+    websocket = FakeWebSocket(latency=0)
+    notifier.subscribe("task-1", websocket)  # type: ignore[arg-type]
+
+    await asyncio.gather(
+        *(notifier.notify_task_subscribers("task-1") for _ in range(50))
+    )
+    await asyncio.sleep(0.01)
+
+    assert orchestrator.lookups == 2
+    assert len(websocket.messages) == 2
+
+
+@pytest.mark.asyncio
+async def test_queue_positions_incremental():
+    """Only the watched tasks whose position changed are notified."""
+
+    class QueueOrchestrator(FakeOrchestrator):
+        def __init__(self):
+            super().__init__()
+            self.queue: list[str] = []
+            self.requested: list[str] = []
+
+        async def get_queue_position(self, task_id: str):
+            self.requested.append(task_id)
+            return self.queue.index(task_id) + 1 if task_id in self.queue else None
+
+    orchestrator = QueueOrchestrator()
+    notifier = WebsocketNotifier(orchestrator)  # type: ignore[arg-type]
+
+    num_tasks = 5000
+    for i in range(num_tasks):
+        task_id = f"task-{i}"
+        orchestrator.tasks[task_id] = Task(
+            task_id=task_id, task_type=TaskType.CONVERT, task_status=TaskStatus.PENDING
+        )
+        orchestrator.queue.append(task_id)
+        await notifier.add_task(task_id)
+
+    watched = {task_id: FakeWebSocket(latency=0) for task_id in ("task-2", "task-4000")}
+    for task_id, websocket in watched.items():
+        notifier.subscribe(task_id, websocket)  # type: ignore[arg-type]
+    await notifier.notify_queue_positions()
+
+    for i in range(3):
+        # A worker starts the first task in the queue
+        orchestrator.tasks[f"task-{i}"].set_status(TaskStatus.STARTED)
+        orchestrator.queue.remove(f"task-{i}")
+        await notifier.notify_queue_positions()
+    await asyncio.sleep(0.01)
+
+    assert orchestrator.lookups == 0
+    # The started task is not asked for its position anymore
+    assert orchestrator.requested.count("task-2") == 3
+    assert orchestrator.requested.count("task-4000") == 4
+    positions = [
+        json.loads(message)["task"]["task_position"]
+        for message in watched["task-4000"].messages
+    ]
+    assert positions == [4001, 4000, 3999, 3998]
+    # The started task does not receive queue updates
+    positions = [
+        json.loads(message)["task"]["task_position"]
+        for message in watched["task-2"].messages
+    ]
+    assert positions == [3, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_queue_positions_watched():
+    """The positions of a shared queue are only fetched for the watched tasks."""
+
+    class SharedQueueOrchestrator(FakeOrchestrator):
+        def __init__(self):
+            super().__init__()
+            self.requested: list[list[str]] = []
+
+        async def get_queue_positions(self, task_ids: list[str]):
+            self.requested.append(sorted(task_ids))
+            return {task_id: int(task_id.split("-")[1]) for task_id in task_ids}
+
+    orchestrator = SharedQueueOrchestrator()
+    notifier = WebsocketNotifier(orchestrator)  # type: ignore[arg-type]
+    for i in range(1, 1001):
+        task_id = f"task-{i}"
+        orchestrator.tasks[task_id] = Task(
+            task_id=task_id, task_type=TaskType.CONVERT, task_status=TaskStatus.PENDING
+        )
+        await notifier.add_task(task_id)
+
+    await notifier.notify_queue_positions()
+    assert orchestrator.requested == []
+
+    websocket = FakeWebSocket(latency=0)
+    subscriber = notifier.subscribe("task-500", websocket)  # type: ignore[arg-type]
+    notifier.subscribe("task-7", FakeWebSocket(latency=0))  # type: ignore[arg-type]
+    orchestrator.tasks["task-7"].set_status(TaskStatus.STARTED)
+    await notifier.notify_queue_positions()
+    await notifier.notify_queue_positions()
+    await asyncio.sleep(0.01)
+
+    assert orchestrator.requested == [["task-500"], ["task-500"]]
+    assert [
+        json.loads(message)["task"]["task_position"] for message in websocket.messages
+    ] == [500]
+
+    notifier.unsubscribe("task-500", subscriber)
+    await notifier.notify_queue_positions()
+    assert len(orchestrator.requested) == 2
+
+
+@pytest.mark.asyncio
+async def test_rq_queue_positions(tmp_path):
+    """The positions on the plain RQ list are fetched in one round trip."""
+
+    fakeredis = pytest.importorskip("fakeredis")
+    from docling_jobkit.orchestrators.rq.orchestrator import (
+        RQOrchestrator,
+        RQOrchestratorConfig,
+    )
+
+    from docling_serve.orchestrator_factory import RQQueuePositionsMixin
+
+    class PositionsRQOrchestrator(RQQueuePositionsMixin, RQOrchestrator):  # type: ignore[misc]
+        pass
+
+    config = RQOrchestratorConfig(
+        redis_url="redis://localhost:6379/", scratch_dir=tmp_path
+    )
+    orchestrator = PositionsRQOrchestrator(config=config)
+    orchestrator._redis_conn = fakeredis.FakeStrictRedis()
+    orchestrator._rq_queue.connection = orchestrator._redis_conn
+    orchestrator._redis_conn.rpush(
+        orchestrator._rq_queue.key, *(f"task-{i}" for i in range(5))
+    )
+
+    assert await orchestrator.get_queue_positions(["task-3", "task-0", "gone"]) == {
+        "task-3": 4,
+        "task-0": 1,
+        "gone": None,
+    }